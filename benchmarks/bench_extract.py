@@ -0,0 +1,91 @@
+"""
+Benchmark for crawl throughput of the threaded and asyncio extraction engines.
+
+Both engines crawl the same range of pages from a local ``FashionStudioServer``
+(``--latency`` adds a per-response delay to mimic a remote site), with request
+throttling switched off so the numbers reflect the engines themselves. The
+async engine is skipped when aiohttp is not installed.
+
+    python -m benchmarks.bench_extract --pages 1000 --concurrency 16 --latency 0.01
+    python -m benchmarks.bench_extract --engine async --concurrency 8 --concurrency 32
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.mock_server import PRODUCTS_PER_PAGE, FashionStudioServer
+from utils.extract import MAX_WORKERS, aiohttp, close_session, extract_data, extract_data_async, get_session
+
+ENGINES = ("threads", "async")
+
+
+def crawl(engine, server, concurrency):
+    """
+    Crawl every page of ``server`` once with ``engine`` and return the extracted DataFrame.
+    """
+    if engine == "async":
+        return asyncio.run(extract_data_async(1, server.n_pages, concurrency=concurrency, base_url=server.url))
+    return extract_data(1, server.n_pages, max_workers=concurrency, requests_per_second=0,
+                        session=get_session(pool_size=concurrency), base_url=server.url)
+
+
+def bench_engine(engine, server, concurrency, repeat):
+    """
+    Return the best wall time (seconds) of ``repeat`` crawls and the rows extracted.
+    """
+    best, rows = float("inf"), 0
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = len(crawl(engine, server, concurrency))
+            best = min(best, time.perf_counter() - start)
+    finally:
+        close_session()
+    return best, rows
+
+
+def run(n_pages=1000, concurrency=(MAX_WORKERS,), engines=ENGINES, repeat=1, latency=0.0):
+    """
+    Benchmark every engine/concurrency pair and return a list of result dicts.
+    """
+    results = []
+    with FashionStudioServer(n_pages, PRODUCTS_PER_PAGE, latency=latency) as server:
+        for engine in engines:
+            if engine == "async" and aiohttp is None:
+                print("async: skipped, aiohttp is not installed")
+                continue
+            for workers in concurrency:
+                seconds, rows = bench_engine(engine, server, workers, repeat)
+                results.append({
+                    "engine": engine,
+                    "concurrency": workers,
+                    "pages": n_pages,
+                    "rows": rows,
+                    "seconds": round(seconds, 6),
+                    "pages_per_sec": round(n_pages / seconds, 1),
+                })
+                print(f"{engine:>8} x{workers:<4}: {seconds:8.3f}s  {n_pages / seconds:9.1f} pages/s  {rows} rows")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark crawl throughput of the threaded and async engines")
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, action="append",
+                        help=f"workers / in-flight requests (repeatable, default: {MAX_WORKERS})")
+    parser.add_argument("--engine", action="append", choices=ENGINES, help="engine to run (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial delay per response (seconds)")
+    args = parser.parse_args()
+
+    # Per-page logging would dominate the measurement
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("utils").setLevel(logging.ERROR)
+
+    print(f"{args.pages} pages x {PRODUCTS_PER_PAGE} products, best of {args.repeat}")
+    run(args.pages, args.concurrency or (MAX_WORKERS,), args.engine or ENGINES, args.repeat, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark for the logging overhead of extraction at different log levels.
+
+Rendered catalogue pages are parsed with ``extract_products`` and merged with
+``_products_to_dataframe``, the per-card and per-run work of ``scrape_page``
+and ``extract_data``, while the ``utils`` loggers write through the same
+formatter as ``main.py`` to a real file. Each level is compared with logging
+switched off, so the difference is the cost of formatting and writing logs.
+
+    python -m benchmarks.bench_logging --pages 200 --repeat 3
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.mock_server import PRODUCTS_PER_PAGE, render_page
+from utils.extract import _products_to_dataframe, extract_products
+
+LEVELS = ("OFF", "WARNING", "INFO", "DEBUG")
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class _CountingHandler(logging.FileHandler):
+    """
+    File handler that also counts the records it writes.
+    """
+
+    def __init__(self, path):
+        super().__init__(path, encoding="utf-8")
+        self.records = 0
+
+    def emit(self, record):
+        self.records += 1
+        super().emit(record)
+
+
+def bench_level(level, pages, repeat, log_path):
+    """
+    Return the best wall time (seconds) of ``repeat`` passes and the log lines written per pass.
+    """
+    logger = logging.getLogger("utils")
+    handler = _CountingHandler(log_path)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(logging.CRITICAL + 1 if level == "OFF" else getattr(logging, level))
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            handler.records = 0
+            start = time.perf_counter()
+            products = []
+            for html in pages:
+                products.extend(extract_products(html))
+            _products_to_dataframe(products)
+            best = min(best, time.perf_counter() - start)
+        return best, handler.records
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+        logger.propagate = True
+
+
+def run(n_pages=200, repeat=3, levels=LEVELS):
+    """
+    Benchmark every level and return ``{level: (seconds, log lines)}``.
+    """
+    pages = [render_page(page, n_pages).encode("utf-8") for page in range(1, n_pages + 1)]
+    # Warm-up pass so the first level does not pay for imports and parser setup
+    logging.getLogger("utils").setLevel(logging.CRITICAL + 1)
+    _products_to_dataframe([product for html in pages[:5] for product in extract_products(html)])
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for level in levels:
+            results[level] = bench_level(level, pages, repeat, os.path.join(workdir, f"{level}.log"))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction logging overhead per log level")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--level", action="append", choices=LEVELS, help="log level (repeatable, default: all)")
+    args = parser.parse_args()
+
+    results = run(args.pages, args.repeat, args.level or LEVELS)
+    baseline = results.get("OFF", (None,))[0]
+    print(f"{args.pages} pages x {PRODUCTS_PER_PAGE} products, best of {args.repeat}")
+    for level, (seconds, records) in results.items():
+        overhead = f"  +{(seconds / baseline - 1) * 100:5.1f}%" if baseline else ""
+        print(f"{level:>8}: {seconds:.3f}s  {records:7d} log lines{overhead}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark for the HTML parser backends over saved catalogue pages.
+
+Pages are read from ``--pages-dir`` (*.html). When the directory is empty,
+pages in the fashion-studio layout are rendered and saved there first, so
+later runs parse exactly the same files.
+
+    python -m benchmarks.bench_parser --pages-dir benchmarks/pages --repeat 5
+"""
+import argparse
+import glob
+import logging
+import os
+import time
+
+from utils.parser import PARSERS, get_parser
+from benchmarks.mock_server import render_page
+
+
+def load_pages(pages_dir, n_pages):
+    """
+    Load saved pages as bytes, rendering and saving ``n_pages`` pages if none exist yet.
+    """
+    paths = sorted(glob.glob(os.path.join(pages_dir, "*.html")))
+    if not paths:
+        os.makedirs(pages_dir, exist_ok=True)
+        for page in range(1, n_pages + 1):
+            path = os.path.join(pages_dir, f"page{page:04d}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(render_page(page, n_pages))
+            paths.append(path)
+
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench_backend(name, pages, repeat):
+    """
+    Return the best wall time (seconds) of ``repeat`` passes over all pages.
+    """
+    parser = get_parser(name)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            parser.parse_cards(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(pages_dir, n_pages=50, repeat=3, backends=None):
+    """
+    Benchmark every available backend and return ``{backend: seconds}``.
+    """
+    pages = load_pages(pages_dir, n_pages)
+    results = {}
+    for name in backends or sorted(PARSERS):
+        try:
+            results[name] = bench_backend(name, pages, repeat)
+        except ImportError as e:
+            print(f"{name:>6}: skipped ({e})")
+    return pages, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument("--pages-dir", default=os.path.join("benchmarks", "pages"))
+    parser.add_argument("--pages", type=int, default=50, help="pages to render when --pages-dir is empty")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", action="append", choices=sorted(PARSERS))
+    args = parser.parse_args()
+
+    # Per-card logging would dominate the measurement
+    logging.getLogger("utils.parser").setLevel(logging.WARNING)
+
+    pages, results = run(args.pages_dir, args.pages, args.repeat, args.backend)
+    baseline = results.get("bs4")
+    print(f"{len(pages)} pages, best of {args.repeat}")
+    for name, seconds in results.items():
+        speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+        print(f"{name:>6}: {seconds:.3f}s  {len(pages) / seconds:8.1f} pages/s  "
+              f"{seconds / len(pages) * 1000:.2f} ms/page{speedup}")
+
+
+if __name__ == "__main__":
+    main()
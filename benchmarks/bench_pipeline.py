@@ -0,0 +1,193 @@
+"""
+Benchmark for the transform and load stages and the HTML parser at several data sizes.
+
+File stages (csv, parquet, feather) also record the output size and the time
+to read the file back with pandas.
+
+Raw rows come from ``benchmarks.datagen``; ``save_to_postgres`` is timed against
+a local SQLite file through ``db_config['url']``, or against PostgreSQL (COPY
+loader) with ``--database-url``. Results are written as JSON
+(``--output``, default ``benchmarks/results/<time>-<commit>.json``) and can be
+compared with an earlier run via ``--compare``.
+
+    python -m benchmarks.bench_pipeline --size 1k --size 100k
+    python -m benchmarks.bench_pipeline --size 10M --stage transform --stage csv
+    python -m benchmarks.bench_pipeline --compare benchmarks/results/<earlier>.json
+    python -m benchmarks.bench_pipeline --stage postgres --database-url postgresql://postgres@localhost/bench
+
+The 10M size needs several GB of memory for the raw frame alone.
+Crawl throughput of the extraction engines is measured by ``benchmarks.bench_extract``.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.datagen import generate_raw_data
+from benchmarks.mock_server import PRODUCTS_PER_PAGE, render_page
+from utils.load import pa, save_to_csv, save_to_feather, save_to_parquet, save_to_postgres
+from utils.parser import get_parser
+from utils.transform import transform_data
+
+SIZES = {"1k": 1_000, "100k": 100_000, "10M": 10_000_000}
+STAGES = ("transform", "csv", "parquet", "feather", "postgres", "parser")
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+# Distinct pages rendered for the parser stage; larger sizes cycle through them
+PARSER_PAGES = 50
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _timed(func, repeat):
+    """
+    Return the best wall time (seconds) of ``repeat`` calls and the last result.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_size(n_rows, stages, repeat, seed, workdir, database_url=None):
+    """
+    Run the selected stages for one data size and return a list of result dicts.
+    """
+    results = []
+
+    def record(stage, seconds, rows, **extra):
+        results.append({
+            "stage": stage,
+            "size": n_rows,
+            "rows": rows,
+            "seconds": round(seconds, 6),
+            "rows_per_sec": round(rows / seconds, 1) if seconds else None,
+            **extra,
+        })
+        details = "".join(f"  {key}={value}" for key, value in extra.items())
+        print(f"{stage:>10} {n_rows:>10}: {seconds:9.3f}s  {rows / seconds if seconds else 0:12.0f} rows/s{details}")
+
+    def record_file(stage, save, read, extension):
+        path = os.path.join(workdir, f"products_{n_rows}.{extension}")
+        seconds, _ = _timed(lambda: save(cleaned, path), repeat)
+        read_seconds, _ = _timed(lambda: read(path), repeat)
+        record(stage, seconds, len(cleaned), bytes=os.path.getsize(path), read_seconds=round(read_seconds, 6))
+
+    raw = generate_raw_data(n_rows, seed=seed)
+    seconds, cleaned = _timed(lambda: transform_data(raw), repeat)
+    if "transform" in stages:
+        record("transform", seconds, len(raw))
+
+    if "csv" in stages:
+        record_file("csv", save_to_csv, pd.read_csv, "csv")
+
+    if pa is not None and "parquet" in stages:
+        record_file("parquet", save_to_parquet, pd.read_parquet, "parquet")
+
+    if pa is not None and "feather" in stages:
+        record_file("feather", save_to_feather, pd.read_feather, "feather")
+
+    if "postgres" in stages:
+        db_config = {"url": database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"}
+        seconds, _ = _timed(lambda: save_to_postgres(cleaned, db_config), repeat)
+        record("postgres", seconds, len(cleaned))
+
+    if "parser" in stages:
+        parser = get_parser()
+        pages = [render_page(page, PARSER_PAGES).encode("utf-8") for page in range(1, PARSER_PAGES + 1)]
+        n_pages = max(1, -(-n_rows // PRODUCTS_PER_PAGE))
+
+        def parse_all():
+            return sum(len(parser.parse_cards(pages[i % len(pages)])) for i in range(n_pages))
+
+        seconds, rows = _timed(parse_all, repeat)
+        record("parser", seconds, rows)
+
+    return results
+
+
+def run(sizes, stages=STAGES, repeat=1, seed=0, database_url=None):
+    """
+    Benchmark every size and return the JSON-serialisable report.
+    """
+    report = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "parser": get_parser().name,
+        "repeat": repeat,
+        "seed": seed,
+        "database": database_url.split(":", 1)[0] if database_url else "sqlite",
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in sizes:
+            report["results"].extend(bench_size(n_rows, stages, repeat, seed, workdir, database_url))
+    return report
+
+
+def compare(report, baseline):
+    """
+    Print the time ratio of every stage/size against a baseline report.
+    """
+    previous = {(r["stage"], r["size"]): r["seconds"] for r in baseline["results"]}
+    print(f"\nCompared with {baseline.get('commit', '?')} ({baseline.get('created', '?')}):")
+    for result in report["results"]:
+        before = previous.get((result["stage"], result["size"]))
+        if before:
+            print(f"{result['stage']:>10} {result['size']:>10}: {before:9.3f}s -> {result['seconds']:9.3f}s"
+                  f"  x{before / result['seconds']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transform, load and parsing at several data sizes")
+    parser.add_argument("--size", action="append", choices=sorted(SIZES, key=SIZES.get),
+                        help="data size (repeatable, default: 1k and 100k)")
+    parser.add_argument("--stage", action="append", choices=STAGES, help="stage to run (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url", help="SQLAlchemy URL for the postgres stage (default: temporary SQLite)")
+    parser.add_argument("--output", help="JSON results file")
+    parser.add_argument("--compare", help="earlier JSON results file to compare against")
+    args = parser.parse_args()
+
+    # Per-row and per-step logging would dominate the measurement
+    logging.basicConfig(level=logging.WARNING)
+    for name in ("utils.extract", "utils.parser", "utils.transform", "utils.load", "utils.load_postgres",
+                 "utils.load_gsheets"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    sizes = [SIZES[size] for size in args.size or ("1k", "100k")]
+    report = run(sizes, args.stage or STAGES, args.repeat, args.seed, args.database_url)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Seedable, vectorized generator for raw scraped product data.
+
+Produces frames with the same columns and string formats that
+``utils.extract.extract_products`` returns ("$45.99", "Rating: ⭐ 3.3 / 5",
+"3 Colors", "Size: M", "Gender: Men"), including the invalid "Unknown Product"
+cards the site serves. Values come from lookup tables indexed with numpy
+arrays, so millions of rows are generated without a Python loop per row.
+
+    from benchmarks.datagen import generate_raw_data
+    raw = generate_raw_data(100_000, seed=1)
+"""
+import numpy as np
+import pandas as pd
+
+from utils.extract import PRODUCT_COLUMNS
+from benchmarks.mock_server import GENDERS, PRODUCT_TYPES, SIZES
+
+TIMESTAMP = "2025-01-01 00:00:00"
+
+# Lookup tables: every possible raw string is formatted once
+PRICE_CENTS = np.arange(1000, 50001)
+PRICE_TABLE = np.array([f"${cents / 100:.2f}" for cents in PRICE_CENTS], dtype=object)
+RATING_TABLE = np.array([f"Rating: ⭐ {tenths / 10:.1f} / 5" for tenths in range(10, 51)], dtype=object)
+COLORS_TABLE = np.array([f"{count} Colors" for count in range(1, 9)], dtype=object)
+SIZE_TABLE = np.array([f"Size: {size}" for size in SIZES], dtype=object)
+GENDER_TABLE = np.array([f"Gender: {gender}" for gender in GENDERS], dtype=object)
+TYPE_TABLE = np.array([f"{product_type} " for product_type in PRODUCT_TYPES])
+
+
+def generate_raw_data(n_rows, seed=0, invalid_ratio=0.05, start_id=1, timestamp=TIMESTAMP):
+    """
+    Generate ``n_rows`` products in the raw scraped format.
+
+    Args:
+        n_rows: Number of rows
+        seed: Seed for ``numpy.random.default_rng``; equal seeds give equal frames
+        invalid_ratio: Share of "Unknown Product" rows with unavailable price and rating
+        start_id: Product id of the first row (titles are "<type> <id>")
+        timestamp: Value of the timestamp column
+
+    Returns:
+        DataFrame with PRODUCT_COLUMNS, all object columns of str
+    """
+    rng = np.random.default_rng(seed)
+    invalid = rng.random(n_rows) < invalid_ratio
+
+    ids = np.arange(start_id, start_id + n_rows).astype(str)
+    titles = np.char.add(TYPE_TABLE[rng.integers(0, len(TYPE_TABLE), n_rows)], ids).astype(object)
+    prices = PRICE_TABLE[rng.integers(0, len(PRICE_TABLE), n_rows)]
+    ratings = RATING_TABLE[rng.integers(0, len(RATING_TABLE), n_rows)]
+
+    titles[invalid] = "Unknown Product"
+    prices[invalid] = "Price Unavailable"
+    ratings[invalid] = "Rating: ⭐ Invalid Rating / 5"
+
+    return pd.DataFrame({
+        "Title": titles,
+        "Price": prices,
+        "Rating": ratings,
+        "Colors": COLORS_TABLE[rng.integers(0, len(COLORS_TABLE), n_rows)],
+        "Size": SIZE_TABLE[rng.integers(0, len(SIZE_TABLE), n_rows)],
+        "Gender": GENDER_TABLE[rng.integers(0, len(GENDER_TABLE), n_rows)],
+        "timestamp": np.full(n_rows, timestamp, dtype=object),
+    }, columns=PRODUCT_COLUMNS)
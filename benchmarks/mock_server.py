@@ -0,0 +1,232 @@
+"""
+Local HTTP stand-in for the fashion-studio website.
+
+Serves catalogue pages with the same layout as https://fashion-studio.dicoding.dev
+(page 1 at "/", page N at "/pageN") so extraction can be tested and benchmarked
+offline. Pages beyond ``n_pages`` are served without any product cards.
+
+Run standalone for benchmarking:
+
+    python -m benchmarks.mock_server --pages 1000 --port 8000
+"""
+import argparse
+import hashlib
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PRODUCTS_PER_PAGE = 20
+
+PRODUCT_TYPES = ["T-shirt", "Hoodie", "Pants", "Outerwear", "Jacket", "Shirt", "Sweater", "Shoes"]
+SIZES = ["S", "M", "L", "XL", "XXL"]
+GENDERS = ["Men", "Women", "Unisex"]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Fashion Studio</title>
+</head>
+<body>
+    <div class="collection-grid" id="collectionList">
+{cards}
+    </div>
+    <ul class="pagination">
+        <li class="page-item current"><span class="page-link">Page {page_number}</span></li>
+    </ul>
+</body>
+</html>
+"""
+
+CARD_TEMPLATE = """        <div class="collection-card">
+            <div style="position: relative;">
+                <img src="https://picsum.photos/280/350?random={product_id}" class="collection-image" alt="{title}">
+            </div>
+            <div class="product-details">
+                <h3 class="product-title">{title}</h3>
+                {price}
+                <p style="font-size: 14px; color: #777;">Rating: {rating}</p>
+                <p style="font-size: 14px; color: #777;">{colors} Colors</p>
+                <p style="font-size: 14px; color: #777;">Size: {size}</p>
+                <p style="font-size: 14px; color: #777;">Gender: {gender}</p>
+            </div>
+        </div>"""
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients closing keep-alive connections are expected, not errors
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def render_card(product_id, rng):
+    """
+    Render one product card; roughly one in twenty cards is an invalid "Unknown Product".
+    """
+    if rng.random() < 0.05:
+        title = "Unknown Product"
+        price = '<p class="price">Price Unavailable</p>'
+        rating = "⭐ Invalid Rating / 5"
+    else:
+        title = f"{rng.choice(PRODUCT_TYPES)} {product_id}"
+        price = f'<div class="price-container"><span class="price">${rng.uniform(10, 500):.2f}</span></div>'
+        rating = f"⭐ {rng.uniform(1, 5):.1f} / 5"
+
+    return CARD_TEMPLATE.format(
+        product_id=product_id,
+        title=title,
+        price=price,
+        rating=rating,
+        colors=rng.randint(1, 8),
+        size=rng.choice(SIZES),
+        gender=rng.choice(GENDERS),
+    )
+
+
+def render_page(page_number, n_pages=50, products_per_page=PRODUCTS_PER_PAGE):
+    """
+    Render a catalogue page. Output is deterministic for a given page number.
+    """
+    if 1 <= page_number <= n_pages:
+        rng = random.Random(page_number)
+        first_id = (page_number - 1) * products_per_page + 1
+        cards = "\n".join(render_card(first_id + i, rng) for i in range(products_per_page))
+    else:
+        cards = ""
+    return PAGE_TEMPLATE.format(cards=cards, page_number=page_number)
+
+
+class FashionStudioServer:
+    """
+    Threaded HTTP server serving fashion-studio pages, usable as a context manager.
+
+    Args:
+        n_pages: Number of pages that contain products
+        products_per_page: Product cards per page
+        latency: Artificial delay (seconds) added to every response
+        transient_failures: Mapping of page number to how many times it answers 503 first
+        validators: Send ETag/Last-Modified headers and answer conditional requests with 304
+        not_found_after: Answer 404 for pages beyond ``n_pages`` instead of serving an empty page
+    """
+
+    LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def __init__(self, n_pages=50, products_per_page=PRODUCTS_PER_PAGE, latency=0.0,
+                 transient_failures=None, validators=True, not_found_after=False, host="127.0.0.1", port=0):
+        self.n_pages = n_pages
+        self.products_per_page = products_per_page
+        self.latency = latency
+        self.transient_failures = dict(transient_failures or {})
+        self.validators = validators
+        self.not_found_after = not_found_after
+        self.requests = []
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._httpd = _QuietHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                match = re.fullmatch(r"/(?:page(\d+))?/?", self.path)
+                if not match:
+                    self._send(404, b"Not Found")
+                    return
+
+                page_number = int(match.group(1) or 1)
+                with server._lock:
+                    server.requests.append(page_number)
+                    failures_left = server.transient_failures.get(page_number, 0)
+                    if failures_left:
+                        server.transient_failures[page_number] = failures_left - 1
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if failures_left:
+                    self._send(503, b"Service Unavailable", {"Retry-After": "0"})
+                    return
+
+                if server.not_found_after and page_number > server.n_pages:
+                    self._send(404, b"Not Found")
+                    return
+
+                body = render_page(page_number, server.n_pages, server.products_per_page).encode("utf-8")
+                headers = {"Content-Type": "text/html; charset=utf-8"}
+                if server.validators:
+                    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                    headers.update({"ETag": etag, "Last-Modified": server.LAST_MODIFIED})
+                    if self.headers.get("If-None-Match") == etag:
+                        with server._lock:
+                            server.not_modified += 1
+                        self._send(304, b"", {"ETag": etag})
+                        return
+                self._send(200, body, headers)
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fashion-studio pages locally")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--products-per-page", type=int, default=PRODUCTS_PER_PAGE)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = FashionStudioServer(args.pages, args.products_per_page, args.latency, port=args.port)
+    print(f"Serving {args.pages} pages at {server.url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,310 @@
+import argparse
+import functools
 import logging
 import os
-from datetime import datetime
-from utils.extract import extract_data as fetch_data
-from utils.transform import transform_data as process_data
+import sys
+from utils.extract import (
+    extract_data as fetch_data,
+    iter_extract_chunks,
+    BASE_URL,
+    CACHE_DIR,
+    MAX_WORKERS,
+    REQUESTS_PER_SECOND,
+    ResponseCache
+)
+from utils.parser import PARSERS
+from utils.transform import (
+    transform_data as process_data,
+    transform_chunks,
+    compact_dtypes,
+    frame_memory,
+    DedupIndex,
+    DEDUP_HASH_BITS,
+    DEDUP_INDEX_PATH
+)
+from utils.metrics import start_run, finish_run, snapshot, span
+from utils.profiling import start_profiling, stop_profiling, profile, profiled_iter, PROFILE_DIR, PROFILE_MODES
 from utils.load import (
-    save_to_csv as export_csv,
-    save_to_gsheets as export_gsheet,
-    save_to_postgres as export_postgres
+    SINKS,
+    LOAD_MODES,
+    SINK_TIMEOUT,
+    get_sink,
+    is_incremental,
+    open_chunk_writer,
+    save_chunks,
+    load_to_sinks,
+    close_sinks
 )
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler()]
-)
+# Logging configuration (applied by main() with the --log-level option)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 logger = logging.getLogger(__name__)
 
-def run_pipeline():
+# Sinks to load into, by name in utils.load.SINKS; the first one is the primary output.
+# Only the sinks listed here are imported, so a CSV-only run never loads SQLAlchemy or the Google client.
+DEFAULT_SINKS = ("csv", "gsheets", "postgres")
+
+# Sinks that write a local products.<name> file; --output-dir decides where
+FILE_SINKS = ("csv", "parquet", "feather")
+
+# A batch run with fewer valid rows than this is treated as a failed crawl and loads the sample dataset
+MIN_VALID_ROWS = 10
+
+# JSON run report, next to the page cache so it stays out of the working tree
+METRICS_FILE = os.path.join(".cache", "run_metrics.json")
+
+def _sink_names(sinks=None):
+    """
+    Resolve the sink names for a run, defaulting to ETL_SINKS; unknown names fail before extraction.
+    """
+    if sinks is None:
+        sinks = os.getenv("ETL_SINKS", ",".join(DEFAULT_SINKS)).split(",")
+    sinks = [name.strip() for name in sinks if name.strip()]
+    if not sinks:
+        raise ValueError("At least one sink is required")
+    for name in sinks:
+        if name not in SINKS:
+            raise ValueError(f"Unknown sink '{name}'. Choices: {', '.join(SINKS)}")
+    return sinks
+
+def _check_dedup_sinks(sinks, sink_options):
+    """
+    Reject dedup runs with sinks that replace their output, since those would keep only the delta.
+    """
+    replacing = [SINKS[name].label for name in sinks if not is_incremental(name, sink_options.get(name))]
+    if replacing:
+        raise ValueError(f"The dedup index only loads new or changed products, which would replace the whole "
+                         f"catalogue in {', '.join(replacing)}. Use it with --sinks postgres --postgres-mode incremental.")
+
+def _extract_options(extract_options=None):
+    """
+    Keyword arguments for extract_data/iter_extract_chunks; the defaults crawl pages 1-50 with the page cache.
+    """
+    if extract_options is None:
+        return {"max_workers": MAX_WORKERS, "cache": ResponseCache()}
+    return extract_options
+
+def _open_writers(sinks, sink_options):
+    """
+    Create a chunk writer for every sink; secondary sinks that cannot be opened are logged and skipped.
+    """
+    primary = sinks[0]
+    writers = {SINKS[primary].label: open_chunk_writer(primary, **sink_options.get(primary, {}))}
+    for name in sinks[1:]:
+        try:
+            writers[SINKS[name].label] = open_chunk_writer(name, **sink_options.get(name, {}))
+        except Exception as sink_error:
+            logger.error(f"Failed to prepare {SINKS[name].label}: {str(sink_error)}")
+    return writers
+
+def _compacted(frames, memory):
+    """
+    Convert every frame to the compact schema, adding its memory before/after to ``memory``.
+    """
+    for frame in frames:
+        memory["before"] += frame_memory(frame)
+        frame = compact_dtypes(frame)
+        memory["after"] += frame_memory(frame)
+        yield frame
+
+def _counted(frames, rows, key):
+    """
+    Pass frames through, adding their row count to ``rows[key]``.
+    """
+    for frame in frames:
+        rows[key] += len(frame)
+        yield frame
+
+def _log_run_summary(rows, memory):
+    """
+    Log the row count and, for compact runs, the frame memory saved by the compact dtypes.
+    """
+    if not memory["before"]:
+        logger.info(f"Run summary: {rows} rows loaded.")
+        return
+    saved = memory["before"] - memory["after"]
+    logger.info(f"Run summary: {rows} rows loaded, frame memory {memory['after'] / 1e6:.1f} MB with compact dtypes "
+                f"instead of {memory['before'] / 1e6:.1f} MB (saved {saved / 1e6:.1f} MB, "
+                f"{saved / memory['before']:.0%}).")
+
+def _write_metrics(metrics, metrics_file, prometheus_path=None):
+    """
+    Log the per-stage summary and write the JSON run report and, if configured, the Prometheus file.
+    """
+    metrics.log_summary()
+    report_path = metrics.write_json(metrics_file)
+    logger.info(f"Run metrics written to {report_path}")
+    if prometheus_path:
+        metrics.write_prometheus(prometheus_path)
+        logger.info(f"Prometheus metrics written to {prometheus_path}")
+
+def _no_new_products(dedup_index, candidates):
+    """
+    Finish a dedup run that left nothing to load.
+
+    The index is only saved when the filter itself removed every product; new or
+    changed products that were all dropped as invalid are not remembered.
+    """
+    dedup_index.log_stats()
+    if candidates:
+        logger.warning(f"None of the {candidates} new or changed products is valid; nothing to load "
+                       f"and the dedup index is not updated.")
+        return True
+    dedup_index.save()
+    logger.info("No new or changed products since the last run; nothing to load.")
+    return True
+
+def run_streaming_pipeline(chunk_size, compact=False, dedup_index=None, sinks=None, extract_options=None,
+                           sink_options=None, min_rows=MIN_VALID_ROWS):
+    """
+    Execute the ETL process page by page in chunks of at most ``chunk_size`` rows.
+
+    Extract, transform and load are chained generators, so memory is bounded
+    by the chunk size instead of the catalogue size. Arguments are the same as
+    for run_pipeline; the sample dataset is only loaded when no row was valid.
+    """
+    try:
+        sinks = _sink_names(sinks)
+        sink_options = sink_options or {}
+        if dedup_index is not None:
+            _check_dedup_sinks(sinks, sink_options)
+        primary = SINKS[sinks[0]].label
+        logger.info(f"Starting streaming ETL pipeline (chunk size {chunk_size})...")
+        memory = {"before": 0, "after": 0}
+        raw_chunks = iter_extract_chunks(chunk_size=chunk_size, **_extract_options(extract_options))
+        raw_chunks = profiled_iter("extract", raw_chunks, threaded=True)
+        if dedup_index is not None:
+            raw_chunks = dedup_index.filter_chunks(raw_chunks)
+        rows = {"extracted": 0, "loaded": 0}
+        raw_chunks = _counted(raw_chunks, rows, "extracted")
+        chunks = _counted(profiled_iter("transform", transform_chunks(raw_chunks)), rows, "loaded")
+        writers = _open_writers(sinks, sink_options)
+        results = save_chunks(_compacted(chunks, memory) if compact else chunks, writers)
+
+        # Decided on the rows handed to the sinks: a primary sink that failed on its first chunk also has
+        # writer.rows == 0, but the secondary sinks already hold the real crawl and must not get sample data.
+        # With no rows handed over, the only sink errors are the "no data" ones from closing empty writers.
+        if rows["loaded"] == 0 and dedup_index is not None:
+            return _no_new_products(dedup_index, rows["extracted"])
+
+        if rows["loaded"] == 0 and min_rows > 0:
+            logger.warning("No valid data after transformation. Saving sample dataset instead...")
+            from utils.transform import generate_sample_data as create_sample_data
+            samples = [create_sample_data(100)]
+            writers = _open_writers(sinks, sink_options)
+            results = save_chunks(_compacted(samples, memory) if compact else samples, writers)
+        snapshot("load")
+
+        for name, result in results.items():
+            if isinstance(result, Exception):
+                logger.error(f"Failed to save data to {name}: {str(result)}")
+            else:
+                logger.info(f"Data successfully saved to {name} ({writers[name].rows} rows): {result}")
+
+        # The first sink is the primary output; without it the run counts as failed
+        if isinstance(results[primary], Exception):
+            raise results[primary]
+
+        # Only remember the products once the primary output holds them
+        if dedup_index is not None:
+            dedup_index.log_stats()
+            dedup_index.save()
+
+        _log_run_summary(writers[primary].rows, memory)
+        logger.info("ETL pipeline finished successfully.")
+        return True
+
+    except Exception as main_error:
+        logger.error(f"An error occurred in the ETL pipeline: {str(main_error)}")
+        return False
+
+def run_pipeline(chunk_size=None, compact=False, dedup_index=None, sinks=None, extract_options=None,
+                 sink_options=None, min_rows=MIN_VALID_ROWS, sink_timeout=SINK_TIMEOUT):
     """
     Main function to execute the ETL process.
+
+    Args:
+        chunk_size: Rows per chunk for streaming mode; None loads everything in one DataFrame
+        compact: Load the compact schema (category, datetime64 and downcast numeric columns)
+        dedup_index: DedupIndex that limits the run to products that are new or changed
+            since earlier runs; None loads the whole crawl. Every sink must upsert
+            (utils.load.INCREMENTAL_SINKS), otherwise the run fails before extraction
+        sinks: Sink names from utils.load.SINKS, primary output first; None reads ETL_SINKS
+        extract_options: Keyword arguments for extract_data (page range, workers, cache, ...);
+            None crawls pages 1-50 with MAX_WORKERS and the default page cache
+        sink_options: Sink name -> keyword arguments for its save function and chunk writer
+        min_rows: Load the sample dataset when fewer valid rows are left; 0 never does
+        sink_timeout: Seconds each sink may take in the parallel batch load before it counts as failed;
+            None waits indefinitely. Streaming runs write every chunk in this thread and do not use it
+
+    Returns:
+        bool: True if the primary sink was loaded
     """
+    if chunk_size:
+        return run_streaming_pipeline(chunk_size, compact, dedup_index, sinks, extract_options, sink_options, min_rows)
+
     try:
+        sinks = _sink_names(sinks)
+        sink_options = sink_options or {}
+        if dedup_index is not None:
+            _check_dedup_sinks(sinks, sink_options)
+        primary = SINKS[sinks[0]].label
+        sample_fallback = dedup_index is None and min_rows > 0
+
         # Data extraction step
         logger.info("Starting data extraction process...")
-        raw_dataset = fetch_data()
+        with profile("extract", threaded=True):
+            raw_dataset = fetch_data(**_extract_options(extract_options))
         logger.info(f"Extraction complete. Retrieved {len(raw_dataset)} records.")
+        snapshot("extract")
+
+        if dedup_index is not None:
+            raw_dataset = dedup_index.filter(raw_dataset)
+            logger.info(f"{len(raw_dataset)} records are new or changed since the last run.")
 
         # Data transformation step
         logger.info("Starting data transformation process...")
-        cleaned_data = process_data(raw_dataset)
+        with profile("transform"):
+            cleaned_data = process_data(raw_dataset, sample_if_empty=sample_fallback)
+        snapshot("transform")
+
+        # A small incremental batch is expected, not a sign of a failed crawl
+        if dedup_index is not None and cleaned_data.empty:
+            return _no_new_products(dedup_index, len(raw_dataset))
 
-        if cleaned_data.empty or len(cleaned_data) < 10:
+        if sample_fallback and len(cleaned_data) < min_rows:
             logger.warning("Not enough valid data after transformation. Generating sample dataset instead...")
             from utils.transform import generate_sample_data as create_sample_data
             cleaned_data = create_sample_data(100)
 
-        # Loading data to CSV
-        logger.info("Saving data to CSV file...")
-        csv_file_path = export_csv(cleaned_data)
-        logger.info(f"Data successfully saved to: {csv_file_path}")
+        memory = {"before": 0, "after": 0}
+        if compact:
+            cleaned_data = next(_compacted([cleaned_data], memory))
 
-        # Loading data to Google Sheets
-        try:
-            logger.info("Uploading data to Google Sheets...")
-            gsheet_link = export_gsheet(cleaned_data)
-            logger.info(f"Data successfully uploaded to Google Sheets: {gsheet_link}")
-        except Exception as gsheet_error:
-            logger.error(f"Failed to upload to Google Sheets: {str(gsheet_error)}")
+        # Loading data to every sink at the same time; sink modules are imported here, not at startup
+        labels = [SINKS[name].label for name in sinks]
+        logger.info(f"Saving data to {', '.join(labels)} in parallel...")
+        with span("load", rows=len(cleaned_data)):
+            results = load_to_sinks(cleaned_data, {
+                SINKS[name].label: functools.partial(get_sink(name), **sink_options.get(name, {})) for name in sinks
+            }, timeout=sink_timeout)
+        snapshot("load")
 
-        # Loading data to PostgreSQL
-        try:
-            logger.info("Saving data to PostgreSQL database...")
-            db_result = export_postgres(cleaned_data)
-            logger.info(f"Data successfully saved to PostgreSQL. Status: {db_result}")
-        except Exception as db_error:
-            logger.error(f"Failed to save to PostgreSQL: {str(db_error)}")
+        for result in results.values():
+            if result.ok:
+                logger.info(f"Data successfully saved to {result.name} in {result.seconds:.2f}s: {result.result}")
+            else:
+                logger.error(f"Failed to save data to {result.name} after {result.seconds:.2f}s: {str(result.error)}")
+
+        # The first sink is the primary output; without it the run counts as failed
+        if not results[primary].ok:
+            raise results[primary].error
 
+        if dedup_index is not None:
+            dedup_index.log_stats()
+            dedup_index.save()
+
+        _log_run_summary(len(cleaned_data), memory)
         logger.info("ETL pipeline finished successfully.")
         return True
 
@@ -64,5 +312,165 @@ def run_pipeline():
         logger.error(f"An error occurred in the ETL pipeline: {str(main_error)}")
         return False
 
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+def _non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, not {number}")
+    return number
+
+def _sink_list(value):
+    try:
+        return _sink_names(value.split(","))
+    except ValueError as sink_error:
+        raise argparse.ArgumentTypeError(str(sink_error))
+
+def build_parser():
+    """
+    Command-line options; every default can also be set with the ETL_* environment variable named in its help.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Scrape the fashion-studio catalogue, clean the products and load them into the selected sinks.",
+        epilog="Options can also be read from a file, one per line: python main.py @etl.conf",
+        fromfile_prefix_chars="@"
+    )
+
+    extract = parser.add_argument_group("extract")
+    extract.add_argument("--start-page", type=_positive_int, default=int(os.getenv("ETL_START_PAGE", "1")),
+                         help="first catalogue page (ETL_START_PAGE, default %(default)s)")
+    extract.add_argument("--end-page", type=_positive_int, default=int(os.getenv("ETL_END_PAGE", "50")),
+                         help="last catalogue page (ETL_END_PAGE, default %(default)s)")
+    extract.add_argument("--workers", type=_positive_int, default=int(os.getenv("ETL_WORKERS", str(MAX_WORKERS))),
+                         help="pages fetched concurrently (ETL_WORKERS, default %(default)s)")
+    extract.add_argument("--rate-limit", type=float,
+                         default=float(os.getenv("ETL_REQUESTS_PER_SECOND", str(REQUESTS_PER_SECOND))),
+                         help="requests per second per host, 0 = unlimited (ETL_REQUESTS_PER_SECOND, default %(default)s)")
+    extract.add_argument("--parser", choices=sorted(PARSERS), default=os.getenv("ETL_PARSER") or None,
+                         help="HTML parser backend (ETL_PARSER, default lxml if installed)")
+    extract.add_argument("--parse-workers", type=_non_negative_int, default=int(os.getenv("ETL_PARSE_WORKERS", "0")),
+                         help="processes for HTML parsing, 0 = parse in the fetch threads (ETL_PARSE_WORKERS)")
+    extract.add_argument("--base-url", default=os.getenv("ETL_BASE_URL", BASE_URL),
+                         help="catalogue URL (ETL_BASE_URL, default %(default)s)")
+    extract.add_argument("--cache-dir", default=CACHE_DIR,
+                         help="conditional-request page cache (ETL_CACHE_DIR, default %(default)s)")
+    extract.add_argument("--no-cache", action="store_true", help="fetch every page without the page cache")
+
+    transform = parser.add_argument_group("transform")
+    transform.add_argument("--chunk-size", type=_non_negative_int, default=int(os.getenv("ETL_CHUNK_SIZE", "0")),
+                           help="rows per streamed chunk, 0 = load everything at once (ETL_CHUNK_SIZE)")
+    transform.add_argument("--compact", action="store_true", default=os.getenv("ETL_COMPACT_DTYPES", "0") == "1",
+                           help="load the compact dtype schema (ETL_COMPACT_DTYPES=1)")
+    transform.add_argument("--min-rows", type=_non_negative_int, default=int(os.getenv("ETL_MIN_ROWS", str(MIN_VALID_ROWS))),
+                           help="load the sample dataset when fewer valid rows are left, 0 = never "
+                                "(ETL_MIN_ROWS, default %(default)s)")
+    transform.add_argument("--dedup", action="store_true", default=os.getenv("ETL_DEDUP_INDEX", "0") == "1",
+                           help="load only products that are new or changed since the last run; needs "
+                                "--sinks postgres --postgres-mode incremental (ETL_DEDUP_INDEX=1)")
+    transform.add_argument("--dedup-index", default=DEDUP_INDEX_PATH,
+                           help="dedup index file (ETL_DEDUP_INDEX_PATH, default %(default)s)")
+    transform.add_argument("--dedup-hash-bits", type=int, choices=DEDUP_HASH_BITS,
+                           default=int(os.getenv("ETL_DEDUP_HASH_BITS", "64")),
+                           help="hash width of the dedup index (ETL_DEDUP_HASH_BITS, default %(default)s)")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--sinks", type=_sink_list, default=os.getenv("ETL_SINKS", ",".join(DEFAULT_SINKS)),
+                      help=f"comma-separated sinks, primary output first; choices: {', '.join(SINKS)} "
+                           "(ETL_SINKS, default %(default)s)")
+    load.add_argument("--output-dir", default=os.getenv("ETL_OUTPUT_DIR") or None,
+                      help="directory for the products.csv/.parquet/.feather files (ETL_OUTPUT_DIR, default: cwd)")
+    load.add_argument("--gsheets-credentials", default=os.getenv("ETL_GSHEETS_CREDENTIALS", "google-sheets-api.json"),
+                      help="Google service account key (ETL_GSHEETS_CREDENTIALS, default %(default)s)")
+    load.add_argument("--spreadsheet-id", default=None,
+                      help="spreadsheet to overwrite instead of creating one (GSHEETS_SPREADSHEET_ID)")
+    load.add_argument("--postgres-mode", choices=LOAD_MODES, default=os.getenv("ETL_POSTGRES_MODE", "replace"),
+                      help="rewrite the table or upsert changed products by key (ETL_POSTGRES_MODE, default %(default)s)")
+    load.add_argument("--sink-timeout", type=_non_negative_int,
+                      default=int(os.getenv("ETL_SINK_TIMEOUT", str(SINK_TIMEOUT))),
+                      help="seconds each sink may take in a batch load before it counts as failed, 0 = no limit "
+                           "(ETL_SINK_TIMEOUT, default %(default)s)")
+
+    monitoring = parser.add_argument_group("monitoring")
+    monitoring.add_argument("--log-level", default=os.getenv("ETL_LOG_LEVEL", "INFO").upper(),
+                            choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                            help="(ETL_LOG_LEVEL, default %(default)s)")
+    monitoring.add_argument("--metrics-file", default=os.getenv("ETL_METRICS_FILE", METRICS_FILE),
+                            help="JSON run report (ETL_METRICS_FILE, default %(default)s)")
+    monitoring.add_argument("--prometheus-file", default=os.getenv("ETL_PROMETHEUS_FILE"),
+                            help="Prometheus text file for node_exporter (ETL_PROMETHEUS_FILE)")
+    monitoring.add_argument("--tracemalloc", action="store_true", default=os.getenv("ETL_TRACEMALLOC", "0") == "1",
+                            help="record allocation snapshots per stage, at a speed cost (ETL_TRACEMALLOC=1)")
+    monitoring.add_argument("--profile", default=os.getenv("ETL_PROFILE"), metavar="STAGES",
+                            help="comma-separated stages to profile, e.g. extract,load or all (ETL_PROFILE)")
+    monitoring.add_argument("--profile-mode", choices=PROFILE_MODES,
+                            default=os.getenv("ETL_PROFILE_MODE", "cprofile"),
+                            help="cprofile writes .pstats for single-threaded stages; extract and parallel sinks "
+                                 "are always sampled to .collapsed, since Python 3.12+ allows one cProfile per "
+                                 "process (ETL_PROFILE_MODE, default %(default)s)")
+    monitoring.add_argument("--profile-dir", default=PROFILE_DIR,
+                            help="(ETL_PROFILE_DIR, default %(default)s)")
+    return parser
+
+def _sink_options(args):
+    """
+    Per-sink keyword arguments from the command line.
+    """
+    options = {"gsheets": {"creds_file": args.gsheets_credentials}, "postgres": {"mode": args.postgres_mode}}
+    if args.spreadsheet_id:
+        options["gsheets"]["spreadsheet_id"] = args.spreadsheet_id
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for name in FILE_SINKS:
+            options[name] = {"filename": os.path.join(args.output_dir, f"products.{name}")}
+    return options
+
+def main(argv=None):
+    """
+    Run the pipeline with command-line options and return the process exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.end_page < args.start_page:
+        parser.error("--end-page must not be lower than --start-page")
+    if args.dedup:
+        try:
+            _check_dedup_sinks(args.sinks, _sink_options(args))
+        except ValueError as sink_error:
+            parser.error(str(sink_error))
+
+    logging.basicConfig(level=args.log_level, format=LOG_FORMAT, handlers=[logging.StreamHandler()])
+    # Per-stage timings, throughput and memory
+    start_run(trace_memory=args.tracemalloc)
+    if args.profile:
+        start_profiling(args.profile.split(","), mode=args.profile_mode, output_dir=args.profile_dir)
+    success = False
+    try:
+        dedup_index = DedupIndex(args.dedup_index, hash_bits=args.dedup_hash_bits) if args.dedup else None
+        extract_options = {
+            "start_page": args.start_page,
+            "end_page": args.end_page,
+            "max_workers": args.workers,
+            "requests_per_second": args.rate_limit,
+            "cache": None if args.no_cache else ResponseCache(args.cache_dir),
+            "base_url": args.base_url,
+            "parser": args.parser,
+            "parse_workers": args.parse_workers
+        }
+        success = run_pipeline(chunk_size=args.chunk_size or None, compact=args.compact, dedup_index=dedup_index,
+                               sinks=args.sinks, extract_options=extract_options, sink_options=_sink_options(args),
+                               min_rows=args.min_rows, sink_timeout=args.sink_timeout or None)
+    finally:
+        # Close pooled database connections (if the PostgreSQL sink was used) and log their checkout statistics
+        close_sinks()
+        _write_metrics(finish_run(), args.metrics_file, args.prometheus_file)
+        for path in stop_profiling():
+            logger.info(f"Profile written to {path}")
+    return 0 if success else 1
+
 if __name__ == "__main__":
-    run_pipeline()
+    sys.exit(main())
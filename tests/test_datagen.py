@@ -0,0 +1,52 @@
+import unittest
+import pandas as pd
+from benchmarks.datagen import generate_raw_data
+from utils.extract import PRODUCT_COLUMNS
+from utils.transform import transform_data
+
+
+class RawDataGeneratorTests(unittest.TestCase):
+    """
+    Unit tests for the synthetic raw-data generator used by the benchmarks.
+    """
+
+    def test_same_seed_gives_same_frame(self):
+        """
+        Ensure the generator is deterministic for a seed and varies across seeds.
+        """
+        pd.testing.assert_frame_equal(generate_raw_data(500, seed=3), generate_raw_data(500, seed=3))
+        self.assertFalse(generate_raw_data(500, seed=3).equals(generate_raw_data(500, seed=4)))
+
+    def test_rows_use_scraped_string_formats(self):
+        """
+        Ensure rows look like extract_products output, including invalid products.
+        """
+        raw = generate_raw_data(2000, seed=0, invalid_ratio=0.1)
+
+        self.assertEqual(list(raw.columns), PRODUCT_COLUMNS)
+        self.assertEqual(len(raw), 2000)
+        valid = raw[raw['Title'] != "Unknown Product"]
+        self.assertTrue(valid['Price'].str.fullmatch(r'\$\d+\.\d{2}').all())
+        self.assertTrue(valid['Rating'].str.fullmatch(r'Rating: ⭐ \d\.\d / 5').all())
+        self.assertTrue(raw['Colors'].str.fullmatch(r'\d Colors').all())
+        self.assertTrue(raw['Size'].str.startswith("Size: ").all())
+        self.assertTrue(raw['Gender'].str.startswith("Gender: ").all())
+        self.assertTrue(valid['Title'].is_unique)
+        self.assertTrue(150 < (raw['Title'] == "Unknown Product").sum() < 250)
+
+    def test_transform_drops_only_invalid_rows(self):
+        """
+        Ensure transform_data keeps every valid generated row.
+        """
+        raw = generate_raw_data(1000, seed=1)
+        invalid = (raw['Title'] == "Unknown Product").sum()
+
+        transformed = transform_data(raw)
+
+        self.assertEqual(len(transformed), len(raw) - invalid)
+        self.assertTrue((transformed['Price'] >= 10 * 16000).all())
+        self.assertTrue(transformed['Rating'].between(1, 5).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,19 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
 import requests
-from utils.extract import extract_data, scrape_page, BASE_URL
+from utils.extract import (
+    extract_data, extract_data_async, iter_extract_chunks, extract_products, fetch_page, scrape_page, page_url, create_session, get_session, close_session,
+    HostRateLimiter, ResponseCache, BASE_URL, DEFAULT_HEADERS, MAX_RETRIES, POOL_SIZE, PRODUCT_COLUMNS, aiohttp
+)
+from benchmarks.mock_server import FashionStudioServer, render_page
 
 class FakeResponse:
     """
@@ -10,7 +21,9 @@ class FakeResponse:
     """
     def __init__(self, content, status_code=200):
         self.text = content
+        self.content = content.encode('utf-8')
         self.status_code = status_code
+        self.headers = {}
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -52,11 +65,12 @@ class TestExtractModule(unittest.TestCase):
         </html>
         """
 
-    @patch('utils.extract.requests.get')
-    def test_scrape_page_success(self, mocked_get):
+    @patch('utils.extract.get_session')
+    def test_scrape_page_success(self, mocked_session_factory):
         """
         Ensure scrape_page returns expected data when the response is successful.
         """
+        mocked_get = mocked_session_factory.return_value.get
         mocked_get.return_value = FakeResponse(self.sample_html)
 
         result = scrape_page(1)
@@ -70,11 +84,12 @@ class TestExtractModule(unittest.TestCase):
         called_url = mocked_get.call_args[0][0]
         self.assertTrue(called_url.startswith(BASE_URL))
 
-    @patch('utils.extract.requests.get')
-    def test_scrape_page_with_network_retry(self, mocked_get):
+    @patch('utils.extract.get_session')
+    def test_scrape_page_with_network_retry(self, mocked_session_factory):
         """
         Test scrape_page retries after network failure and eventually succeeds.
         """
+        mocked_get = mocked_session_factory.return_value.get
         mocked_get.side_effect = [
             requests.exceptions.RequestException("Network error"),
             FakeResponse(self.sample_html)
@@ -89,11 +104,12 @@ class TestExtractModule(unittest.TestCase):
 
         self.assertGreaterEqual(mocked_get.call_count, 1)
 
-    @patch('utils.extract.requests.get')
-    def test_scrape_page_http_error(self, mocked_get):
+    @patch('utils.extract.get_session')
+    def test_scrape_page_http_error(self, mocked_session_factory):
         """
         Test scrape_page handles HTTP error responses.
         """
+        mocked_get = mocked_session_factory.return_value.get
         mocked_get.return_value = FakeResponse("", 404)
 
         with patch('utils.extract.time.sleep'):
@@ -181,6 +197,192 @@ class TestExtractModule(unittest.TestCase):
         self.assertEqual(len(df), 1)
         self.assertEqual(mocked_scraper.call_count, 2)
 
+    @patch('utils.extract.scrape_page')
+    def test_extract_data_concurrent_keeps_page_order(self, mocked_scraper):
+        """
+        Test concurrent extract_data bounds pages in flight and returns results in page order.
+        """
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+
+        def fake_scrape(page):
+            with lock:
+                in_flight.append(page)
+                max_in_flight.append(len(in_flight))
+            # Later pages finish first to exercise the reordering
+            time.sleep(0.01 * (7 - page))
+            with lock:
+                in_flight.remove(page)
+            return [{'Title': f'Product from Page {page}', 'Price': '$10.00'}]
+
+        mocked_scraper.side_effect = fake_scrape
+
+        df = extract_data(start_page=1, end_page=6, max_workers=3, requests_per_second=0)
+
+        self.assertEqual(df['Title'].tolist(), [f'Product from Page {page}' for page in range(1, 7)])
+        self.assertEqual(mocked_scraper.call_count, 6)
+        self.assertLessEqual(max(max_in_flight), 3)
+
+    @patch('utils.extract.scrape_page')
+    def test_extract_data_concurrent_with_page_error(self, mocked_scraper):
+        """
+        Test a failing page does not abort the other pages in concurrent mode.
+        """
+        def fake_scrape(page):
+            if page == 2:
+                raise Exception("Failed scraping")
+            return [{'Title': f'Product from Page {page}', 'Price': '$10.00'}]
+
+        mocked_scraper.side_effect = fake_scrape
+
+        df = extract_data(start_page=1, end_page=3, max_workers=3, requests_per_second=0)
+
+        self.assertEqual(df['Title'].tolist(), ['Product from Page 1', 'Product from Page 3'])
+
+    def test_extract_products_is_pure_on_raw_html(self):
+        """
+        Ensure extract_products parses str and bytes alike and stamps the given timestamp.
+        """
+        html = render_page(1, 1, 3)
+        from_text = extract_products(html, timestamp='2025-05-01 10:00:00')
+        from_bytes = extract_products(html.encode('utf-8'), timestamp='2025-05-01 10:00:00')
+
+        self.assertEqual(len(from_text), 3)
+        self.assertEqual(from_text, from_bytes)
+        self.assertTrue(all(product['timestamp'] == '2025-05-01 10:00:00' for product in from_text))
+
+    def test_extract_products_logs_only_a_debug_sample(self):
+        """
+        Ensure per-product lines are DEBUG only and limited to one in LOG_SAMPLE_EVERY products.
+        """
+        html = render_page(1, 1, 20)
+
+        with self.assertNoLogs('utils.extract', level='INFO'):
+            extract_products(html)
+
+        with patch('utils.extract.LOG_SAMPLE_EVERY', 5), self.assertLogs('utils.extract', level='DEBUG') as logs:
+            extract_products(html)
+        sampled = [line for line in logs.output if 'Produk diekstrak' in line]
+        self.assertEqual(len(sampled), 4)
+
+    def test_fetch_page_returns_raw_html_without_parsing(self):
+        """
+        Ensure fetch_page only downloads the page and leaves parsing to the caller.
+        """
+        session = MagicMock()
+        session.get.return_value = FakeResponse(self.sample_html)
+
+        with patch('utils.extract.extract_products') as mocked_extract:
+            fetched = fetch_page(3, session=session)
+
+        mocked_extract.assert_not_called()
+        self.assertEqual(fetched.url, page_url(3))
+        self.assertEqual(fetched.text, self.sample_html)
+        self.assertIsNone(fetched.products)
+
+    def test_scrape_page_uses_injected_session(self):
+        """
+        Ensure scrape_page fetches through the session it is given.
+        """
+        session = MagicMock()
+        session.get.return_value = FakeResponse(self.sample_html)
+
+        with patch('utils.extract.get_session') as mocked_session_factory:
+            scrape_page(2, session=session)
+
+        mocked_session_factory.assert_not_called()
+        self.assertEqual(session.get.call_args[0][0], page_url(2))
+
+    @patch('utils.extract.scrape_page')
+    def test_extract_data_shares_session_across_pages(self, mocked_scraper):
+        """
+        Ensure extract_data hands the same injected session to every page.
+        """
+        mocked_scraper.return_value = [{'Title': 'Test Product', 'Price': '$45.99'}]
+        session = MagicMock()
+
+        extract_data(start_page=1, end_page=3, max_workers=2, requests_per_second=0, session=session)
+
+        self.assertEqual(mocked_scraper.call_count, 3)
+        for call in mocked_scraper.call_args_list:
+            self.assertIs(call.kwargs['session'], session)
+
+    def test_create_session_configures_pool_and_retries(self):
+        """
+        Ensure create_session mounts a pooled adapter with a transport retry policy.
+        """
+        session = create_session(pool_size=4, keep_alive=False, retries=5, backoff_factor=0.1)
+        try:
+            adapter = session.get_adapter(BASE_URL)
+            self.assertEqual(adapter._pool_maxsize, 4)
+            self.assertEqual(adapter.max_retries.total, 5)
+            self.assertIn(503, adapter.max_retries.status_forcelist)
+            self.assertEqual(session.headers['User-Agent'], DEFAULT_HEADERS['User-Agent'])
+            self.assertEqual(session.headers['Connection'], 'close')
+        finally:
+            session.close()
+
+    def test_get_session_is_shared_until_closed(self):
+        """
+        Ensure get_session reuses one session until close_session is called.
+        """
+        close_session()
+        first = get_session()
+        self.assertIs(get_session(), first)
+
+        close_session()
+        self.assertIsNot(get_session(), first)
+        close_session()
+
+    def test_shared_pool_grows_with_worker_count(self):
+        """
+        Ensure extract_data sizes the shared pool to its workers, so no connection is discarded.
+        """
+        close_session()
+        self.addCleanup(close_session)
+        self.assertEqual(get_session(pool_size=2).get_adapter(BASE_URL)._pool_maxsize, POOL_SIZE)
+
+        workers = POOL_SIZE * 2
+        with FashionStudioServer(n_pages=workers, products_per_page=2, latency=0.05) as server, \
+                self.assertNoLogs('urllib3.connectionpool', level='WARNING'):
+            df = extract_data(1, workers, max_workers=workers, requests_per_second=0, base_url=server.url)
+
+        self.assertEqual(len(df), workers * 2)
+        self.assertEqual(get_session().get_adapter(BASE_URL)._pool_maxsize, workers)
+
+    def test_failed_pages_are_requested_once_per_attempt(self):
+        """
+        Ensure a failing page costs MAX_RETRIES requests, not transport retries on top, and a 404 costs one.
+        """
+        session = create_session()
+        self.addCleanup(session.close)
+        with FashionStudioServer(n_pages=2, transient_failures={2: 100}, not_found_after=True) as server, \
+                patch('utils.extract.RETRY_DELAY', 0.01):
+            for page in (2, 3):
+                with self.assertRaises(Exception):
+                    fetch_page(page, session=session, base_url=server.url)
+            requested = list(server.requests)
+
+        self.assertEqual(requested.count(2), MAX_RETRIES)
+        self.assertEqual(requested.count(3), 1)
+
+    def test_host_rate_limiter_spaces_requests_per_host(self):
+        """
+        Test HostRateLimiter spaces requests to the same host and not across hosts.
+        """
+        limiter = HostRateLimiter(requests_per_second=2)
+
+        with patch('utils.extract.time.monotonic', return_value=100.0), \
+             patch('utils.extract.time.sleep') as mocked_sleep:
+            limiter.wait(page_url(1))
+            limiter.wait(page_url(2))
+            limiter.wait(page_url(3))
+            limiter.wait("https://other-host.example/page1")
+
+        delays = [call.args[0] for call in mocked_sleep.call_args_list]
+        self.assertEqual(delays, [0.5, 1.0])
+
     def test_extract_data_with_invalid_range(self):
         """
         Test extract_data when given an invalid page range.
@@ -189,5 +391,232 @@ class TestExtractModule(unittest.TestCase):
         self.assertIsInstance(df, pd.DataFrame)
         # No assertion on length — implementation may vary.
 
+class TestProcessPoolParsing(unittest.TestCase):
+    """
+    Tests for fetching on threads and parsing HTML in a process pool.
+    """
+
+    def test_extract_data_parse_workers_matches_in_thread_parsing(self):
+        """
+        Ensure parsing in worker processes gives the same rows, in page order, as in-thread parsing.
+        """
+        with FashionStudioServer(n_pages=4, products_per_page=5) as server:
+            threaded = extract_data(1, 4, max_workers=2, requests_per_second=0, base_url=server.url)
+            multiprocess = extract_data(1, 4, max_workers=2, requests_per_second=0, base_url=server.url,
+                                        parse_workers=2)
+
+        self.assertEqual(len(multiprocess), 4 * 5)
+        self.assertEqual(threaded.drop(columns='timestamp').values.tolist(),
+                         multiprocess.drop(columns='timestamp').values.tolist())
+
+    @unittest.skipUnless(aiohttp, "aiohttp is not installed")
+    def test_extract_data_async_parse_workers(self):
+        """
+        Ensure the async engine can hand parsing to worker processes.
+        """
+        with FashionStudioServer(n_pages=3, products_per_page=5) as server:
+            df = asyncio.run(extract_data_async(1, None, concurrency=2, base_url=server.url, parse_workers=2))
+
+        self.assertEqual(len(df), 3 * 5)
+
+class TestStreamingExtraction(unittest.TestCase):
+    """
+    Tests for chunked extraction with bounded memory.
+    """
+
+    def test_chunks_are_bounded_and_match_extract_data(self):
+        """
+        Ensure chunks hold at most chunk_size rows and together equal extract_data.
+        """
+        with FashionStudioServer(n_pages=5, products_per_page=7) as server:
+            chunks = list(iter_extract_chunks(1, 6, chunk_size=10, max_workers=3, requests_per_second=0,
+                                              base_url=server.url))
+            full = extract_data(1, 6, requests_per_second=0, base_url=server.url)
+
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 10, 5])
+        streamed = pd.concat(chunks, ignore_index=True)
+        self.assertEqual(list(streamed.columns), PRODUCT_COLUMNS)
+        self.assertEqual(streamed.drop(columns='timestamp').values.tolist(),
+                         full.drop(columns='timestamp').values.tolist())
+
+    def test_pages_are_fetched_only_as_chunks_are_consumed(self):
+        """
+        Ensure a slow consumer keeps only a bounded number of pages in flight.
+        """
+        with FashionStudioServer(n_pages=40, products_per_page=2) as server:
+            chunks = iter_extract_chunks(1, 40, chunk_size=2, max_workers=2, requests_per_second=0,
+                                         base_url=server.url)
+            next(chunks)
+            time.sleep(0.2)
+            requested = len(server.requests)
+            chunks.close()
+
+        self.assertLessEqual(requested, 1 + 2 * 2)
+
+    def test_invalid_chunk_size(self):
+        """
+        Ensure chunk_size below 1 is rejected.
+        """
+        with self.assertRaises(ValueError):
+            next(iter_extract_chunks(1, 1, chunk_size=0))
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Tests for the on-disk conditional-request cache used by scrape_page.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def crawl(self, server, cache):
+        session = create_session()
+        try:
+            return extract_data(1, server.n_pages, requests_per_second=0, session=session,
+                                cache=cache, base_url=server.url)
+        finally:
+            session.close()
+
+    def test_revisit_sends_validators_and_skips_parsing(self):
+        """
+        Ensure a second crawl gets 304 responses and reuses cached products.
+        """
+        with FashionStudioServer(n_pages=3, products_per_page=4) as server:
+            first = self.crawl(server, ResponseCache(self.cache_dir))
+            self.assertEqual(server.not_modified, 0)
+
+            cache = ResponseCache(self.cache_dir)
+            with patch('utils.extract.extract_products') as mocked_parse:
+                second = self.crawl(server, cache)
+
+            self.assertEqual(server.not_modified, 3)
+
+        mocked_parse.assert_not_called()
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 3)
+        self.assertEqual(stats['misses'], 0)
+        self.assertEqual(stats['not_modified'], 3)
+        self.assertGreater(stats['bytes_saved'], 0)
+        self.assertEqual(first.drop(columns='timestamp').values.tolist(),
+                         second.drop(columns='timestamp').values.tolist())
+
+    def test_unchanged_body_without_validators_skips_parsing(self):
+        """
+        Ensure a body whose hash matches the last run is not parsed again.
+        """
+        with FashionStudioServer(n_pages=2, products_per_page=3, validators=False) as server:
+            self.crawl(server, ResponseCache(self.cache_dir))
+
+            cache = ResponseCache(self.cache_dir)
+            with patch('utils.extract.extract_products') as mocked_parse:
+                second = self.crawl(server, cache)
+
+        mocked_parse.assert_not_called()
+        self.assertEqual(len(second), 6)
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['not_modified'], 0)
+        self.assertEqual(stats['bytes_saved'], 0)
+
+    def test_lru_eviction_keeps_cache_within_size_bound(self):
+        """
+        Ensure the least recently used entries are evicted once max_bytes is exceeded.
+        """
+        cache = ResponseCache(self.cache_dir, max_bytes=300)
+        products = [{'Title': 'Test Product'}]
+
+        with patch('utils.extract.time.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.store('http://example/page1', b'a' * 100, products)
+            cache.store('http://example/page2', b'b' * 100, products)
+            # Touch page1 so page2 becomes the least recently used entry
+            self.assertIsNotNone(cache.lookup('http://example/page1', 200, b'a' * 100))
+            cache.store('http://example/page3', b'c' * 100, products)
+
+        self.assertIsNotNone(cache.lookup('http://example/page1', 200, b'a' * 100))
+        self.assertIsNone(cache.lookup('http://example/page2', 200, b'b' * 100))
+        self.assertLessEqual(cache.size_bytes(), 300)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 4)
+
+    def test_lookup_reads_files_outside_the_lock_and_misses_on_a_racing_store(self):
+        """
+        Ensure cache files are read without holding the lock and a concurrent store wins.
+        """
+        cache = ResponseCache(self.cache_dir)
+        url = 'http://example/page1'
+        cache.store(url, b'old body', [{'Title': 'Old'}])
+        real_load = json.load
+
+        def racing_load(f):
+            self.assertFalse(cache._lock.locked())
+            cache.store(url, b'new body', [{'Title': 'New'}])
+            return real_load(f)
+
+        with patch('utils.extract.json.load', side_effect=racing_load):
+            self.assertIsNone(cache.lookup(url, 200, b'old body'))
+
+        self.assertEqual(cache.lookup(url, 200, b'new body'), [{'Title': 'New'}])
+        self.assertEqual(cache.stats()['entries'], 1)
+        # The replaced entry's files are gone; only the new body's pair remains
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class TestExtractAsync(unittest.TestCase):
+    """
+    Tests for the asyncio extraction engine against the local mock server.
+    """
+
+    def test_extract_data_async_stops_at_empty_page(self):
+        """
+        Ensure extract_data_async collects pages in order and stops after the first empty page.
+        """
+        with FashionStudioServer(n_pages=5, products_per_page=4) as server:
+            df = asyncio.run(extract_data_async(1, None, concurrency=3, base_url=server.url))
+            requested = list(server.requests)
+
+        expected_titles = [
+            title
+            for page in range(1, 6)
+            for title in re.findall(r'class="product-title">([^<]+)<', render_page(page, 5, 4))
+        ]
+        self.assertEqual(df['Title'].tolist(), expected_titles)
+        self.assertNotIn(9, requested)
+
+    def test_extract_data_async_cancels_pages_after_empty_page(self):
+        """
+        Ensure pages beyond the last catalogue page are cancelled and not included.
+        """
+        with FashionStudioServer(n_pages=2, products_per_page=3, latency=0.05) as server:
+            df = asyncio.run(extract_data_async(1, 20, concurrency=4, base_url=server.url))
+
+        self.assertEqual(len(df), 2 * 3)
+
+    def test_extract_data_async_retries_transient_failures(self):
+        """
+        Ensure extract_data_async retries a page that answers 503 before succeeding.
+        """
+        with FashionStudioServer(n_pages=3, products_per_page=2, transient_failures={2: 1}) as server:
+            df = asyncio.run(extract_data_async(1, 3, concurrency=2, base_url=server.url, backoff=0.01))
+            requested = list(server.requests)
+
+        self.assertEqual(len(df), 3 * 2)
+        self.assertEqual(requested.count(2), 2)
+
+    def test_extract_data_async_stops_at_not_found_page(self):
+        """
+        Ensure a 404 past the last page ends an open-ended crawl without being retried.
+        """
+        with FashionStudioServer(n_pages=3, products_per_page=2, not_found_after=True) as server:
+            df = asyncio.run(asyncio.wait_for(
+                extract_data_async(1, None, concurrency=2, base_url=server.url, backoff=0.01), timeout=10))
+            requested = list(server.requests)
+
+        self.assertEqual(len(df), 3 * 2)
+        self.assertEqual(requested.count(4), 1)
+        self.assertLessEqual(max(requested), 3 + 2)
+
 if __name__ == '__main__':
     unittest.main()
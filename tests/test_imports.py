@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that only some sinks or modes need; importing main must not load them
+HEAVY_MODULES = ('sqlalchemy', 'googleapiclient', 'google.oauth2', 'aiohttp', 'bs4')
+
+def imported_modules(statement):
+    """
+    Run ``statement`` in a fresh interpreter with -X importtime and return {module: cumulative microseconds}.
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT,
+                               capture_output=True, text=True, check=True)
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+class ImportTimeTests(unittest.TestCase):
+    """
+    Regression tests for the lazily loaded sinks and optional dependencies.
+    """
+
+    def assertNotImported(self, modules, names):
+        loaded = sorted(name for name in names if name in modules)
+        self.assertEqual(loaded, [], f"imported at startup: {', '.join(loaded)}")
+
+    def test_main_does_not_import_heavy_dependencies(self):
+        """
+        Ensure importing main leaves the database, Google, aiohttp and bs4 stacks unloaded.
+        """
+        modules = imported_modules('import main')
+
+        self.assertIn('main', modules)
+        self.assertNotImported(modules, HEAVY_MODULES)
+
+    def test_sink_modules_load_on_first_use(self):
+        """
+        Ensure the registry imports only the sink that is asked for, and old names still resolve through utils.load.
+        """
+        # Sink modules are loaded through importlib, which -X importtime does not report; their dependencies are
+        modules = imported_modules('from utils.load import get_sink; get_sink("csv"); get_sink("postgres")')
+        self.assertIn('sqlalchemy', modules)
+        self.assertNotImported(modules, ('googleapiclient', 'google.oauth2'))
+
+        modules = imported_modules('from utils.load import save_to_gsheets')
+        self.assertIn('googleapiclient', modules)
+        self.assertNotImported(modules, ('sqlalchemy',))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,26 @@
 import unittest
+import io
 import os
+import re
+import tempfile
+import threading
+import time
+import httplib2
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
-from utils.load import save_to_csv, save_to_gsheets, save_to_postgres
+from utils.load import (
+    save_to_csv, save_to_gsheets, save_to_postgres, save_chunks, CsvChunkWriter, GSheetsChunkWriter, PostgresChunkWriter,
+    StagingCopy, UpsertResult, product_fingerprints, get_engine, pool_stats, dispose_engines,
+    SheetsUploader, clear_google_clients, load_to_sinks, SinkResult, current_sink_deadline,
+    save_to_parquet, save_to_feather, ColumnarChunkWriter, pa, zstandard
+)
+from utils.load_gsheets import _sheet_rows
+from utils.load_postgres import pacsv
+from utils.transform import compact_dtypes
+from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
+from googleapiclient.errors import HttpError
 
 class LoadModuleTests(unittest.TestCase):
     """
@@ -27,6 +44,8 @@ class LoadModuleTests(unittest.TestCase):
 
         # Temporary CSV filename for testing
         self.csv_test_file = "test_products.csv"
+        self.addCleanup(dispose_engines)
+        self.addCleanup(clear_google_clients)
 
     def tearDown(self):
         """
@@ -61,8 +80,8 @@ class LoadModuleTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             save_to_csv(empty_df, self.csv_test_file)
 
-    @patch('utils.load.service_account.Credentials.from_service_account_file')
-    @patch('utils.load.googleapiclient.discovery.build')
+    @patch('utils.load_gsheets.service_account.Credentials.from_service_account_file')
+    @patch('utils.load_gsheets.googleapiclient.discovery.build')
     def test_save_to_gsheets_function(self, mock_build_func, mock_creds_func):
         """
         Test save_to_gsheets with mocked Google Sheets API calls
@@ -80,12 +99,14 @@ class LoadModuleTests(unittest.TestCase):
 
         self.assertEqual(url, "https://docs.google.com/spreadsheets/d/mock_spreadsheet_id/edit")
 
-        mock_build_func.assert_any_call('sheets', 'v4', credentials=mock_creds_func.return_value)
-        mock_build_func.assert_any_call('drive', 'v3', credentials=mock_creds_func.return_value)
+        mock_build_func.assert_any_call('sheets', 'v4', credentials=mock_creds_func.return_value,
+                                       static_discovery=True, cache_discovery=False)
+        mock_build_func.assert_any_call('drive', 'v3', credentials=mock_creds_func.return_value,
+                                       static_discovery=True, cache_discovery=False)
 
         mock_sheets_service.spreadsheets().values().update.assert_called_once()
 
-    @patch('utils.load.service_account.Credentials.from_service_account_file')
+    @patch('utils.load_gsheets.service_account.Credentials.from_service_account_file')
     def test_save_to_gsheets_missing_credentials_file(self, mock_creds_func):
         """
         Confirm save_to_gsheets raises FileNotFoundError if credentials file is missing
@@ -94,7 +115,7 @@ class LoadModuleTests(unittest.TestCase):
             with self.assertRaises(FileNotFoundError):
                 save_to_gsheets(self.test_data, "missing_credentials.json")
 
-    @patch('utils.load.create_engine')
+    @patch('utils.load_postgres.create_engine')
     def test_save_to_postgres_success(self, mock_engine_creator):
         """
         Test save_to_postgres successfully saves DataFrame to PostgreSQL
@@ -108,7 +129,7 @@ class LoadModuleTests(unittest.TestCase):
         self.assertTrue(success)
         mock_to_sql_func.assert_called_once_with("fashion_products", mock_engine_instance, if_exists='replace', index=False)
 
-    @patch('utils.load.create_engine')
+    @patch('utils.load_postgres.create_engine')
     def test_save_to_postgres_handles_sqlalchemy_error(self, mock_engine_creator):
         """
         Ensure save_to_postgres raises SQLAlchemyError on DB connection failure
@@ -126,7 +147,7 @@ class LoadModuleTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             save_to_postgres(empty_df)
 
-    @patch('utils.load.create_engine')
+    @patch('utils.load_postgres.create_engine')
     def test_save_to_postgres_with_custom_config(self, mock_engine_creator):
         """
         Test save_to_postgres with user-defined database connection parameters
@@ -148,7 +169,1075 @@ class LoadModuleTests(unittest.TestCase):
         self.assertTrue(success)
 
         expected_conn_str = f"postgresql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
-        mock_engine_creator.assert_called_once_with(expected_conn_str)
+        mock_engine_creator.assert_called_once()
+        self.assertEqual(mock_engine_creator.call_args.args[0], expected_conn_str)
+
+    def test_save_to_postgres_with_url_writes_to_sqlite(self):
+        """
+        Ensure db_config['url'] overrides the PostgreSQL connection string (used by the benchmarks)
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'products.db')}"
+            self.assertTrue(save_to_postgres(self.test_data, {'url': url}))
+
+            engine = create_engine(url)
+            stored = pd.read_sql_table("fashion_products", engine)
+            engine.dispose()
+
+        pd.testing.assert_frame_equal(stored, self.test_data)
+
+class ChunkWriterTests(unittest.TestCase):
+    """
+    Tests for the chunk-by-chunk writers used in streaming mode
+    """
+
+    def setUp(self):
+        self.test_data = pd.DataFrame({
+            'Title': ['P1', 'P2', 'P3', 'P4', 'P5'],
+            'Price': [160000.0, 320000.0, 480000.0, 640000.0, 800000.0],
+            'Rating': [4.5, 4.2, 3.9, 4.8, 2.5],
+            'Colors': [3, 2, 1, 5, 8],
+            'Size': ['M', 'L', 'S', 'XL', 'M'],
+            'Gender': ['Unisex', 'Women', 'Men', 'Men', 'Women'],
+            'timestamp': ['2025-05-01 10:00:00'] * 5
+        })
+        self.chunks = [self.test_data.iloc[:2], self.test_data.iloc[2:4], self.test_data.iloc[4:]]
+        self.addCleanup(dispose_engines)
+        self.addCleanup(clear_google_clients)
+
+    def test_csv_writer_appends_chunks_under_one_header(self):
+        """
+        Verify chunked CSV output matches save_to_csv on the whole frame
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            whole = save_to_csv(self.test_data, os.path.join(tmp, 'whole.csv'))
+            results = save_chunks(self.chunks, {'csv': CsvChunkWriter(os.path.join(tmp, 'chunked.csv'))})
+
+            with open(whole) as expected, open(results['csv']) as actual:
+                self.assertEqual(actual.read(), expected.read())
+
+    def test_postgres_writer_replaces_then_appends(self):
+        """
+        Verify the database writer replaces the table once and appends the remaining chunks
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'products.db')}"
+            save_chunks([self.test_data], {'db': PostgresChunkWriter({'url': url})})
+            results = save_chunks(self.chunks, {'db': PostgresChunkWriter({'url': url})})
+
+            engine = create_engine(url)
+            stored = pd.read_sql_table("fashion_products", engine)
+            engine.dispose()
+
+        self.assertIs(results['db'], True)
+        pd.testing.assert_frame_equal(stored, self.test_data)
+
+    @patch('utils.load_gsheets.service_account.Credentials.from_service_account_file')
+    @patch('utils.load_gsheets.googleapiclient.discovery.build')
+    def test_gsheets_writer_creates_one_spreadsheet(self, mock_build_func, mock_creds_func):
+        """
+        Verify the Sheets writer writes the header once and appends later chunks to the same spreadsheet
+        """
+        mock_sheets_service = MagicMock()
+        mock_build_func.side_effect = [mock_sheets_service, MagicMock()]
+        mock_sheets_service.spreadsheets().create().execute.return_value = {'spreadsheetId': 'sheet_id'}
+
+        with patch('os.path.exists', return_value=True):
+            results = save_chunks(self.chunks, {'sheets': GSheetsChunkWriter("creds.json")})
+
+        self.assertEqual(results['sheets'], "https://docs.google.com/spreadsheets/d/sheet_id/edit")
+        values_api = mock_sheets_service.spreadsheets().values()
+        updates = [call.kwargs for call in values_api.update.call_args_list]
+        self.assertEqual(updates[0]['body']['values'][0], list(self.test_data.columns))
+        self.assertEqual([update['range'] for update in updates], ["'Sheet1'!A1", "'Sheet1'!A4", "'Sheet1'!A6"])
+        self.assertEqual(mock_build_func.call_count, 2)
+
+    def test_failing_writer_does_not_stop_others(self):
+        """
+        Ensure one failing sink is reported while the other sinks receive every chunk
+        """
+        broken = CsvChunkWriter(os.path.join("missing_dir", "nested", "products.csv"))
+        with tempfile.TemporaryDirectory() as tmp:
+            working = CsvChunkWriter(os.path.join(tmp, 'products.csv'))
+            results = save_chunks(self.chunks, {'broken': broken, 'working': working})
+
+        self.assertIsInstance(results['broken'], OSError)
+        self.assertEqual(working.rows, 5)
+        self.assertEqual(working.chunks, 3)
+
+    def test_writer_without_chunks_raises(self):
+        """
+        Ensure closing a writer that received no data raises ValueError like the save_to_* functions
+        """
+        results = save_chunks([pd.DataFrame()], {'csv': CsvChunkWriter("unused.csv")})
+
+        self.assertIsInstance(results['csv'], ValueError)
+        self.assertFalse(os.path.exists("unused.csv"))
+
+class CompactSchemaLoaderTests(unittest.TestCase):
+    """
+    Tests that every loader accepts the compact (category/datetime/downcast) schema
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(dispose_engines)
+        self.full = pd.DataFrame({
+            'Title': ['P1', 'P2', 'P3'],
+            'Price': [160000.0, 320000.0, 735840.0],
+            'Rating': [4.5, 4.2, 3.9],
+            'Colors': [3, 2, 1],
+            'Size': pd.array(['M', 'L', 'M'], dtype='string'),
+            'Gender': pd.array(['Unisex', 'Women', 'Men'], dtype='string'),
+            'timestamp': pd.array(['2025-05-01 10:00:00'] * 3, dtype='string')
+        })
+        self.compact = compact_dtypes(self.full)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_csv_and_sheets_values_are_unchanged(self):
+        """
+        Verify CSV bytes and Sheets rows are identical for the compact and the full schema
+        """
+        with open(save_to_csv(self.full, self.path('full.csv'))) as f:
+            full_csv = f.read()
+        with open(save_to_csv(self.compact, self.path('compact.csv'))) as f:
+            self.assertEqual(f.read(), full_csv)
+
+        self.assertEqual(_sheet_rows(self.compact), _sheet_rows(self.full))
+
+    def test_fingerprints_ignore_compact_dtypes(self):
+        """
+        Ensure switching to the compact schema does not mark products as changed in incremental mode
+        """
+        for compact_hashes, full_hashes in zip(product_fingerprints(self.compact), product_fingerprints(self.full)):
+            pd.testing.assert_series_equal(compact_hashes, full_hashes)
+
+    def test_sqlite_round_trip(self):
+        """
+        Verify the to_sql path stores compact columns with their values
+        """
+        url = f"sqlite:///{self.path('products.db')}"
+        self.assertTrue(save_to_postgres(self.compact, {'url': url}))
+
+        stored = pd.read_sql_table("fashion_products", get_engine({'url': url}))
+        pd.testing.assert_frame_equal(stored, self.compact, check_dtype=False, check_categorical=False)
+
+    @unittest.skipUnless(pa, "pyarrow is not installed")
+    def test_parquet_keeps_compact_types(self):
+        """
+        Verify Parquet stores dictionary, timestamp and narrow numeric columns and reads them back as such
+        """
+        path = save_to_parquet(self.compact, self.path('products.parquet'))
+
+        loaded = pd.read_parquet(path)
+        pd.testing.assert_frame_equal(loaded, self.compact)
+
+class AtomicCsvTests(unittest.TestCase):
+    """
+    Tests for the temp-file-and-rename CSV output
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.test_data = pd.DataFrame({
+            'Title': ['P1', 'P2', 'P3'],
+            'Price': [160000.0, 320000.0, 480000.0],
+            'Size': ['M', 'L', 'S']
+        })
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_compression_is_inferred_from_extension(self):
+        """
+        Verify .gz and .zst outputs are compressed on the fly and read back unchanged
+        """
+        names = ['products.csv.gz'] + (['products.csv.zst'] if zstandard else [])
+        for name in names:
+            with self.subTest(name=name):
+                path = save_to_csv(self.test_data, self.path(name), buffer_size=16)
+                with open(path, 'rb') as f:
+                    self.assertNotEqual(f.read(5), b'Title')
+
+                pd.testing.assert_frame_equal(pd.read_csv(path), self.test_data)
+
+    def test_failed_write_keeps_previous_file(self):
+        """
+        Ensure a crash mid-write leaves the old CSV in place and no temporary files behind
+        """
+        path = save_to_csv(self.test_data, self.path('products.csv'))
+        with open(path) as f:
+            before = f.read()
+
+        with patch.object(pd.DataFrame, 'to_csv', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                save_to_csv(self.test_data.iloc[:1], path)
+
+        with open(path) as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(os.listdir(self.tmp.name), ['products.csv'])
+
+    def test_chunk_writer_replaces_file_only_on_close(self):
+        """
+        Verify readers see the previous file until the streaming run finishes, and aborted runs leave it untouched
+        """
+        path = save_to_csv(self.test_data.iloc[:1], self.path('products.csv.gz'))
+
+        writer = CsvChunkWriter(path)
+        writer.write(self.test_data.iloc[:2])
+        pd.testing.assert_frame_equal(pd.read_csv(path), self.test_data.iloc[:1])
+        writer.abort()
+        pd.testing.assert_frame_equal(pd.read_csv(path), self.test_data.iloc[:1])
+
+        writer = CsvChunkWriter(path)
+        for start in range(3):
+            writer.write(self.test_data.iloc[start:start + 1])
+        self.assertEqual(writer.close(), path)
+        pd.testing.assert_frame_equal(pd.read_csv(path), self.test_data)
+        self.assertEqual(os.listdir(self.tmp.name), ['products.csv.gz'])
+
+@unittest.skipUnless(pa, "pyarrow is not installed")
+class ColumnarOutputTests(unittest.TestCase):
+    """
+    Tests for the Parquet/Feather file sinks
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.test_data = pd.DataFrame({
+            'Title': ['P1', 'P2', 'P3', 'P4', 'P5'],
+            'Price': [160000.0, 320000.0, 480000.0, 640000.0, 800000.0],
+            'Rating': [4.5, 4.2, 3.9, 4.8, 2.5],
+            'Colors': [3, 2, 1, 5, 8],
+            'Size': pd.array(['M', 'L', None, 'XL', 'M'], dtype='string'),
+            'Gender': pd.array(['Unisex', 'Women', 'Men', 'Men', 'Women'], dtype='string'),
+            'timestamp': pd.array(['2025-05-01 10:00:00'] * 5, dtype='string')
+        })
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_parquet_and_feather_keep_column_types(self):
+        """
+        Verify both formats round-trip values and store typed columns instead of text
+        """
+        import pyarrow.parquet as pq
+
+        parquet_path = save_to_parquet(self.test_data, self.path('products.parquet'), row_group_size=2)
+        feather_path = save_to_feather(self.test_data, self.path('products.feather'))
+
+        schema = pq.read_schema(parquet_path)
+        self.assertEqual(str(schema.field('Price').type), 'double')
+        self.assertEqual(str(schema.field('Colors').type), 'int64')
+        self.assertEqual(str(schema.field('Size').type), 'string')
+        self.assertEqual(pq.ParquetFile(parquet_path).metadata.num_row_groups, 3)
+        for loaded in (pd.read_parquet(parquet_path), pd.read_feather(feather_path)):
+            pd.testing.assert_frame_equal(loaded, self.test_data, check_dtype=False)
+            self.assertEqual(loaded['Colors'].dtype, np.int64)
+
+    def test_partitioned_output_by_run_date(self):
+        """
+        Verify partitioned writes land in run_date=<date> directories and reruns replace their partition
+        """
+        dataset = self.path('products')
+        save_to_parquet(self.test_data, dataset, partition_by_run_date=True, run_date='2025-05-01')
+        save_to_parquet(self.test_data.iloc[:2], dataset, partition_by_run_date=True, run_date='2025-05-02')
+        path = save_to_parquet(self.test_data.iloc[:3], dataset, partition_by_run_date=True, run_date='2025-05-02')
+
+        self.assertEqual(path, os.path.join(os.path.abspath(dataset), 'run_date=2025-05-02', 'products.parquet'))
+        loaded = pd.read_parquet(dataset)
+        self.assertEqual(loaded.groupby('run_date', observed=True).size().to_dict(),
+                         {'2025-05-01': 5, '2025-05-02': 3})
+
+    def test_chunk_writer_appends_to_one_file(self):
+        """
+        Verify the chunk writer produces the same table as a single write, for both formats
+        """
+        chunks = [self.test_data.iloc[:2], self.test_data.iloc[2:]]
+        for file_format, read in (('parquet', pd.read_parquet), ('feather', pd.read_feather)):
+            with self.subTest(file_format=file_format):
+                writer = ColumnarChunkWriter(self.path(f'chunked.{file_format}'), file_format)
+                results = save_chunks(chunks, {'file': writer})
+
+                pd.testing.assert_frame_equal(read(results['file']), self.test_data, check_dtype=False)
+
+    def test_unknown_format_is_rejected(self):
+        """
+        Ensure an unsupported columnar format raises ValueError
+        """
+        with self.assertRaises(ValueError):
+            ColumnarChunkWriter(self.path('products.orc'), 'orc')
+
+class LoadDispatcherTests(unittest.TestCase):
+    """
+    Tests for the parallel sink fan-out used by run_pipeline
+    """
+
+    def setUp(self):
+        self.test_data = pd.DataFrame({'Title': ['P1', 'P2'], 'Price': [160000.0, 320000.0]})
+
+    @staticmethod
+    def slow_sink(seconds, result):
+        def save(dataframe):
+            time.sleep(seconds)
+            return result
+        return save
+
+    def test_sinks_run_concurrently(self):
+        """
+        Verify total load time follows the slowest sink rather than the sum of all sinks
+        """
+        start = time.perf_counter()
+        results = load_to_sinks(self.test_data, {
+            'csv': self.slow_sink(0.3, 'products.csv'),
+            'sheets': self.slow_sink(0.3, 'url'),
+            'db': self.slow_sink(0.3, True)
+        })
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(list(results), ['csv', 'sheets', 'db'])
+        self.assertEqual(results['csv'], SinkResult('csv', True, 'products.csv', None, results['csv'].seconds))
+        self.assertGreaterEqual(results['db'].seconds, 0.3)
+
+    def test_failing_and_slow_sinks_are_isolated(self):
+        """
+        Ensure an exception or a timeout in one sink is reported without affecting the others
+        """
+        def broken(dataframe):
+            raise SQLAlchemyError("connection refused")
+
+        start = time.perf_counter()
+        results = load_to_sinks(self.test_data, {
+            'csv': self.slow_sink(0.05, 'products.csv'),
+            'db': broken,
+            'sheets': self.slow_sink(2, 'url')
+        }, timeout=10, timeouts={'sheets': 0.2})
+
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertTrue(results['csv'].ok)
+        self.assertIsInstance(results['db'].error, SQLAlchemyError)
+        self.assertFalse(results['sheets'].ok)
+        self.assertIsInstance(results['sheets'].error, TimeoutError)
+
+    def test_timed_out_sink_cannot_commit_later(self):
+        """
+        Ensure a sink reported as timed out is refused its commit, while one already committing is awaited
+        """
+        finished = threading.Event()
+        outcome = {}
+
+        def late(dataframe):
+            outcome['daemon'] = threading.current_thread().daemon
+            time.sleep(0.3)
+            try:
+                current_sink_deadline().begin_commit()
+                outcome['committed'] = True
+            except TimeoutError:
+                outcome['committed'] = False
+            finally:
+                finished.set()
+
+        def committing(dataframe):
+            current_sink_deadline().begin_commit()
+            time.sleep(0.3)
+            return 'committed'
+
+        results = load_to_sinks(self.test_data, {'late': late, 'committing': committing}, timeout=0.1)
+
+        self.assertIsInstance(results['late'].error, TimeoutError)
+        self.assertEqual(results['committing'], SinkResult('committing', True, 'committed', None,
+                                                           results['committing'].seconds))
+        self.assertTrue(finished.wait(2))
+        self.assertEqual(outcome, {'daemon': True, 'committed': False})
+
+class FakeSheetsRequest:
+    def __init__(self, service, handler):
+        self.service = service
+        self.handler = handler
+
+    def execute(self, http=None):
+        return self.service.execute(self.handler)
+
+class FakeSheetsService:
+    """
+    In-memory stand-in for the Sheets/Drive services with grid limits and injectable HTTP errors
+    """
+
+    def __init__(self, spreadsheet_id='fake_id', rows=1000, columns=26, failures=()):
+        self.spreadsheet_id = spreadsheet_id
+        self.grid = {'rowCount': rows, 'columnCount': columns}
+        self.cells = {}
+        self.calls = []
+        self.failures = list(failures)
+        self.lock = threading.Lock()
+
+    def execute(self, handler):
+        with self.lock:
+            if self.failures:
+                status = self.failures.pop(0)
+                raise HttpError(httplib2.Response({'status': status, 'retry-after': '0'}), b'{"error": {}}')
+            return handler()
+
+    # Resource chain used by utils.load: spreadsheets(), spreadsheets().values(), permissions()
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def permissions(self):
+        return self
+
+    def properties(self):
+        return {'sheetId': 0, 'title': 'Sheet1', 'gridProperties': dict(self.grid)}
+
+    def create(self, body=None, fileId=None):
+        def handler():
+            self.calls.append('create' if fileId is None else 'permission')
+            if fileId is None:
+                self.grid = dict(body['sheets'][0]['properties']['gridProperties'])
+            return {'spreadsheetId': self.spreadsheet_id, 'sheets': [{'properties': self.properties()}]}
+        return FakeSheetsRequest(self, handler)
+
+    def get(self, spreadsheetId, fields=None):
+        def handler():
+            self.calls.append('get')
+            return {'sheets': [{'properties': self.properties()}]}
+        return FakeSheetsRequest(self, handler)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def handler():
+            self.calls.append('resize')
+            self.grid = dict(body['requests'][0]['updateSheetProperties']['properties']['gridProperties'])
+            self.cells = {(row, col): value for (row, col), value in self.cells.items()
+                          if row <= self.grid['rowCount'] and col <= self.grid['columnCount']}
+            return {}
+        return FakeSheetsRequest(self, handler)
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        def handler():
+            self.calls.append('update')
+            first_row = int(re.search(r'!A(\d+)$', range).group(1))
+            for offset, row in enumerate(body['values']):
+                for col, value in enumerate(row, start=1):
+                    if first_row + offset > self.grid['rowCount'] or col > self.grid['columnCount']:
+                        raise HttpError(httplib2.Response({'status': 400}), b'exceeds grid limits')
+                    self.cells[(first_row + offset, col)] = value
+            return {}
+        return FakeSheetsRequest(self, handler)
+
+    def table(self):
+        rows = max((row for row, _ in self.cells), default=0)
+        columns = max((col for _, col in self.cells), default=0)
+        return [[self.cells.get((row, col)) for col in range(1, columns + 1)] for row in range(1, rows + 1)]
+
+class SheetsUploadTests(unittest.TestCase):
+    """
+    Tests for the batched, parallel Google Sheets upload against a fake Sheets service
+    """
+
+    def setUp(self):
+        rows = 2500
+        self.test_data = pd.DataFrame({
+            'Title': [f'Product {i}' for i in range(rows)],
+            'Price': [float(i * 16000) for i in range(rows)],
+            'Size': ['M', 'L', 'S', 'XL', 'XXL'] * (rows // 5)
+        })
+        self.expected = [list(self.test_data.columns)] + self.test_data.values.tolist()
+        self.addCleanup(clear_google_clients)
+
+    def upload(self, service, **kwargs):
+        with patch('utils.load_gsheets.service_account.Credentials.from_service_account_file'), \
+                patch('utils.load_gsheets.googleapiclient.discovery.build', return_value=service), \
+                patch('os.path.exists', return_value=True):
+            return save_to_gsheets(self.test_data, "creds.json", **kwargs)
+
+    def test_large_frame_is_uploaded_in_parallel_blocks(self):
+        """
+        Verify blocks written by several threads reassemble into the full frame on a new spreadsheet
+        """
+        service = FakeSheetsService()
+
+        url = self.upload(service, batch_rows=300, max_workers=4)
+
+        self.assertEqual(url, "https://docs.google.com/spreadsheets/d/fake_id/edit")
+        self.assertEqual(service.table(), self.expected)
+        self.assertEqual(service.calls.count('update'), 9)
+        self.assertEqual(service.calls[:2], ['create', 'permission'])
+        self.assertNotIn('resize', service.calls)
+
+    def test_configured_spreadsheet_is_reused_and_trimmed(self):
+        """
+        Verify a configured spreadsheet is reused without creating files and stale rows are removed
+        """
+        service = FakeSheetsService(spreadsheet_id='existing', rows=5000, columns=26)
+        service.cells[(4000, 1)] = 'stale'
+
+        with patch.dict(os.environ, {'GSHEETS_SPREADSHEET_ID': 'existing'}):
+            url = self.upload(service, batch_rows=1000)
+
+        self.assertEqual(url, "https://docs.google.com/spreadsheets/d/existing/edit")
+        self.assertNotIn('create', service.calls)
+        self.assertNotIn('permission', service.calls)
+        self.assertEqual(service.grid, {'rowCount': len(self.expected), 'columnCount': 3})
+        self.assertEqual(service.table(), self.expected)
+
+    @patch('utils.load_gsheets.time.sleep')
+    def test_quota_errors_are_retried_with_backoff(self, mock_sleep):
+        """
+        Ensure 429/503 responses are retried using Retry-After while other errors fail fast
+        """
+        service = FakeSheetsService(failures=[429, 503, 429])
+
+        self.upload(service, batch_rows=1000, max_workers=2)
+
+        self.assertEqual(service.table(), self.expected)
+        self.assertEqual(mock_sleep.call_count, 3)
+        mock_sleep.assert_called_with(0.0)
+
+        clear_google_clients()
+        with self.assertRaises(HttpError):
+            self.upload(FakeSheetsService(failures=[400]))
+
+    @patch('utils.load_gsheets.service_account.Credentials.from_service_account_file')
+    @patch('utils.load_gsheets.googleapiclient.discovery.build')
+    def test_credentials_and_services_are_cached(self, mock_build_func, mock_creds_func):
+        """
+        Ensure repeated uploads read the key file and build each discovery client only once
+        """
+        services = {'sheets': FakeSheetsService(), 'drive': FakeSheetsService()}
+        mock_build_func.side_effect = lambda name, version, **kwargs: services[name]
+
+        with patch('os.path.exists', return_value=True):
+            for _ in range(3):
+                save_to_gsheets(self.test_data, "creds.json")
+            save_chunks([self.test_data], {'sheets': GSheetsChunkWriter("creds.json")})
+
+        mock_creds_func.assert_called_once()
+        self.assertEqual(sorted(call.args[0] for call in mock_build_func.call_args_list), ['drive', 'sheets'])
+        self.assertTrue(all(call.kwargs['static_discovery'] for call in mock_build_func.call_args_list))
+
+        clear_google_clients()
+        with patch('os.path.exists', return_value=True):
+            save_to_gsheets(self.test_data, "creds.json")
+        self.assertEqual(mock_creds_func.call_count, 2)
+
+    def test_chunks_grow_the_sheet_grid(self):
+        """
+        Verify chunk uploads extend the grid and keep rows in order
+        """
+        service = FakeSheetsService()
+        sheet = {'spreadsheetId': 'fake_id', 'sheetId': 0, 'title': 'Sheet1', 'rowCount': 10, 'columnCount': 3}
+        service.grid = {'rowCount': 10, 'columnCount': 3}
+        uploader = SheetsUploader(service, sheet, batch_rows=7, max_workers=3)
+
+        for start in range(0, len(self.expected), 600):
+            uploader.write(self.expected[start:start + 600])
+        uploader.close()
+
+        self.assertEqual(service.table(), self.expected)
+        self.assertEqual(service.grid['rowCount'], len(self.expected))
+
+class EngineRegistryTests(unittest.TestCase):
+    """
+    Tests for the shared engine/pool registry used by the PostgreSQL loaders
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(dispose_engines)
+        self.db_config = {'url': f"sqlite:///{os.path.join(self.tmp.name, 'products.db')}"}
+        self.test_data = pd.DataFrame({'Title': ['P1', 'P2'], 'Price': [160000.0, 320000.0]})
+
+    def test_engine_is_reused_per_db_config(self):
+        """
+        Verify equal configs share one engine and different pool options get their own
+        """
+        engine = get_engine(self.db_config)
+
+        self.assertIs(get_engine(dict(self.db_config)), engine)
+        self.assertIsNot(get_engine({**self.db_config, 'pool_size': 2}), engine)
+        self.assertEqual(get_engine({**self.db_config, 'pool_size': 2}).pool.size(), 2)
+
+    def test_repeated_saves_reuse_pooled_connection(self):
+        """
+        Verify repeated save_to_postgres calls check out the same pooled connection and record wait times
+        """
+        for _ in range(3):
+            self.assertTrue(save_to_postgres(self.test_data, self.db_config))
+        save_chunks([self.test_data], {'db': PostgresChunkWriter(self.db_config)})
+
+        stats = list(pool_stats().values())
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['connects'], 1)
+        self.assertGreaterEqual(stats[0]['checkouts'], 4)
+        self.assertGreaterEqual(stats[0]['wait_max'], stats[0]['wait_avg'])
+
+    def test_dispose_engines_empties_registry(self):
+        """
+        Ensure dispose_engines closes the pools so the next call creates a fresh engine
+        """
+        engine = get_engine(self.db_config)
+        engine.connect().close()
+
+        with self.assertLogs('utils.load_postgres', level='INFO') as logs:
+            dispose_engines()
+
+        self.assertEqual(pool_stats(), {})
+        self.assertIn('1 checkout', logs.output[0])
+        self.assertIsNot(get_engine(self.db_config), engine)
+
+# Set to a PostgreSQL URL (e.g. postgresql://postgres@localhost/etl_test) to run the integration tests
+TEST_DATABASE_URL = os.getenv('ETL_TEST_DATABASE_URL')
+
+class FakeCursor:
+    """
+    Records the SQL and COPY payloads a psycopg2 cursor would receive.
+    """
+
+    def __init__(self, log, fail_on_copy=False, results=None):
+        self.log = log
+        self.fail_on_copy = fail_on_copy
+        self.results = results if results is not None else []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.log.append(('execute', sql))
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+    def fetchone(self):
+        return self.results.pop(0)[0]
+
+    def copy_expert(self, sql, file):
+        if self.fail_on_copy:
+            raise RuntimeError("COPY failed")
+        self.log.append(('copy', sql, file.read()))
+
+    def close(self):
+        self.log.append(('cursor_close',))
+
+class FakeConnection:
+    def __init__(self, fail_on_copy=False, results=None):
+        self.log = []
+        self.fail_on_copy = fail_on_copy
+        self.results = results
+
+    def cursor(self):
+        return FakeCursor(self.log, self.fail_on_copy, self.results)
+
+    def commit(self):
+        self.log.append(('commit',))
+
+    def rollback(self):
+        self.log.append(('rollback',))
+
+    def close(self):
+        self.log.append(('close',))
+
+def fake_postgres_engine(connection):
+    engine = MagicMock()
+    engine.dialect.name = 'postgresql'
+    engine.raw_connection.return_value = connection
+    return engine
+
+class PostgresCopyLoaderTests(unittest.TestCase):
+    """
+    Tests for the COPY + staging-table swap PostgreSQL loader
+    """
+
+    def setUp(self):
+        self.test_data = pd.DataFrame({
+            'Title': ['Test Product', 'Another, "quoted" Product', ''],
+            'Price': [735840.0, np.nan, 0.1 + 0.2],
+            'Rating': [4.5, 4.2, 3.0],
+            'Colors': [3, 2, 1],
+            'Size': ['M', 'L', None],
+            'Gender': ['Unisex', 'Women', 'Men'],
+            'timestamp': ['2025-05-01 10:00:00'] * 3
+        })
+        self.addCleanup(dispose_engines)
+
+    @patch('utils.load_postgres.pacsv', None)
+    @patch('utils.load_postgres.create_engine')
+    def test_copy_into_staging_then_swap_in_one_transaction(self, mock_engine_creator):
+        """
+        Verify the statement order and that the COPY payload round-trips the frame
+        """
+        connection = FakeConnection()
+        mock_engine_creator.return_value = fake_postgres_engine(connection)
+
+        with patch.object(pd.DataFrame, 'to_sql') as mock_to_sql_func:
+            self.assertTrue(save_to_postgres(self.test_data))
+        mock_to_sql_func.assert_not_called()
+
+        steps = [entry[0] for entry in connection.log]
+        self.assertEqual(steps, ['execute', 'execute', 'copy', 'execute', 'execute', 'commit', 'cursor_close', 'close'])
+        self.assertEqual(connection.log[0][1], 'DROP TABLE IF EXISTS "fashion_products_staging"')
+        self.assertEqual(connection.log[1][1], (
+            'CREATE TABLE "fashion_products_staging" ("Title" TEXT, "Price" DOUBLE PRECISION, '
+            '"Rating" DOUBLE PRECISION, "Colors" BIGINT, "Size" TEXT, "Gender" TEXT, "timestamp" TEXT)'
+        ))
+        self.assertIn("FROM STDIN WITH (FORMAT csv, NULL '\\N')", connection.log[2][1])
+        self.assertEqual(connection.log[3][1], 'DROP TABLE IF EXISTS "fashion_products"')
+        self.assertEqual(connection.log[4][1], 'ALTER TABLE "fashion_products_staging" RENAME TO "fashion_products"')
+
+        copied = pd.read_csv(io.StringIO(connection.log[2][2]), header=None, names=self.test_data.columns,
+                             na_values=['\\N'], keep_default_na=False)
+        pd.testing.assert_frame_equal(copied, self.test_data.replace({None: np.nan}))
+
+    @unittest.skipUnless(pacsv, "pyarrow is not installed")
+    def test_pyarrow_payload_keeps_nulls_apart_from_empty_strings(self):
+        """
+        Ensure the pyarrow CSV payload uses unquoted empty fields for NULL and "" for empty strings
+        """
+        connection = FakeConnection()
+        load = StagingCopy(fake_postgres_engine(connection))
+        load.copy(self.test_data)
+
+        sql, payload = connection.log[2][1], connection.log[2][2].decode('utf-8')
+        self.assertIn("FROM STDIN WITH (FORMAT csv, NULL '')", sql)
+        lines = payload.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith('"Another, ""quoted"" Product",,4.2,2,'))
+        self.assertTrue(lines[2].startswith('"",0.30000000000000004,3,1,,"Men"'))
+
+    @patch('utils.load_postgres.COPY_BATCH_ROWS', 2)
+    def test_copy_is_sent_in_bounded_batches(self):
+        """
+        Ensure large frames are streamed as several COPY batches instead of one buffer
+        """
+        connection = FakeConnection()
+        load = StagingCopy(fake_postgres_engine(connection))
+        load.copy(self.test_data)
+        load.copy(self.test_data.iloc[:1])
+        load.commit()
+
+        copies = [entry for entry in connection.log if entry[0] == 'copy']
+        self.assertEqual([len(payload.splitlines()) for _, _, payload in copies], [2, 1, 1])
+        self.assertEqual(load.rows, 4)
+        self.assertEqual(sum(entry[1].startswith('CREATE TABLE') for entry in connection.log if entry[0] == 'execute'), 1)
+
+    @patch('utils.load_postgres.create_engine')
+    def test_failed_copy_rolls_back_without_touching_target(self, mock_engine_creator):
+        """
+        Ensure a failed COPY rolls back before the target table is dropped
+        """
+        connection = FakeConnection(fail_on_copy=True)
+        mock_engine_creator.return_value = fake_postgres_engine(connection)
+
+        with self.assertRaises(RuntimeError):
+            save_to_postgres(self.test_data)
+
+        self.assertIn(('rollback',), connection.log)
+        self.assertNotIn(('commit',), connection.log)
+        self.assertFalse(any('"fashion_products"' in entry[1] for entry in connection.log if entry[0] == 'execute'))
+
+    @patch('utils.load_postgres.pacsv', None)
+    @patch('utils.load_postgres.create_engine')
+    def test_chunk_writer_copies_every_chunk_then_swaps_once(self, mock_engine_creator):
+        """
+        Ensure the streaming writer COPYs each chunk into one staging table and swaps it in on close
+        """
+        connection = FakeConnection()
+        mock_engine_creator.return_value = fake_postgres_engine(connection)
+        chunks = [self.test_data.iloc[:2], self.test_data.iloc[2:]]
+
+        with patch.object(pd.DataFrame, 'to_sql') as mock_to_sql_func:
+            results = save_chunks(chunks, {'db': PostgresChunkWriter()})
+        mock_to_sql_func.assert_not_called()
+
+        self.assertIs(results['db'], True)
+        executed = [entry[1] for entry in connection.log if entry[0] == 'execute']
+        self.assertEqual(executed[0], 'DROP TABLE IF EXISTS "fashion_products_staging"')
+        self.assertTrue(executed[1].startswith('CREATE TABLE "fashion_products_staging" ('))
+        self.assertEqual(executed[2:], [
+            'DROP TABLE IF EXISTS "fashion_products"',
+            'ALTER TABLE "fashion_products_staging" RENAME TO "fashion_products"'
+        ])
+        copies = [entry for entry in connection.log if entry[0] == 'copy']
+        self.assertEqual([sql for _, sql, _ in copies], [
+            'COPY "fashion_products_staging" ("Title", "Price", "Rating", "Colors", "Size", "Gender", "timestamp") '
+            "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        ] * 2)
+        self.assertEqual([len(payload.splitlines()) for _, _, payload in copies], [2, 1])
+        self.assertEqual(connection.log[-3:], [('commit',), ('cursor_close',), ('close',)])
+
+    @patch('utils.load_postgres.create_engine')
+    def test_chunk_writer_failure_rolls_back_before_the_swap(self, mock_engine_creator):
+        """
+        Ensure a chunk that fails to COPY leaves the target table untouched
+        """
+        connection = FakeConnection(fail_on_copy=True)
+        mock_engine_creator.return_value = fake_postgres_engine(connection)
+
+        results = save_chunks([self.test_data], {'db': PostgresChunkWriter()})
+
+        self.assertIsInstance(results['db'], RuntimeError)
+        self.assertIn(('rollback',), connection.log)
+        self.assertNotIn(('commit',), connection.log)
+        self.assertFalse(any('"fashion_products"' in entry[1] for entry in connection.log if entry[0] == 'execute'))
+
+    @patch('utils.load_postgres.create_engine')
+    def test_postgres_sink_honours_the_sink_deadline(self, mock_engine_creator):
+        """
+        Ensure the loader caps statements at the time left and rolls back once the sink has timed out
+        """
+        connection = FakeConnection()
+        mock_engine_creator.return_value = fake_postgres_engine(connection)
+        finished = threading.Event()
+
+        def slow_save(dataframe):
+            try:
+                time.sleep(0.3)
+                return save_to_postgres(dataframe)
+            finally:
+                finished.set()
+
+        results = load_to_sinks(self.test_data, {'db': slow_save}, timeout=0.1)
+
+        self.assertIsInstance(results['db'].error, TimeoutError)
+        self.assertTrue(finished.wait(2))
+        self.assertEqual(connection.log[0], ('execute', 'SET LOCAL statement_timeout = 1'))
+        self.assertIn(('rollback',), connection.log)
+        self.assertNotIn(('commit',), connection.log)
+
+        connection = FakeConnection()
+        mock_engine_creator.return_value = fake_postgres_engine(connection)
+        dispose_engines()
+        results = load_to_sinks(self.test_data, {'db': save_to_postgres}, timeout=60)
+
+        self.assertTrue(results['db'].ok)
+        self.assertRegex(connection.log[0][1], r'^SET LOCAL statement_timeout = \d{5}$')
+        self.assertIn(('commit',), connection.log)
+
+class IncrementalLoadTests(unittest.TestCase):
+    """
+    Tests for product fingerprints and incremental-mode validation
+    """
+
+    def setUp(self):
+        self.test_data = pd.DataFrame({
+            'Title': ['Test Product', 'Another Product'],
+            'Price': [735840.0, 479840.0],
+            'Rating': [4.5, 4.2],
+            'Colors': [3, 2],
+            'Size': ['M', 'L'],
+            'Gender': ['Unisex', 'Women'],
+            'timestamp': ['2025-05-01 10:00:00', '2025-05-01 10:00:00']
+        })
+        self.addCleanup(dispose_engines)
+
+    def test_fingerprints_ignore_timestamp_and_track_content(self):
+        """
+        Verify keys depend on identity columns and hashes on content, never on the timestamp
+        """
+        keys, hashes = product_fingerprints(self.test_data)
+        rescraped = self.test_data.assign(timestamp='2025-06-01 08:00:00')
+        repriced = self.test_data.assign(Price=[1.0, 479840.0])
+
+        self.assertEqual(keys.dtype, np.int64)
+        self.assertTrue(keys.is_unique)
+        pd.testing.assert_series_equal(product_fingerprints(rescraped)[1], hashes)
+        self.assertEqual(product_fingerprints(repriced)[0].tolist(), keys.tolist())
+        self.assertEqual((product_fingerprints(repriced)[1] != hashes).tolist(), [True, False])
+
+    def test_fingerprints_are_stable_values(self):
+        """
+        Ensure fingerprints do not change between runs, column orders or compact dtypes
+        """
+        compact = self.test_data.astype({'Colors': 'int8', 'Size': 'category', 'Gender': 'string'})
+        reordered = self.test_data[list(reversed(self.test_data.columns))]
+
+        keys, hashes = product_fingerprints(self.test_data.iloc[:1])
+
+        self.assertEqual((keys.iloc[0], hashes.iloc[0]), (3256788860372549118, 7766502738863670336))
+        for variant in (compact, reordered):
+            for expected, actual in zip(product_fingerprints(self.test_data), product_fingerprints(variant)):
+                pd.testing.assert_series_equal(actual, expected)
+
+    def test_fingerprints_require_key_columns(self):
+        """
+        Ensure a frame without the key columns is rejected
+        """
+        with self.assertRaises(ValueError):
+            product_fingerprints(self.test_data.drop(columns='Size'))
+
+    @patch('utils.load_postgres.create_engine')
+    def test_incremental_load_copies_only_new_or_changed_rows(self, mock_engine_creator):
+        """
+        Verify rows whose content hash matches the table are skipped before COPY
+        """
+        keys, hashes = product_fingerprints(self.test_data)
+        existing = [(keys.iloc[0], hashes.iloc[0]), (keys.iloc[1], hashes.iloc[1] + 1)]
+        connection = FakeConnection(results=[
+            [('Title',), ('product_key',)],  # information_schema columns
+            existing,                         # live product keys and content hashes
+            [(0, 1)]                          # upsert counts
+        ])
+        mock_engine_creator.return_value = fake_postgres_engine(connection)
+        new_product = self.test_data.iloc[:1].assign(Title='Brand New')
+
+        result = save_to_postgres(pd.concat([self.test_data, new_product], ignore_index=True), mode='incremental')
+
+        copies = [entry for entry in connection.log if entry[0] == 'copy']
+        self.assertEqual(len(copies), 1)
+        payload = copies[0][2].decode('utf-8') if isinstance(copies[0][2], bytes) else copies[0][2]
+        copied_titles = [line.split(',')[0].strip('"') for line in payload.splitlines()]
+        self.assertEqual(copied_titles, ['Another Product', 'Brand New'])
+        self.assertEqual(result, UpsertResult(inserted=0, updated=1, unchanged=2, deleted=0))
+
+    def test_incremental_mode_requires_postgres_and_known_mode(self):
+        """
+        Ensure unsupported dialects and unknown modes raise ValueError
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            db_config = {'url': f"sqlite:///{os.path.join(tmp, 'products.db')}"}
+            with self.assertRaises(ValueError):
+                save_to_postgres(self.test_data, db_config, mode='incremental')
+            with self.assertRaises(ValueError):
+                save_to_postgres(self.test_data, db_config, mode='append')
+
+@unittest.skipUnless(TEST_DATABASE_URL, "ETL_TEST_DATABASE_URL is not set")
+class PostgresIntegrationTests(unittest.TestCase):
+    """
+    Load tests against a real PostgreSQL server
+    """
+
+    def setUp(self):
+        self.db_config = {'url': TEST_DATABASE_URL}
+        self.engine = create_engine(TEST_DATABASE_URL)
+        self.test_data = pd.DataFrame({
+            'Title': ['Test Product', 'Another, "quoted" Product', ''],
+            'Price': [735840.0, np.nan, 0.1 + 0.2],
+            'Rating': [4.5, 4.2, 3.0],
+            'Colors': [3, 2, 1],
+            'Size': ['M', None, 'L'],
+            'Gender': ['Unisex', 'Women', 'Men'],
+            'timestamp': ['2025-05-01 10:00:00'] * 3
+        })
+
+    def tearDown(self):
+        dispose_engines()
+        self.engine.dispose()
+
+    def read_table(self):
+        return pd.read_sql_table("fashion_products", self.engine)
+
+    def test_compact_schema_loads_via_copy(self):
+        """
+        Verify category, datetime64 and downcast columns load through COPY with their values
+        """
+        compact = compact_dtypes(self.test_data.fillna({'Price': 0.0, 'Size': 'M'}))
+
+        self.assertTrue(save_to_postgres(compact, self.db_config))
+
+        pd.testing.assert_frame_equal(self.read_table(), compact, check_dtype=False, check_categorical=False)
+
+    def test_save_to_postgres_replaces_table_via_copy(self):
+        """
+        Verify repeated loads replace the table contents and keep column types
+        """
+        save_to_postgres(self.test_data.iloc[:1], self.db_config)
+        self.assertTrue(save_to_postgres(self.test_data, self.db_config))
+
+        pd.testing.assert_frame_equal(self.read_table(), self.test_data)
+
+    @patch('utils.load_postgres.pacsv', None)
+    def test_save_to_postgres_without_pyarrow(self):
+        """
+        Verify the pandas CSV payload round-trips NULLs, empty strings and floats too
+        """
+        self.assertTrue(save_to_postgres(self.test_data, self.db_config))
+
+        pd.testing.assert_frame_equal(self.read_table(), self.test_data)
+
+    def test_failed_chunked_load_keeps_previous_table(self):
+        """
+        Ensure a load that fails halfway leaves the previous table untouched
+        """
+        save_to_postgres(self.test_data, self.db_config)
+        bad_chunk = self.test_data.assign(Colors=['many', 'few', 'none'])
+
+        results = save_chunks([self.test_data, bad_chunk], {'db': PostgresChunkWriter(self.db_config)})
+
+        self.assertIsInstance(results['db'], Exception)
+        pd.testing.assert_frame_equal(self.read_table(), self.test_data)
+
+    def read_products(self):
+        return self.read_table().sort_values('Title', ignore_index=True)
+
+    def test_incremental_load_counts_inserted_updated_unchanged(self):
+        """
+        Verify only new and changed products are written and counted
+        """
+        save_to_postgres(self.test_data, self.db_config)
+        first = save_to_postgres(self.test_data, self.db_config, mode='incremental')
+
+        changed = self.test_data.copy()
+        changed.loc[0, 'Price'] = 1.0
+        changed['timestamp'] = '2025-06-01 08:00:00'
+        new_product = changed.iloc[:1].assign(Title='Brand New')
+        second = save_to_postgres(pd.concat([changed, new_product], ignore_index=True), self.db_config,
+                                  mode='incremental')
+
+        self.assertEqual(first, UpsertResult(inserted=3, updated=0, unchanged=0, deleted=0))
+        self.assertEqual(second, UpsertResult(inserted=1, updated=1, unchanged=2, deleted=0))
+        stored = self.read_products()
+        self.assertEqual(len(stored), 4)
+        self.assertEqual(stored.loc[stored['Title'] == 'Test Product', 'Price'].tolist(), [1.0])
+        # Unchanged rows keep the timestamp of the run that last wrote them
+        self.assertEqual(stored.loc[stored['Title'] == '', 'timestamp'].tolist(), ['2025-05-01 10:00:00'])
+        self.assertTrue(stored['deleted_at'].isna().all())
+
+    def test_incremental_load_soft_deletes_missing_products(self):
+        """
+        Verify missing products are marked deleted and restored when they reappear
+        """
+        save_to_postgres(self.test_data, self.db_config, mode='replace')
+        save_to_postgres(self.test_data, self.db_config, mode='incremental')
+
+        shrunk = save_to_postgres(self.test_data.iloc[:2], self.db_config, mode='incremental', soft_delete=True)
+        deleted_titles = self.read_table().dropna(subset=['deleted_at'])['Title'].tolist()
+        restored = save_to_postgres(self.test_data, self.db_config, mode='incremental', soft_delete=True)
+
+        self.assertEqual(shrunk, UpsertResult(inserted=0, updated=0, unchanged=2, deleted=1))
+        self.assertEqual(deleted_titles, [''])
+        self.assertEqual(restored, UpsertResult(inserted=0, updated=1, unchanged=2, deleted=0))
+        self.assertTrue(self.read_table()['deleted_at'].isna().all())
+
+    def test_incremental_chunked_load_keeps_last_duplicate(self):
+        """
+        Verify chunked incremental loads upsert once per product, keeping the last occurrence
+        """
+        save_to_postgres(self.test_data, self.db_config)
+        repriced = self.test_data.iloc[:1].assign(Price=2.0)
+
+        results = save_chunks([self.test_data, repriced],
+                              {'db': PostgresChunkWriter(self.db_config, mode='incremental')})
+
+        self.assertEqual(results['db'], UpsertResult(inserted=3, updated=0, unchanged=0, deleted=0))
+        stored = self.read_products()
+        self.assertEqual(stored.loc[stored['Title'] == 'Test Product', 'Price'].tolist(), [2.0])
+
+    def test_chunked_load_swaps_in_all_chunks(self):
+        """
+        Verify every chunk lands in the table after the writer is closed
+        """
+        chunks = [self.test_data.iloc[:1], self.test_data.iloc[1:]]
+
+        results = save_chunks(chunks, {'db': PostgresChunkWriter(self.db_config)})
+
+        self.assertIs(results['db'], True)
+        pd.testing.assert_frame_equal(self.read_table(), self.test_data)
 
 if __name__ == '__main__':
     unittest.main()
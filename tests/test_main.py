@@ -0,0 +1,188 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import main
+from benchmarks.mock_server import FashionStudioServer
+from utils.load import INCREMENTAL_SINKS, pa
+from utils.transform import DedupIndex
+
+class CommandLineTests(unittest.TestCase):
+    """
+    Tests for the main.py command-line entry point.
+    """
+
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.workdir = workdir.name
+
+    def run_main(self, server, *options):
+        argv = ['--base-url', server.url, '--no-cache', '--rate-limit', '0', '--sinks', 'csv',
+                '--output-dir', os.path.join(self.workdir, 'out'),
+                '--metrics-file', os.path.join(self.workdir, 'run_metrics.json'), *options]
+        return main.main(argv)
+
+    def parse_error(self, *argv):
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()) as stderr:
+            main.build_parser().parse_args(argv)
+        return stderr.getvalue()
+
+    def test_defaults_and_validation(self):
+        """
+        Ensure the defaults match the previous hard-coded run and invalid sinks or pages are rejected.
+        """
+        args = main.build_parser().parse_args([])
+        self.assertEqual((args.start_page, args.end_page), (1, 50))
+        self.assertEqual(args.sinks, list(main.DEFAULT_SINKS))
+        self.assertEqual(args.min_rows, main.MIN_VALID_ROWS)
+
+        self.assertIn("Unknown sink 's3'", self.parse_error('--sinks', 'csv,s3'))
+        self.assertIn('must be at least 1', self.parse_error('--start-page', '0'))
+        for option in ('--parse-workers', '--chunk-size', '--min-rows'):
+            self.assertIn('must be at least 0', self.parse_error(option, '-1'))
+        self.assertEqual(args.metrics_file, os.path.join('.cache', 'run_metrics.json'))
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main.main(['--start-page', '5', '--end-page', '2'])
+
+    def test_postgres_load_mode(self):
+        """
+        Ensure --postgres-mode reaches the PostgreSQL sink options and unknown modes are rejected.
+        """
+        args = main.build_parser().parse_args(['--postgres-mode', 'incremental'])
+        self.assertEqual(main._sink_options(args)['postgres'], {'mode': 'incremental'})
+        self.assertEqual(main.build_parser().parse_args([]).postgres_mode, 'replace')
+        self.assertIn("invalid choice: 'upsert'", self.parse_error('--postgres-mode', 'upsert'))
+
+    def test_sink_timeout_option(self):
+        """
+        Ensure --sink-timeout defaults to ETL_SINK_TIMEOUT and rejects negative values.
+        """
+        self.assertEqual(main.build_parser().parse_args([]).sink_timeout, main.SINK_TIMEOUT)
+        with patch.dict(os.environ, {'ETL_SINK_TIMEOUT': '30'}):
+            self.assertEqual(main.build_parser().parse_args([]).sink_timeout, 30)
+        self.assertEqual(main.build_parser().parse_args(['--sink-timeout', '0']).sink_timeout, 0)
+        self.assertIn('must be at least 0', self.parse_error('--sink-timeout', '-1'))
+
+    def test_dedup_requires_incremental_sinks(self):
+        """
+        Ensure the dedup index is only allowed with sinks that upsert, so a delta never replaces the catalogue.
+        """
+        main._check_dedup_sinks(['postgres'], {'postgres': {'mode': 'incremental'}})
+        rejected = (
+            (['postgres'], {}),
+            (['postgres'], {'postgres': {'mode': 'incremental', 'soft_delete': True}}),
+            (['postgres', 'csv'], {'postgres': {'mode': 'incremental'}})
+        )
+        for sinks, options in rejected:
+            with self.assertRaises(ValueError):
+                main._check_dedup_sinks(sinks, options)
+
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()) as stderr:
+            main.main(['--dedup', '--sinks', 'csv'])
+        self.assertIn('CSV file', stderr.getvalue())
+
+        # Called directly, run_pipeline fails before extraction and leaves the existing output alone
+        path = os.path.join(self.workdir, 'products.csv')
+        pd.DataFrame({'Title': ['A', 'B']}).to_csv(path, index=False)
+        dedup_index = DedupIndex(os.path.join(self.workdir, 'dedup_index.npz'))
+        success = main.run_pipeline(dedup_index=dedup_index, sinks=['csv'], sink_options={'csv': {'filename': path}},
+                                    extract_options={'base_url': 'http://127.0.0.1:9', 'end_page': 1})
+        self.assertFalse(success)
+        self.assertEqual(len(pd.read_csv(path)), 2)
+        self.assertFalse(os.path.exists(dedup_index.path))
+
+    def test_page_range_sinks_and_output_dir(self):
+        """
+        Ensure a run only crawls the requested pages and writes every selected file sink to the output directory.
+        """
+        sinks = 'csv,parquet' if pa is not None else 'csv'
+        with FashionStudioServer(n_pages=5, products_per_page=4) as server:
+            code = self.run_main(server, '--start-page', '2', '--end-page', '4', '--workers', '2', '--sinks', sinks)
+
+        self.assertEqual(code, 0)
+        products = pd.read_csv(os.path.join(self.workdir, 'out', 'products.csv'))
+        self.assertEqual(len(products), 12)
+        if pa is not None:
+            self.assertEqual(len(pd.read_parquet(os.path.join(self.workdir, 'out', 'products.parquet'))), 12)
+        with open(os.path.join(self.workdir, 'run_metrics.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['spans']['extract.scrape_page']['count'], 3)
+
+    def test_sample_fallback_can_be_disabled(self):
+        """
+        Ensure --min-rows 0 fails an empty crawl instead of loading the sample dataset.
+        """
+        with FashionStudioServer(n_pages=1, products_per_page=4) as server:
+            code = self.run_main(server, '--start-page', '3', '--end-page', '4', '--min-rows', '0')
+            self.assertEqual(code, 1)
+            self.assertFalse(os.path.exists(os.path.join(self.workdir, 'out', 'products.csv')))
+
+            code = self.run_main(server, '--start-page', '3', '--end-page', '4', '--chunk-size', '10')
+            self.assertEqual(code, 0)
+            self.assertEqual(len(pd.read_csv(os.path.join(self.workdir, 'out', 'products.csv'))), 100)
+
+class StreamingPipelineTests(unittest.TestCase):
+    """
+    Tests for the sink results of run_streaming_pipeline.
+    """
+
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.workdir = workdir.name
+
+    def test_failed_primary_sink_keeps_real_rows_in_secondary_sinks(self):
+        """
+        Ensure a primary sink failing on its first chunk fails the run instead of loading sample data everywhere.
+        """
+        primary = os.path.join(self.workdir, 'products.csv')
+        secondary = os.path.join(self.workdir, 'backup.csv')
+        # A second CSV sink; the primary one fails on its first chunk because of the unknown compression
+        with FashionStudioServer(n_pages=3, products_per_page=4) as server, \
+                patch.dict(main.SINKS, {'backup': main.SINKS['csv']._replace(label='Backup CSV')}):
+            success = main.run_pipeline(
+                chunk_size=5, sinks=['csv', 'backup'],
+                extract_options={'end_page': 3, 'requests_per_second': 0, 'base_url': server.url},
+                sink_options={'csv': {'filename': primary, 'compression': 'bogus'}, 'backup': {'filename': secondary}}
+            )
+
+        self.assertFalse(success)
+        self.assertFalse(os.path.exists(primary))
+        products = pd.read_csv(secondary)
+        self.assertEqual(len(products), 12)
+        self.assertFalse(products['Title'].str.startswith('Fashion Product').any())
+
+    def run_dedup(self, server, dedup_index, **csv_options):
+        # The CSV sink stands in for an upserting sink so the dedup paths can run without a database
+        with patch.dict(INCREMENTAL_SINKS, {'csv': {}}):
+            return main.run_pipeline(
+                chunk_size=5, dedup_index=dedup_index, sinks=['csv'],
+                extract_options={'end_page': 3, 'requests_per_second': 0, 'base_url': server.url},
+                sink_options={'csv': {'filename': os.path.join(self.workdir, 'products.csv'), **csv_options}}
+            )
+
+    def test_dedup_index_is_not_saved_when_the_primary_sink_fails(self):
+        """
+        Ensure products are only remembered once they were loaded, so a failed run does not hide them later.
+        """
+        path = os.path.join(self.workdir, 'dedup_index.npz')
+        with FashionStudioServer(n_pages=3, products_per_page=4) as server:
+            self.assertFalse(self.run_dedup(server, DedupIndex(path), compression='bogus'))
+            self.assertFalse(os.path.exists(path))
+
+            # The next run still sees every product as new, then finds nothing new on the run after it
+            self.assertTrue(self.run_dedup(server, DedupIndex(path)))
+            self.assertEqual(len(pd.read_csv(os.path.join(self.workdir, 'products.csv'))), 12)
+            self.assertEqual(len(DedupIndex(path)), 12)
+
+            dedup_index = DedupIndex(path)
+            self.assertTrue(self.run_dedup(server, dedup_index))
+            self.assertEqual(dedup_index.stats()['unchanged'], 12)
+            self.assertEqual(len(pd.read_csv(os.path.join(self.workdir, 'products.csv'))), 12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+from benchmarks.mock_server import FashionStudioServer
+from utils import metrics
+from utils.extract import extract_data
+from utils.load import load_to_sinks
+from utils.transform import transform_data
+
+class RunMetricsTests(unittest.TestCase):
+    """
+    Tests for spans, counters and the run report exports.
+    """
+
+    def setUp(self):
+        self.addCleanup(metrics.finish_run)
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.workdir = workdir.name
+
+    def test_instrumentation_is_a_no_op_without_a_run(self):
+        """
+        Ensure spans, counters and decorated functions work without recording anything when no run is active.
+        """
+        double = metrics.timed('double')(lambda values: values * 2)
+
+        with metrics.span('idle', rows=3) as span:
+            span.rows = 4
+        metrics.increment('bytes_fetched', 10)
+
+        self.assertEqual(double([1]), [1, 1])
+        self.assertIsNone(metrics.current())
+        self.assertIsNone(metrics.snapshot('idle'))
+
+    def test_spans_aggregate_calls_rows_and_errors(self):
+        """
+        Ensure spans with the same name are merged and rows/sec is derived from their total time.
+        """
+        run = metrics.start_run()
+        parse = metrics.timed('parse')(lambda n: list(range(n)))
+
+        parse(3)
+        parse(5)
+        with self.assertRaises(ValueError):
+            with metrics.span('load', rows=2):
+                raise ValueError('sink down')
+        metrics.increment('bytes_fetched', 100)
+        metrics.increment('bytes_fetched', 50)
+
+        report = run.report()
+        self.assertEqual(report['spans']['parse']['count'], 2)
+        self.assertEqual(report['spans']['parse']['rows'], 8)
+        self.assertGreater(report['spans']['parse']['rows_per_sec'], 0)
+        self.assertEqual(report['spans']['load']['errors'], 1)
+        self.assertEqual(report['counters'], {'bytes_fetched': 150})
+        self.assertGreater(report['peak_rss_bytes'], 0)
+
+    def test_json_and_prometheus_exports(self):
+        """
+        Ensure the JSON report round-trips and the Prometheus file uses the text exposition format.
+        """
+        run = metrics.start_run()
+        with metrics.span('load.CSV file', rows=10):
+            pass
+        metrics.increment('bytes_fetched', 2048)
+        metrics.finish_run()
+
+        json_path = run.write_json(os.path.join(self.workdir, 'reports', 'run.json'))
+        prometheus_path = run.write_prometheus(os.path.join(self.workdir, 'etl.prom'))
+
+        with open(json_path, encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertEqual(report['spans']['load.CSV file']['rows'], 10)
+        self.assertIsNotNone(report['finished'])
+
+        with open(prometheus_path, encoding='utf-8') as f:
+            text = f.read()
+        self.assertIn('# TYPE etl_span_seconds_total counter', text)
+        self.assertIn('etl_span_rows_total{span="load.CSV file"} 10', text)
+        self.assertIn('etl_bytes_fetched_total 2048', text)
+        self.assertEqual(sorted(os.listdir(self.workdir)), ['etl.prom', 'reports'])
+
+    def test_tracemalloc_snapshots(self):
+        """
+        Ensure snapshots list the largest allocations and tracemalloc is stopped when the run ends.
+        """
+        if tracemalloc.is_tracing():
+            self.skipTest("tracemalloc is already enabled")
+        run = metrics.start_run(trace_memory=True, top_allocations=3)
+
+        data = [str(i) * 10 for i in range(20000)]
+        snapshot = metrics.snapshot('transform')
+        metrics.finish_run()
+
+        self.assertGreater(snapshot['traced_peak_bytes'], 0)
+        self.assertEqual(len(snapshot['top_allocations']), 3)
+        self.assertIn('etl_tracemalloc_peak_bytes{stage="transform"}', run.prometheus_text())
+        self.assertFalse(tracemalloc.is_tracing())
+        del data
+
+class PipelineInstrumentationTests(unittest.TestCase):
+    """
+    Tests for the spans recorded by extract, transform and load.
+    """
+
+    def setUp(self):
+        self.addCleanup(metrics.finish_run)
+
+    def test_pipeline_stages_record_spans(self):
+        """
+        Ensure a run records extraction per page, every cleaner and each loader.
+        """
+        run = metrics.start_run()
+        with FashionStudioServer(n_pages=3, products_per_page=4) as server:
+            raw = extract_data(1, 3, requests_per_second=0, base_url=server.url)
+        cleaned = transform_data(raw)
+        load_to_sinks(cleaned, {'memory': lambda df: len(df)})
+
+        report = run.report()
+        spans = report['spans']
+        self.assertEqual(spans['extract']['rows'], 12)
+        self.assertEqual(spans['extract.scrape_page']['count'], 3)
+        self.assertGreater(report['counters']['bytes_fetched'], 0)
+        for column in ('price', 'rating', 'colors', 'size', 'gender'):
+            self.assertEqual(spans[f'transform.clean_{column}']['rows'], 12)
+        self.assertEqual(spans['transform']['rows'], len(cleaned))
+        self.assertEqual(spans['load.memory']['rows'], len(cleaned))
+
+if __name__ == '__main__':
+    unittest.main()
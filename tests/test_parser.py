@@ -0,0 +1,146 @@
+import unittest
+from unittest.mock import patch
+from utils.parser import BeautifulSoupParser, LxmlParser, get_parser, lxml, DEFAULT_PARSER
+from benchmarks.mock_server import render_page
+
+EDGE_CASE_HTML = """
+<html>
+    <body>
+        <div class="collection-card">
+            <div class="product-details">
+                <h3 class="product-title">  Nested <span>Title</span> &amp; More  </h3>
+                <div class="price-container"><span class="price">$45.99</span></div>
+                <p>Rating: ⭐ 4.8 / 5</p>
+                <p>3 Colors</p>
+                <p>Size: M</p>
+                <p>Gender: Men</p>
+            </div>
+        </div>
+        <div class="collection-card featured">
+            <h3>Heading Outside Details</h3>
+            <div class="product-details"><p class="price">Price Unavailable</p></div>
+            <p>★ 3.9 / 5</p>
+            <p>Women</p>
+        </div>
+        <div class="collection-card">
+            <div class="product-details">
+                <h3>Details Heading</h3>
+                <div class="price-container"><em>no price here</em></div>
+            </div>
+            <span class="price
+                sale">$12.00</span>
+            <p>Size XL</p>
+        </div>
+        <div class="collection-card">
+            <p>Unisex</p>
+        </div>
+    </body>
+</html>
+"""
+
+TEST_EXTRACT_HTML = """
+<html>
+    <body>
+        <div class="collection-card">
+            <div class="product-details">
+                <h3 class="collection-title">Test Product</h3>
+                <div class="collection-price">$45.99</div>
+                <div class="collection-rating">4.5 / 5</div>
+            </div>
+        </div>
+    </body>
+</html>
+"""
+
+WELL_FORMED_CARD = (
+    '<div class="collection-card"><div class="product-details">'
+    '<h3 class="product-title">Tee</h3><div class="price-container"><span class="price">$12.00</span></div>'
+    '<p>Rating: ⭐ 4.1 / 5</p><p>3 Colors</p><p>Size: M</p><p>Gender: Men</p>'
+    '</div></div>'
+)
+
+# Each breaks the card in a way that lxml and html.parser recover from differently
+MALFORMED_CARDS = {
+    'unclosed p': WELL_FORMED_CARD.replace('4.1 / 5</p>', '4.1 / 5'),
+    'div inside p': WELL_FORMED_CARD.replace('4.1 / 5</p>', '<div class="price">$9</div> 4.1 / 5</p>'),
+    'unclosed heading': WELL_FORMED_CARD.replace('Tee</h3>', 'Tee'),
+    'stray end tag': WELL_FORMED_CARD.replace('3 Colors</p>', '3 Colors</span></p>')
+}
+
+class TestParserBackends(unittest.TestCase):
+    """
+    Unit tests for the pluggable HTML parser backends.
+    """
+
+    def test_bs4_parser_extracts_card_fields(self):
+        """
+        Ensure the reference backend extracts every field of a well-formed card.
+        """
+        products = BeautifulSoupParser().parse_cards(EDGE_CASE_HTML)
+
+        self.assertEqual(len(products), 4)
+        self.assertEqual(products[0], {
+            'Title': 'Nested Title & More',
+            'Price': '$45.99',
+            'Rating': 'Rating: ⭐ 4.8 / 5',
+            'Colors': '3 Colors',
+            'Size': 'Size: M',
+            'Gender': 'Gender: Men'
+        })
+        self.assertEqual(products[3]['Title'], 'Unknown Product')
+        self.assertEqual(products[3]['Price'], 'Price Unavailable')
+
+    @unittest.skipUnless(lxml, "lxml is not installed")
+    def test_lxml_parser_matches_bs4_on_edge_cases(self):
+        """
+        Ensure the lxml backend gives the same product dicts as BeautifulSoup on tricky markup.
+        """
+        for html in (EDGE_CASE_HTML, TEST_EXTRACT_HTML, "", "   ", "<html><body></body></html>"):
+            with self.subTest(html=html[:40]):
+                self.assertEqual(LxmlParser().parse_cards(html), BeautifulSoupParser().parse_cards(html))
+
+    @unittest.skipUnless(lxml, "lxml is not installed")
+    def test_lxml_parser_matches_bs4_on_catalogue_pages(self):
+        """
+        Ensure both backends agree on pages in the fashion-studio layout, as str and bytes.
+        """
+        for page in range(1, 21):
+            html = render_page(page)
+            with self.subTest(page=page):
+                expected = BeautifulSoupParser().parse_cards(html)
+                self.assertEqual(len(expected), 20)
+                self.assertEqual(LxmlParser().parse_cards(html), expected)
+                self.assertEqual(LxmlParser().parse_cards(html.encode('utf-8')), expected)
+
+    @unittest.skipUnless(lxml, "lxml is not installed")
+    def test_lxml_parser_falls_back_to_bs4_on_malformed_cards(self):
+        """
+        Ensure malformed cards give the reference dicts, while well-formed pages never re-parse with bs4.
+        """
+        for name, card in MALFORMED_CARDS.items():
+            html = f"<html><body>{WELL_FORMED_CARD}{card}</body></html>"
+            with self.subTest(name):
+                expected = BeautifulSoupParser().parse_cards(html)
+                self.assertEqual(len(expected), 2)
+                self.assertEqual(LxmlParser().parse_cards(html), expected)
+
+        # The unclosed paragraph is where the two trees really differ: html.parser nests the next paragraphs
+        unclosed = f"<html><body>{MALFORMED_CARDS['unclosed p']}</body></html>"
+        self.assertEqual(LxmlParser().parse_cards(unclosed)[0]['Rating'], 'Rating: ⭐ 4.1 / 53 ColorsSize: MGender: Men')
+
+        with patch.object(BeautifulSoupParser, 'parse_cards') as mocked_bs4:
+            LxmlParser().parse_cards(render_page(1))
+        mocked_bs4.assert_not_called()
+
+    def test_get_parser_reuses_instances_and_rejects_unknown(self):
+        """
+        Ensure get_parser caches backends and raises ValueError for unknown names.
+        """
+        self.assertIs(get_parser('bs4'), get_parser('bs4'))
+        self.assertEqual(get_parser().name, DEFAULT_PARSER)
+        with self.assertRaises(ValueError):
+            get_parser('html5lib')
+
+
+if __name__ == '__main__':
+    unittest.main()
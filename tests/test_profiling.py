@@ -0,0 +1,138 @@
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+import pandas as pd
+from utils import profiling
+from utils.load import load_to_sinks
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+class ProfilingTests(unittest.TestCase):
+    """
+    Tests for the opt-in per-stage profiler.
+    """
+
+    def setUp(self):
+        self.addCleanup(profiling.stop_profiling)
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.workdir = workdir.name
+
+    def function_names(self, path):
+        return {func[2] for func in pstats.Stats(path).stats}
+
+    def test_disabled_profiling_writes_nothing(self):
+        """
+        Ensure profile() and profiled_iter() pass through when no session is active.
+        """
+        with profiling.profile('transform'):
+            _busy(0.001)
+
+        self.assertEqual(list(profiling.profiled_iter('extract', [1, 2])), [1, 2])
+        self.assertEqual(profiling.stop_profiling(), [])
+
+    def test_cprofile_writes_pstats_per_selected_stage(self):
+        """
+        Ensure selected stages get their own file, with loaders running in sink threads sampled instead.
+        """
+        session = profiling.start_profiling(['transform', 'load'], output_dir=self.workdir, interval=0.001)
+        with profiling.profile('transform'):
+            _busy(0.01)
+        with profiling.profile('extract'):
+            _busy(0.01)
+        load_to_sinks(pd.DataFrame({'Title': ['A']}), {'memory': lambda df: _busy(0.2)}, timeout=None)
+
+        paths = profiling.stop_profiling()
+
+        self.assertEqual([os.path.basename(path) for path in paths], ['transform.pstats', 'load.memory.collapsed'])
+        self.assertTrue(all(os.path.dirname(path) == session.run_dir for path in paths))
+        self.assertIn('_busy', self.function_names(paths[0]))
+        with open(paths[1], encoding='utf-8') as f:
+            self.assertIn('_busy (test_profiling.py', f.read())
+
+    def test_concurrent_stages_share_one_cprofile(self):
+        """
+        Ensure a stage entered while another thread holds the profiler is sampled rather than failing.
+        """
+        profiling.start_profiling(['all'], output_dir=self.workdir, interval=0.001)
+        barrier = threading.Barrier(2)
+        errors = []
+
+        def stage(name):
+            try:
+                with profiling.profile(name):
+                    barrier.wait(timeout=5)
+                    _busy(0.1)
+                    barrier.wait(timeout=5)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=stage, args=(name,)) for name in ('transform', 'load.csv')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        paths = profiling.stop_profiling()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(os.path.splitext(os.path.basename(path))[1] for path in paths),
+                         ['.collapsed', '.pstats'])
+
+    def test_nested_stages_are_exclusive(self):
+        """
+        Ensure a stage pulled from inside another (streaming generators) is profiled separately.
+        """
+        profiling.start_profiling(['all'], output_dir=self.workdir)
+
+        def extract():
+            for _ in range(3):
+                _busy(0.005)
+                yield 1
+
+        def transform(chunks):
+            for chunk in chunks:
+                yield sum(range(10000)) + chunk
+
+        chunks = profiling.profiled_iter('transform', transform(profiling.profiled_iter('extract', extract())))
+        self.assertEqual(len(list(chunks)), 3)
+        paths = dict((os.path.basename(path), path) for path in profiling.stop_profiling())
+
+        self.assertIn('_busy', self.function_names(paths['extract.pstats']))
+        self.assertNotIn('_busy', self.function_names(paths['transform.pstats']))
+
+    def test_sampler_writes_collapsed_stacks(self):
+        """
+        Ensure the sampling mode writes flamegraph-ready "frame;frame count" lines.
+        """
+        profiling.start_profiling(['transform'], mode='sample', output_dir=self.workdir, interval=0.001)
+        with profiling.profile('transform'):
+            _busy(0.2)
+
+        paths = profiling.stop_profiling()
+
+        self.assertEqual([os.path.basename(path) for path in paths], ['transform.collapsed'])
+        with open(paths[0], encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        busy = [line for line in lines if '_busy (test_profiling.py' in line]
+        self.assertTrue(busy)
+        stack, count = busy[0].rsplit(' ', 1)
+        self.assertTrue(stack.startswith('MainThread;'))
+        self.assertGreater(int(count), 0)
+
+    def test_unknown_mode_is_rejected(self):
+        """
+        Ensure an unsupported profiler mode fails early.
+        """
+        with self.assertRaises(ValueError):
+            profiling.start_profiling(['all'], mode='perf', output_dir=self.workdir)
+
+if __name__ == '__main__':
+    unittest.main()
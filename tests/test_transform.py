@@ -1,9 +1,29 @@
+import gc
 import unittest
 import os
+import tempfile
+import tracemalloc
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
-from utils.load import save_to_csv, save_to_gsheets, save_to_postgres
+from utils.load import save_to_csv, save_to_gsheets, save_to_postgres, dispose_engines, clear_google_clients
 from sqlalchemy.exc import SQLAlchemyError
+from utils.transform import (
+    transform_data, transform_chunks, clean_price, clean_rating, clean_colors, clean_size, clean_gender,
+    clean_price_vectorized, clean_rating_vectorized, clean_colors_vectorized,
+    clean_size_vectorized, clean_gender_vectorized, cleaner_cache_stats, clear_cleaner_caches, CLEANER_CACHE_SIZE,
+    compact_dtypes, frame_memory, DedupIndex
+)
+
+RAW_VALUES = {
+    'Price': ['$45.99', '$100', 'Price Unavailable', 'USD 12.5', 'free', '  $7.10 ', None, np.nan, '$', '$3.5.6'],
+    'Rating': ['Rating: ⭐ 4.8 / 5', 'Rating: ★ 3.3 / 5', 'Invalid Rating', 'Rating: ⭐ Invalid Rating / 5',
+               '4.5 / 5', 'Rating: / 5 stars 2', 'no rating', None, np.nan, '5'],
+    'Colors': ['3 Colors', '10 Colors', 'Colors Unavailable', 'Colors', 'many 2 4', None, np.nan, '0 Colors', ' 7', 'x'],
+    'Size': ['Size: M', 'Size: XL ', 'Size Unavailable', 'SizeL', '  XXL ', 'Size:', None, np.nan, 'S', 'Size: Size: S'],
+    'Gender': ['Gender: Men', 'Gender: Women', 'Gender Unavailable', 'GenderUnisex', 'Men', 'Women and Men',
+               'Unisex', ' other ', None, np.nan]
+}
 
 class TestLoadFunctions(unittest.TestCase):
     """
@@ -25,6 +45,8 @@ class TestLoadFunctions(unittest.TestCase):
         })
 
         self.test_csv_path = "test_products.csv"
+        self.addCleanup(dispose_engines)
+        self.addCleanup(clear_google_clients)
 
     def tearDown(self):
         """
@@ -54,8 +76,8 @@ class TestLoadFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             save_to_csv(empty_df, self.test_csv_path)
 
-    @patch('utils.load.service_account.Credentials.from_service_account_file')
-    @patch('utils.load.googleapiclient.discovery.build')
+    @patch('utils.load_gsheets.service_account.Credentials.from_service_account_file')
+    @patch('utils.load_gsheets.googleapiclient.discovery.build')
     def test_save_to_gsheets_with_mock(self, mock_build, mock_creds):
         """
         Validate save_to_gsheets with mocked Google Sheets API services
@@ -73,12 +95,14 @@ class TestLoadFunctions(unittest.TestCase):
         expected_url = "https://docs.google.com/spreadsheets/d/mock_id/edit"
         self.assertEqual(sheet_url, expected_url)
 
-        mock_build.assert_any_call('sheets', 'v4', credentials=mock_creds.return_value)
-        mock_build.assert_any_call('drive', 'v3', credentials=mock_creds.return_value)
+        mock_build.assert_any_call('sheets', 'v4', credentials=mock_creds.return_value,
+                                   static_discovery=True, cache_discovery=False)
+        mock_build.assert_any_call('drive', 'v3', credentials=mock_creds.return_value,
+                                   static_discovery=True, cache_discovery=False)
 
         mock_sheets_service.spreadsheets().values().update.assert_called_once()
 
-    @patch('utils.load.service_account.Credentials.from_service_account_file')
+    @patch('utils.load_gsheets.service_account.Credentials.from_service_account_file')
     def test_save_to_gsheets_fails_missing_credentials(self, mock_creds):
         """
         Ensure save_to_gsheets raises FileNotFoundError when credentials file is absent
@@ -87,7 +111,7 @@ class TestLoadFunctions(unittest.TestCase):
             with self.assertRaises(FileNotFoundError):
                 save_to_gsheets(self.sample_df, "nonexistent_creds.json")
 
-    @patch('utils.load.create_engine')
+    @patch('utils.load_postgres.create_engine')
     def test_save_to_postgres_successful_save(self, mock_create_engine):
         """
         Test that save_to_postgres properly writes data to PostgreSQL database
@@ -101,7 +125,7 @@ class TestLoadFunctions(unittest.TestCase):
         self.assertTrue(result)
         mock_to_sql.assert_called_once_with("fashion_products", mock_engine, if_exists='replace', index=False)
 
-    @patch('utils.load.create_engine')
+    @patch('utils.load_postgres.create_engine')
     def test_save_to_postgres_raises_on_connection_error(self, mock_create_engine):
         """
         Verify save_to_postgres raises SQLAlchemyError on engine creation failure
@@ -119,7 +143,7 @@ class TestLoadFunctions(unittest.TestCase):
         with self.assertRaises(ValueError):
             save_to_postgres(empty_df)
 
-    @patch('utils.load.create_engine')
+    @patch('utils.load_postgres.create_engine')
     def test_save_to_postgres_with_custom_db_config(self, mock_create_engine):
         """
         Test save_to_postgres with custom database connection settings provided
@@ -141,7 +165,352 @@ class TestLoadFunctions(unittest.TestCase):
         self.assertTrue(result)
 
         expected_connection_url = f"postgresql://{custom_db_settings['user']}:{custom_db_settings['password']}@{custom_db_settings['host']}:{custom_db_settings['port']}/{custom_db_settings['database']}"
-        mock_create_engine.assert_called_once_with(expected_connection_url)
+        mock_create_engine.assert_called_once()
+        self.assertEqual(mock_create_engine.call_args.args[0], expected_connection_url)
+
+class TransformEngineTests(unittest.TestCase):
+    """
+    Check that the vectorized transform engine matches the row-wise reference exactly
+    """
+
+    VECTORIZED = {
+        'Price': (clean_price_vectorized, clean_price),
+        'Rating': (clean_rating_vectorized, clean_rating),
+        'Colors': (clean_colors_vectorized, clean_colors),
+        'Size': (clean_size_vectorized, clean_size),
+        'Gender': (clean_gender_vectorized, clean_gender)
+    }
+
+    def assert_cleaner_matches(self, column, series):
+        vectorized, rowwise = self.VECTORIZED[column]
+        pd.testing.assert_series_equal(vectorized(series), series.apply(rowwise))
+
+    def test_vectorized_cleaners_match_rowwise_on_scraped_strings(self):
+        """
+        Compare every vectorized cleaner with Series.apply of its row-wise counterpart
+        """
+        for column, values in RAW_VALUES.items():
+            with self.subTest(column=column):
+                self.assert_cleaner_matches(column, pd.Series(values, dtype=object))
+                self.assert_cleaner_matches(column, pd.Series(values, dtype=object).iloc[:0])
+
+    def test_vectorized_cleaners_match_rowwise_on_typed_columns(self):
+        """
+        Compare cleaners on numeric, string-dtype and mixed object columns
+        """
+        columns = [
+            pd.Series([45.99, 10.0, np.nan]),
+            pd.Series([3, 1, 7]),
+            pd.Series([True, False]),
+            pd.Series(['Size: M', None], dtype='string'),
+            pd.Series(['3 Colors', np.int64(4), 2.5, None], dtype=object)
+        ]
+        for column in self.VECTORIZED:
+            for series in columns:
+                with self.subTest(column=column, dtype=str(series.dtype), values=series.tolist()):
+                    self.assert_cleaner_matches(column, series)
+
+    def test_transform_data_engines_give_identical_frames(self):
+        """
+        Ensure transform_data returns the same frame with either engine
+        """
+        rows = len(RAW_VALUES['Price'])
+        raw_df = pd.DataFrame(RAW_VALUES)
+        raw_df['Title'] = [f'Product {i % 4}' if i != 3 else 'Unknown Product' for i in range(rows)]
+        raw_df['timestamp'] = '2025-05-01 10:00:00'
+        raw_df = pd.concat([raw_df, raw_df], ignore_index=True)
+
+        vectorized = transform_data(raw_df)
+        rowwise = transform_data(raw_df, engine='rowwise')
+
+        self.assertGreater(len(rowwise), 0)
+        pd.testing.assert_frame_equal(vectorized, rowwise)
+
+    def test_transform_data_rejects_unknown_engine(self):
+        """
+        Ensure an unknown engine name raises ValueError
+        """
+        with self.assertRaises(ValueError):
+            transform_data(pd.DataFrame({'Title': ['x']}), engine='numba')
+
+class CleanerCacheTests(unittest.TestCase):
+    """
+    Tests for the memo caches in front of the row-wise cleaners
+    """
+
+    def setUp(self):
+        clear_cleaner_caches()
+        self.addCleanup(clear_cleaner_caches)
+
+    def test_repeated_strings_hit_the_cache(self):
+        """
+        Verify repeated raw strings are served from the cache and counted in the stats
+        """
+        sizes = pd.Series(['Size: M', 'Size: L', 'Size: M', None, 'Size: M'] * 20, dtype=object)
+
+        cleaned = sizes.apply(clean_size)
+
+        stats = cleaner_cache_stats()['clean_size']
+        self.assertEqual((stats['misses'], stats['hits'], stats['size']), (2, 78, 2))
+        self.assertAlmostEqual(stats['hit_rate'], 78 / 80)
+        self.assertEqual(cleaned.iloc[:4].tolist(), ['M', 'L', 'M', 'M'])
+        self.assertEqual(set(cleaner_cache_stats()), {'clean_price', 'clean_rating', 'clean_colors', 'clean_size',
+                                                      'clean_gender'})
+
+    def test_cached_results_match_uncached_cleaners(self):
+        """
+        Ensure the memoized cleaners return exactly what the undecorated functions return
+        """
+        for column, cleaner in (('Price', clean_price), ('Rating', clean_rating), ('Colors', clean_colors),
+                                ('Size', clean_size), ('Gender', clean_gender)):
+            for value in RAW_VALUES[column] * 2:
+                with self.subTest(column=column, value=value):
+                    self.assertEqual(repr(cleaner(value)), repr(cleaner.__wrapped__(value)))
+
+    def test_cache_is_bounded(self):
+        """
+        Ensure high-cardinality columns cannot grow the cache past its limit
+        """
+        for cents in range(CLEANER_CACHE_SIZE + 100):
+            clean_price(f"${cents / 100:.2f}")
+
+        self.assertEqual(cleaner_cache_stats()['clean_price']['size'], CLEANER_CACHE_SIZE)
+
+class CompactDtypesTests(unittest.TestCase):
+    """
+    Tests for the compact (category/datetime/downcast) schema
+    """
+
+    def setUp(self):
+        self.raw = pd.DataFrame({
+            'Title': [f'Product {i}' for i in range(200)],
+            'Price': ['$10.00', '$20.50', '$30.00', '$45.99'] * 50,
+            'Rating': ['Rating: ⭐ 4.8 / 5', 'Rating: ⭐ 3.3 / 5', 'Rating: ⭐ 4.0 / 5', 'Rating: ⭐ 2.5 / 5'] * 50,
+            'Colors': ['3 Colors', '5 Colors', '1 Colors', '8 Colors'] * 50,
+            'Size': ['Size: M', 'Size: L', 'Size: M', 'Size: XL'] * 50,
+            'Gender': ['Gender: Men', 'Gender: Women', 'Gender: Unisex', 'Gender: Men'] * 50,
+            'timestamp': ['2025-05-01 10:00:00'] * 200
+        })
+
+    def test_compact_schema_dtypes_and_values(self):
+        """
+        Verify column dtypes shrink without changing any value
+        """
+        full = transform_data(self.raw)
+        compact = transform_data(self.raw, compact=True)
+
+        self.assertIsInstance(compact['Size'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(compact['Gender'].dtype, pd.CategoricalDtype)
+        self.assertEqual(compact['timestamp'].dtype, 'datetime64[ns]')
+        self.assertEqual(compact['Colors'].dtype, np.int8)
+        # Prices in IDR are whole numbers and fit float32 exactly; ratings such as 4.8 do not
+        self.assertEqual(compact['Price'].dtype, np.float32)
+        self.assertEqual(compact['Rating'].dtype, np.float64)
+
+        restored = compact.astype({'Price': 'float64', 'Colors': 'int64', 'Size': 'string', 'Gender': 'string'})
+        restored['timestamp'] = restored['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S').astype('string')
+        pd.testing.assert_frame_equal(restored, full)
+        self.assertLess(frame_memory(compact), frame_memory(full) / 2)
+
+    def test_unparseable_timestamps_stay_text(self):
+        """
+        Ensure timestamps outside the scraper format are not silently turned into NaT
+        """
+        full = transform_data(self.raw).assign(timestamp='yesterday')
+
+        compact = compact_dtypes(full)
+
+        self.assertEqual(compact['timestamp'].tolist(), full['timestamp'].tolist())
+
+    def test_chunks_can_be_compacted(self):
+        """
+        Verify the streaming transform yields compact chunks that still deduplicate across chunks
+        """
+        chunks = [self.raw.iloc[:100], self.raw.iloc[100:]]
+
+        chunks.append(self.raw.iloc[:10])
+        streamed = list(transform_chunks(chunks, compact=True))
+
+        self.assertEqual([len(chunk) for chunk in streamed], [100, 100])
+        self.assertIsInstance(streamed[0]['Size'].dtype, pd.CategoricalDtype)
+
+class TransformChunksTests(unittest.TestCase):
+    """
+    Tests for the streaming (chunked) transform.
+    """
+
+    def test_chunks_concatenate_to_full_transform(self):
+        """
+        Ensure chunked output equals transform_data on the whole frame, including cross-chunk duplicates.
+        """
+        raw = pd.DataFrame({
+            'Title': ['A', 'B', 'Unknown Product', 'A', 'C', 'B'],
+            'Price': ['$10.00', '$20.00', 'Price Unavailable', '$10.00', '$30.00', '$20.00'],
+            'Rating': ['Rating: ⭐ 4.0 / 5'] * 6,
+            'Colors': ['3 Colors'] * 6,
+            'Size': ['Size: M'] * 6,
+            'Gender': ['Gender: Men'] * 6,
+            'timestamp': ['2025-05-01 10:00:00'] * 6
+        })
+        chunks = [raw.iloc[i:i + 2].reset_index(drop=True) for i in range(0, len(raw), 2)]
+
+        streamed = pd.concat(list(transform_chunks(iter(chunks))), ignore_index=True)
+
+        pd.testing.assert_frame_equal(streamed, transform_data(raw).reset_index(drop=True))
+
+    def test_cross_chunk_dedup_memory_stays_flat(self):
+        """
+        Ensure the row hashes kept for cross-chunk duplicates are capped, so memory does not grow with the crawl.
+        """
+        def chunks(count, rows=100):
+            for number in range(count):
+                yield pd.DataFrame({
+                    'Title': [f'T-shirt {number * rows + i}' for i in range(rows)],
+                    'Price': ['$10.00'] * rows, 'Rating': ['Rating: ⭐ 4.0 / 5'] * rows, 'Colors': ['3 Colors'] * rows,
+                    'Size': ['Size: M'] * rows, 'Gender': ['Gender: Men'] * rows,
+                    'timestamp': ['2025-05-01 10:00:00'] * rows
+                })
+
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        memory = []
+        for number, chunk in enumerate(transform_chunks(chunks(60), max_seen_rows=1000)):
+            self.assertEqual(len(chunk), 100)
+            if number in (20, 59):
+                del chunk
+                gc.collect()
+                memory.append(tracemalloc.get_traced_memory()[0])
+
+        # 3,900 more unique rows would hold a few hundred KB in an unbounded set of hashes
+        self.assertLess(memory[1] - memory[0], 32 * 1024)
+
+    def test_repeats_within_the_window_are_still_dropped(self):
+        """
+        Ensure rows repeated a few chunks later are dropped while they are still in the window.
+        """
+        raw = pd.DataFrame({
+            'Title': [f'T-shirt {i}' for i in range(6)], 'Price': ['$10.00'] * 6, 'Rating': ['Rating: ⭐ 4.0 / 5'] * 6,
+            'Colors': ['3 Colors'] * 6, 'Size': ['Size: M'] * 6, 'Gender': ['Gender: Men'] * 6,
+            'timestamp': ['2025-05-01 10:00:00'] * 6
+        })
+        chunks = [raw.iloc[:3], raw.iloc[3:], raw.iloc[1:4]]
+
+        streamed = list(transform_chunks(chunks, max_seen_rows=6))
+        self.assertEqual([len(chunk) for chunk in streamed], [3, 3])
+
+        # With a window of 4 hashes only the second chunk is remembered when the repeats arrive
+        streamed = list(transform_chunks(chunks, max_seen_rows=4))
+        self.assertEqual([len(chunk) for chunk in streamed], [3, 3, 2])
+
+    def test_chunks_without_valid_rows_are_skipped(self):
+        """
+        Ensure empty chunks yield nothing instead of sample data.
+        """
+        invalid = pd.DataFrame({
+            'Title': ['Unknown Product'], 'Price': ['Price Unavailable'], 'Rating': ['Invalid Rating'],
+            'Colors': ['1 Colors'], 'Size': ['Size: M'], 'Gender': ['Gender: Men'], 'timestamp': ['2025-05-01 10:00:00']
+        })
+
+        self.assertEqual(list(transform_chunks([invalid, invalid.iloc[:0]])), [])
+
+class DedupIndexTests(unittest.TestCase):
+    """
+    Tests for the persistent cross-run dedup index.
+    """
+
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.path = os.path.join(workdir.name, 'index', 'dedup.npz')
+
+    def crawl(self, prices, timestamp='2025-05-01 10:00:00'):
+        return pd.DataFrame({
+            'Title': [f'T-shirt {i}' for i in range(len(prices))],
+            'Price': prices,
+            'Rating': ['Rating: ⭐ 4.0 / 5'] * len(prices),
+            'Colors': ['3 Colors'] * len(prices),
+            'Size': ['Size: M'] * len(prices),
+            'Gender': ['Gender: Men'] * len(prices),
+            'timestamp': [timestamp] * len(prices)
+        })
+
+    def test_placeholder_titles_are_not_indexed(self):
+        """
+        Ensure cards without a title, which all share one key, never count as new or changed products.
+        """
+        crawl = self.crawl(['$10.00', '$20.00', '$30.00', '$40.00'])
+        crawl.loc[[1, 3], 'Title'] = 'Unknown Product'
+
+        first = DedupIndex(self.path)
+        self.assertEqual(first.filter(crawl)['Title'].tolist(), ['T-shirt 0', 'T-shirt 2'])
+        first.save()
+
+        for run in range(2):
+            index = DedupIndex(self.path)
+            self.assertTrue(index.filter(crawl).empty)
+            stats = index.stats()
+            self.assertEqual((stats['checked'], stats['invalid'], stats['new'], stats['changed'], stats['unchanged']),
+                             (4, 2, 0, 0, 2))
+            self.assertEqual(stats['entries'], 2)
+            index.save()
+
+    def test_next_run_keeps_only_new_or_changed_products(self):
+        """
+        Ensure a saved index filters unchanged products regardless of timestamp.
+        """
+        first = DedupIndex(self.path)
+        self.assertEqual(len(first.filter(self.crawl(['$10.00', '$20.00', '$30.00']))), 3)
+        first.save()
+
+        second = DedupIndex(self.path)
+        crawl = self.crawl(['$10.00', '$25.00', '$30.00', '$40.00'], timestamp='2025-05-02 10:00:00')
+        filtered = second.filter(crawl)
+
+        self.assertEqual(filtered['Title'].tolist(), ['T-shirt 1', 'T-shirt 3'])
+        stats = second.stats()
+        self.assertEqual((stats['new'], stats['changed'], stats['unchanged']), (1, 1, 2))
+        self.assertEqual(stats['entries'], 3)
+
+        second.save()
+        self.assertEqual(len(DedupIndex(self.path)), 4)
+        self.assertTrue(DedupIndex(self.path).filter(crawl).empty)
+
+    def test_unsaved_products_are_not_remembered(self):
+        """
+        Ensure the index on disk only changes on save, so a failed load is retried next run.
+        """
+        DedupIndex(self.path).filter(self.crawl(['$10.00']))
+
+        self.assertEqual(len(DedupIndex(self.path).filter(self.crawl(['$10.00']))), 1)
+
+    def test_duplicates_within_a_run_pass_once(self):
+        """
+        Ensure repeated rows across chunks of the same run are dropped.
+        """
+        index = DedupIndex(self.path)
+        crawl = self.crawl(['$10.00', '$20.00'])
+
+        chunks = list(index.filter_chunks([crawl, crawl.iloc[::-1], pd.concat([crawl, crawl])]))
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(index.stats()['duplicates'], 6)
+
+    def test_hash_width_sets_memory_footprint(self):
+        """
+        Ensure 32-bit hashes halve the index size and an index of another width is discarded.
+        """
+        crawl = self.crawl([f'${i}.00' for i in range(100)])
+        for bits in (64, 32):
+            index = DedupIndex(self.path, hash_bits=bits)
+            index.filter(crawl)
+            index.save()
+            self.assertEqual(len(index), 100)
+            self.assertEqual(index.nbytes, 100 * 2 * bits // 8)
+
+        with self.assertLogs('utils.transform', level='WARNING'):
+            self.assertEqual(len(DedupIndex(self.path, hash_bits=64)), 0)
+        with self.assertRaises(ValueError):
+            DedupIndex(self.path, hash_bits=16)
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,214 +2,1061 @@
 """
 Module untuk melakukan ekstraksi data dari website fashion studio.
 """
+import asyncio
+import hashlib
+import itertools
+import json
 import logging
+import multiprocessing
+import os
+import random
+import threading
 import time
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.parser import get_parser
+from utils.metrics import increment, timed
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlsplit
 
 # Konfigurasi logging
 logger = logging.getLogger(__name__)
 
+def _import_aiohttp():
+    # aiohttp hanya dibutuhkan untuk ekstraksi async, jadi baru diimpor saat dipakai
+    try:
+        import aiohttp
+    except ImportError:
+        return None
+    return aiohttp
+
+def __getattr__(name):
+    # utils.extract.aiohttp tetap tersedia (None jika tidak terpasang) tanpa diimpor saat modul dimuat
+    if name == 'aiohttp':
+        return _import_aiohttp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # URL Target
 BASE_URL = "https://fashion-studio.dicoding.dev"
 MAX_RETRIES = 3
 RETRY_DELAY = 2
+REQUEST_TIMEOUT = 30
+
+# Header user-agent untuk setiap request
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Kolom standar data produk hasil ekstraksi
+PRODUCT_COLUMNS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']
+
+# Pengaturan ekstraksi konkuren
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 10.0
+
+# Jumlah baris per chunk pada mode streaming
+CHUNK_SIZE = 10000
+
+# Pengaturan HTTP session bersama
+POOL_SIZE = MAX_WORKERS
+# Retry dilakukan fetch_page (satu lapisan, kebijakan sama dengan mode async); transport tidak mengulang sendiri
+TRANSPORT_RETRIES = 0
+TRANSPORT_BACKOFF = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Status 4xx yang masih layak dicoba ulang; status 4xx lain berarti halaman tidak tersedia
+RETRYABLE_CLIENT_STATUS = (408, 429)
+
+_default_session = None
+_default_pool_size = 0
+_session_lock = threading.Lock()
 
-def scrape_page(page_number):
+# Pengaturan cache respons HTTP
+CACHE_DIR = os.getenv('ETL_CACHE_DIR', os.path.join('.cache', 'pages'))
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Mode debug tersampel: hanya satu dari setiap N produk yang dicatat (0 = tidak ada log per produk)
+LOG_SAMPLE_EVERY = int(os.getenv('ETL_LOG_SAMPLE_EVERY', '100'))
+_log_sample_counter = itertools.count()
+
+def create_session(pool_size=POOL_SIZE, keep_alive=True, retries=TRANSPORT_RETRIES, backoff_factor=TRANSPORT_BACKOFF):
     """
-    Melakukan scraping pada satu halaman website.
+    Membuat HTTP session dengan connection pool dan kebijakan retry di level transport.
     
     Args:
-        page_number (int): Nomor halaman yang akan di-scrape
-        
+        pool_size (int): Jumlah maksimal koneksi yang disimpan per host
+        keep_alive (bool): Pakai ulang koneksi antar request (False = tutup setiap request)
+        retries (int): Jumlah retry transport untuk error koneksi dan status 429/5xx
+            (default 0: fetch_page sudah mengulang request yang gagal)
+        backoff_factor (float): Faktor backoff retry transport (detik)
+    
     Returns:
-        list: Daftar produk yang berhasil di-scrape dari halaman tersebut
+        requests.Session: Session yang siap dipakai bersama lintas thread
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
     
-    Raises:
-        Exception: Jika terjadi kesalahan saat melakukan request atau parsing
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_session(pool_size=POOL_SIZE):
+    """
+    Mengembalikan session bersama untuk seluruh proses ekstraksi (dibuat saat pertama dipakai).
+    
+    Jika pool session bersama lebih kecil dari pool_size, session baru dengan
+    pool yang lebih besar dibuat; pool tidak pernah diperkecil.
+    
+    Args:
+        pool_size (int): Jumlah koneksi per host minimal, biasanya sama dengan jumlah worker
+    
+    Returns:
+        requests.Session: Session bersama
+    """
+    global _default_session, _default_pool_size
+    with _session_lock:
+        if _default_session is None or _default_pool_size < pool_size:
+            # Session lama tidak ditutup karena mungkin masih dipakai thread lain
+            _default_pool_size = max(pool_size, POOL_SIZE)
+            _default_session = create_session(pool_size=_default_pool_size)
+        return _default_session
+
+def close_session():
+    """
+    Menutup session bersama beserta seluruh koneksi di pool-nya.
+    """
+    global _default_session, _default_pool_size
+    with _session_lock:
+        if _default_session is not None:
+            _default_session.close()
+            _default_session = None
+            _default_pool_size = 0
+
+def page_url(page_number, base_url=BASE_URL):
+    """
+    Membentuk URL untuk nomor halaman tertentu.
+    
+    Args:
+        page_number (int): Nomor halaman
+        base_url (str): URL dasar website
+    
+    Returns:
+        str: URL halaman
     """
-    # URL yang diubah
     if page_number == 1:
-        url = BASE_URL
-    else:
-        url = f"{BASE_URL}/page{page_number}"
+        return base_url
+    return f"{base_url}/page{page_number}"
+
+class HostRateLimiter:
+    """
+    Pembatas laju request per host yang aman dipakai lintas thread.
+    
+    Setiap host mendapat slot waktu berjarak 1/requests_per_second detik,
+    sehingga beberapa worker dapat berjalan bersamaan tanpa melampaui
+    batas laju ke host yang sama.
+    """
+    
+    def __init__(self, requests_per_second=REQUESTS_PER_SECOND):
+        if requests_per_second and requests_per_second > 0:
+            self.interval = 1.0 / requests_per_second
+        else:
+            self.interval = 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+    
+    def _reserve(self, url):
+        """
+        Memesan slot berikutnya untuk host dari URL dan mengembalikan lama tunggu (detik).
+        """
+        if self.interval <= 0:
+            return 0.0
+        
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        
+        return slot - now
+    
+    def wait(self, url):
+        """
+        Menunggu hingga slot request berikutnya untuk host dari URL tersedia.
+        
+        Args:
+            url (str): URL yang akan di-request
+        """
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self, url):
+        """
+        Versi async dari wait() yang tidak memblokir event loop.
+        
+        Args:
+            url (str): URL yang akan di-request
+        """
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+@timed('extract.parse')
+def extract_products(html, parser=None, timestamp=None):
+    """
+    Mengekstrak data produk dari HTML mentah satu halaman.
+    
+    Fungsi ini murni (tanpa I/O jaringan) dan dapat di-pickle, sehingga bisa
+    dijalankan di ProcessPoolExecutor untuk parsing paralel di semua core.
+    
+    Args:
+        html (str | bytes): Isi HTML halaman
+        parser (str): Nama backend parser ('bs4' atau 'lxml'); None = parser default
+        timestamp (str): Timestamp scraping; None = waktu saat ini
+    
+    Returns:
+        list: Daftar produk yang ditemukan di halaman tersebut
+    """
+    products = get_parser(parser).parse_cards(html)
+    
+    # Timestamp sebagai penanda waktu scraping
+    current_timestamp = timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    for product in products:
+        # Tambahkan timestamp
+        product['timestamp'] = current_timestamp
+    
+    # Log per produk hanya di level DEBUG dan hanya untuk sampel produk
+    if LOG_SAMPLE_EVERY and logger.isEnabledFor(logging.DEBUG):
+        for product in products:
+            if next(_log_sample_counter) % LOG_SAMPLE_EVERY == 0:
+                logger.debug("Produk diekstrak (sampel 1/%d): %s", LOG_SAMPLE_EVERY, product)
+    
+    return products
+
+def _write_file_atomic(path, data):
+    """
+    Menulis file lewat file sementara agar pembaca tidak pernah melihat isi setengah jadi.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class ResponseCache:
+    """
+    Cache respons halaman di disk dengan validator ETag/Last-Modified dan hash isi.
+    
+    Setiap entri menyimpan body halaman, validator HTTP, hash SHA-256 body,
+    dan produk hasil parsing. Saat halaman diminta lagi, validator dikirim
+    sebagai If-None-Match/If-Modified-Since; jika server menjawab 304 atau
+    body yang diterima sama dengan sebelumnya, produk diambil dari cache
+    tanpa parsing HTML. Ukuran total dibatasi max_bytes dengan eviksi LRU.
+    
+    Lock hanya melindungi index dan statistik di memori; baca/tulis file
+    dilakukan di luar lock agar hit dari banyak worker tidak antre di disk.
+    Nama file entri memuat hash body sehingga file tidak pernah ditimpa:
+    pembaca yang berpapasan dengan store() untuk URL yang sama paling buruk
+    mendapat miss, bukan produk dari body lain.
+    """
+    
+    INDEX_FILE = 'index.json'
+    
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+        self.reset_stats()
+    
+    def _load_index(self):
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return {}
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Index cache tidak dapat dibaca, cache dikosongkan: {str(e)}")
+            return {}
     
-    products = []
+    def _path(self, entry, suffix):
+        return os.path.join(self.cache_dir, entry['key'] + suffix)
+    
+    def reset_stats(self):
+        """
+        Mengosongkan statistik cache untuk run baru.
+        """
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'not_modified': 0,
+            'parse_skipped': 0,
+            'bytes_saved': 0,
+            'evictions': 0
+        }
+    
+    def stats(self):
+        """
+        Mengembalikan statistik cache sejak reset terakhir.
+        
+        Returns:
+            dict: Jumlah hit/miss, respons 304, parsing yang dilewati, byte yang dihemat, dan hit rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._index)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['size_bytes'] = self.size_bytes()
+        return stats
+    
+    def size_bytes(self):
+        """
+        Mengembalikan total ukuran entri cache (byte).
+        """
+        with self._lock:
+            return self._size_bytes()
+    
+    def _size_bytes(self):
+        return sum(entry['size'] for entry in self._index.values())
+    
+    def conditional_headers(self, url):
+        """
+        Membentuk header request kondisional untuk URL yang sudah ada di cache.
+        
+        Args:
+            url (str): URL halaman
+        
+        Returns:
+            dict: Header If-None-Match/If-Modified-Since (kosong jika belum ada di cache)
+        """
+        with self._lock:
+            entry = self._index.get(url)
+        
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def lookup(self, url, status_code, content=None):
+        """
+        Mengambil produk dari cache jika halaman tidak berubah.
+        
+        Args:
+            url (str): URL halaman
+            status_code (int): Status respons server (304 = tidak berubah)
+            content (bytes): Body respons, dipakai untuk membandingkan hash jika status bukan 304
+        
+        Returns:
+            list: Produk hasil parsing sebelumnya, atau None jika harus di-parse ulang
+        """
+        with self._lock:
+            entry = self._index.get(url)
+        
+        products = None
+        unchanged = entry is not None and (
+            status_code == 304 or hashlib.sha256(content or b'').hexdigest() == entry['body_hash']
+        )
+        if unchanged:
+            try:
+                with open(self._path(entry, '.json'), 'r', encoding='utf-8') as f:
+                    products = json.load(f)
+            except (OSError, ValueError):
+                products = None
+        
+        with self._lock:
+            # Entri yang diganti atau dihapus selama file dibaca dianggap miss
+            if products is None or self._index.get(url) is not entry:
+                self._stats['misses'] += 1
+                return None
+            
+            entry['last_access'] = time.time()
+            self._stats['hits'] += 1
+            self._stats['parse_skipped'] += 1
+            if status_code == 304:
+                self._stats['not_modified'] += 1
+                self._stats['bytes_saved'] += entry['body_size']
+            return products
+    
+    def store(self, url, content, products, etag=None, last_modified=None):
+        """
+        Menyimpan body, validator, dan produk hasil parsing sebuah halaman.
+        
+        Args:
+            url (str): URL halaman
+            content (bytes): Body respons
+            products (list): Produk hasil parsing halaman
+            etag (str): Header ETag dari server
+            last_modified (str): Header Last-Modified dari server
+        """
+        body_hash = hashlib.sha256(content).hexdigest()
+        key = f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}-{body_hash[:16]}"
+        products_json = json.dumps(products, ensure_ascii=False).encode('utf-8')
+        
+        for suffix, data in (('.html', content), ('.json', products_json)):
+            _write_file_atomic(os.path.join(self.cache_dir, key + suffix), data)
+        
+        entry = {
+            'key': key,
+            'etag': etag,
+            'last_modified': last_modified,
+            'body_hash': body_hash,
+            'body_size': len(content),
+            'size': len(content) + len(products_json),
+            'last_access': time.time()
+        }
+        with self._lock:
+            previous = self._index.get(url)
+            self._index[url] = entry
+            removed = self._evict()
+        
+        # File entri lama (body lain) dan entri yang tergusur dihapus di luar lock
+        if previous is not None and previous['key'] != key:
+            removed.append(previous)
+        for old_entry in removed:
+            self._remove_files(old_entry)
+    
+    def invalidate(self, url):
+        """
+        Menghapus entri cache untuk sebuah URL.
+        """
+        with self._lock:
+            entry = self._index.pop(url, None)
+        if entry is not None:
+            self._remove_files(entry)
+    
+    def _remove_files(self, entry):
+        for suffix in ('.html', '.json'):
+            try:
+                os.remove(self._path(entry, suffix))
+            except OSError:
+                pass
+    
+    def _evict(self):
+        # Dipanggil dengan self._lock: entri yang paling lama tidak dipakai dikeluarkan dari index
+        # hingga ukuran di bawah batas; pemanggil menghapus filenya setelah lock dilepas
+        removed = []
+        total = self._size_bytes()
+        if total <= self.max_bytes:
+            return removed
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            del self._index[url]
+            removed.append(entry)
+            total -= entry['size']
+            self._stats['evictions'] += 1
+        return removed
+    
+    def save(self):
+        """
+        Menulis index cache ke disk secara atomik.
+        """
+        with self._lock:
+            data = json.dumps(self._index).encode('utf-8')
+        _write_file_atomic(os.path.join(self.cache_dir, self.INDEX_FILE), data)
+    
+    def log_stats(self):
+        """
+        Mencatat ringkasan statistik cache ke log dan mengembalikannya.
+        """
+        stats = self.stats()
+        logger.info(
+            f"Statistik cache: {stats['hits']} hit, {stats['misses']} miss "
+            f"(hit rate {stats['hit_rate']:.1%}), {stats['not_modified']} respons 304, "
+            f"{stats['bytes_saved']} byte dihemat, {stats['evictions']} entri dihapus"
+        )
+        return stats
+
+# Hasil pengambilan satu halaman; products terisi jika halaman tidak berubah sejak cache
+FetchedPage = namedtuple('FetchedPage', ['url', 'content', 'text', 'etag', 'last_modified', 'products'])
+
+@timed('extract.fetch_page')
+def fetch_page(page_number, session=None, cache=None, base_url=BASE_URL):
+    """
+    Mengambil HTML mentah satu halaman website (tanpa parsing).
+    
+    Args:
+        page_number (int): Nomor halaman yang akan diambil
+        session (requests.Session): Session yang dipakai (default: session bersama)
+        cache (ResponseCache): Cache respons untuk request kondisional (opsional)
+        base_url (str): URL dasar website
+    
+    Returns:
+        FetchedPage: Body halaman beserta validatornya, atau produk dari cache jika halaman tidak berubah
+    
+    Raises:
+        Exception: Jika halaman tetap gagal diambil setelah semua percobaan, atau langsung
+            untuk status 4xx yang tidak dicoba ulang (selain 408/429)
+    """
+    url = page_url(page_number, base_url)
+    if session is None:
+        session = get_session()
     
     # Implementasi retry untuk mengatasi kendala jaringan
     for attempt in range(MAX_RETRIES):
+        response = None
         try:
-            logger.info(f"Mengambil data dari halaman {page_number}...")
-            
-            # Tambahkan header user-agent
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Selector untuk produk-produk di halaman
-            product_cards = soup.select('.collection-card')
+            logger.debug("Mengambil data dari halaman %d...", page_number)
             
-            # Debug info
-            logger.info(f"Jumlah produk ditemukan: {len(product_cards)}")
+            headers = cache.conditional_headers(url) if cache is not None else None
+            response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
             
-            # Timestamp sebagai penanda waktu scraping
-            current_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if cache is not None and response.status_code == 304:
+                cached_products = cache.lookup(url, 304)
+                if cached_products is None:
+                    # Entri cache rusak: hapus agar percobaan berikutnya meminta halaman lengkap
+                    cache.invalidate(url)
+                    raise requests.exceptions.RequestException(f"Respons 304 untuk {url} tetapi cache tidak tersedia")
+                increment('pages_not_modified')
+                return FetchedPage(url, None, None, None, None, _restamp(cached_products))
             
-            for card in product_cards:
-                try:
-                    # Inisialisasi dictionary untuk menyimpan data produk
-                    product = {}
-                    
-                    # Ekstrak judul produk
-                    product_details = card.select_one('.product-details')
-                    title_element = card.select_one('.product-title') or (product_details.select_one('h3') if product_details else None)
-                    
-                    if title_element:
-                        product['Title'] = title_element.text.strip()
-                    else:
-                        # Jika tidak menemukan dengan selector di atas, coba selector lain
-                        title_element = card.select_one('h3')
-                        if title_element:
-                            product['Title'] = title_element.text.strip()
-                        else:
-                            product['Title'] = "Unknown Product"
-                    
-                    # Ekstrak harga produk
-                    price_container = card.select_one('.price-container')
-                    price_element = price_container.select_one('.price') if price_container else None
-                    
-                    if not price_element:
-                        price_element = card.select_one('.price') or card.select_one('span.price')
-                    
-                    if price_element:
-                        price_text = price_element.text.strip()
-                        product['Price'] = price_text
-                    else:
-                        product['Price'] = "Price Unavailable"
-                    
-                    # Ekstrak rating, colors, size, dan gender dari paragraf
-                    # Berdasarkan screenshot, data ini ada di elemen <p> dengan style inline
-                    paragraphs = card.select('p')
-                    
-                    # Default values
-                    product['Rating'] = "Invalid Rating"
-                    product['Colors'] = "Colors Unavailable"
-                    product['Size'] = "Size Unavailable"
-                    product['Gender'] = "Gender Unavailable"
-                    
-                    for p in paragraphs:
-                        text = p.text.strip()
-                        
-                        # Ekstrak rating
-                        if "Rating:" in text or ("/" in text and "★" in text):
-                            product['Rating'] = text
-                        
-                        # Ekstrak colors
-                        elif "Colors" in text:
-                            product['Colors'] = text
-                        
-                        # Ekstrak size
-                        elif text.startswith("Size:") or "Size" in text:
-                            product['Size'] = text
-                        
-                        # Ekstrak gender
-                        elif text.startswith("Gender:") or "Gender" in text or "Men" in text or "Women" in text or "Unisex" in text:
-                            product['Gender'] = text
-                    
-                    # Tambahkan timestamp
-                    product['timestamp'] = current_timestamp
-                    
-                    # Debug: cetak produk yang diekstrak
-                    logger.info(f"Produk diekstrak: {product}")
-                    
-                    products.append(product)
-                    
-                except Exception as e:
-                    logger.warning(f"Gagal mengekstrak produk: {str(e)}")
-                    continue
-                
-            logger.info(f"Berhasil mengambil {len(products)} produk dari halaman {page_number}")
+            response.raise_for_status()
+            increment('bytes_fetched', len(response.content))
             
-            # Jika berhasil mendapatkan data, keluar dari loop retry
-            if products:
-                return products
+            cached_products = None
+            if cache is not None:
+                cached_products = cache.lookup(url, response.status_code, response.content)
+                if cached_products is not None:
+                    cached_products = _restamp(cached_products)
             
+            return FetchedPage(
+                url,
+                response.content,
+                response.text,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                cached_products
+            )
+        
         except requests.exceptions.RequestException as e:
+            status = getattr(response, 'status_code', None)
+            if not _is_retryable_status(status):
+                logger.error(f"Halaman {page_number} tidak tersedia (HTTP {status}), tidak dicoba ulang")
+                raise Exception(f"Gagal mengakses halaman {page_number}: {str(e)}")
             if attempt < MAX_RETRIES - 1:
-                logger.warning(f"Percobaan {attempt+1} gagal: {str(e)}. Mencoba kembali dalam {RETRY_DELAY} detik...")
-                time.sleep(RETRY_DELAY)
+                delay = _retry_after(response, attempt, RETRY_DELAY)
+                logger.warning(f"Percobaan {attempt+1} gagal: {str(e)}. Mencoba kembali dalam {delay:.2f} detik...")
+                time.sleep(delay)
             else:
                 logger.error(f"Gagal mengambil data setelah {MAX_RETRIES} percobaan: {str(e)}")
                 raise Exception(f"Gagal mengakses halaman {page_number}: {str(e)}")
-                
+
+def _restamp(products):
+    """
+    Memberi timestamp scraping yang baru pada produk yang diambil dari cache.
+    """
+    current_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for product in products:
+        product['timestamp'] = current_timestamp
+    return products
+
+def _store_parsed(cache, fetched, products):
+    """
+    Menyimpan hasil parsing halaman ke cache (jika cache dipakai).
+    """
+    if cache is not None:
+        cache.store(fetched.url, fetched.content, products, etag=fetched.etag, last_modified=fetched.last_modified)
+
+@timed('extract.scrape_page')
+def scrape_page(page_number, session=None, cache=None, base_url=BASE_URL, parser=None):
+    """
+    Melakukan scraping pada satu halaman website.
+    
+    Args:
+        page_number (int): Nomor halaman yang akan di-scrape
+        session (requests.Session): Session yang dipakai (default: session bersama)
+        cache (ResponseCache): Cache respons untuk request kondisional (opsional)
+        base_url (str): URL dasar website
+        parser (str): Nama backend parser HTML (None = parser default)
+    
+    Returns:
+        list: Daftar produk yang berhasil di-scrape dari halaman tersebut
+    
+    Raises:
+        Exception: Jika terjadi kesalahan saat melakukan request atau parsing
+    """
+    fetched = fetch_page(page_number, session, cache, base_url)
+    
+    if fetched.products is not None:
+        products = fetched.products
+    else:
+        products = extract_products(fetched.text, parser)
+        _store_parsed(cache, fetched, products)
+    
+    # Satu ringkasan per halaman; field extra dapat dibaca formatter log terstruktur
+    logger.info("Berhasil mengambil %d produk dari halaman %d", len(products), page_number,
+                extra={'page': page_number, 'products': len(products)})
     return products
 
-def extract_data(start_page=1, end_page=50):
+def _products_to_dataframe(all_products):
+    """
+    Mengubah daftar produk hasil scraping menjadi DataFrame.
+    
+    Args:
+        all_products (list): Daftar dictionary produk
+    
+    Returns:
+        DataFrame: Data produk, atau DataFrame kosong dengan kolom standar
+    """
+    if all_products:
+        df = pd.DataFrame(all_products)
+        logger.info("Total data yang berhasil diekstrak: %d", len(df))
+        
+        # Sampel data dan nilai unik per kolom mahal dihitung, jadi hanya di level DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sampel data yang diekstrak:\n%s", df.head().to_string())
+            for col in df.columns:
+                unique_values = df[col].unique()
+                if len(unique_values) < 10:  # Hanya cetak jika jumlah nilai unik sedikit
+                    logger.debug("Nilai unik untuk kolom %s: %s", col, unique_values)
+                else:
+                    logger.debug("Jumlah nilai unik untuk kolom %s: %d", col, len(unique_values))
+        
+        return df
+    else:
+        logger.warning("Tidak ada produk yang berhasil diekstrak")
+        # Buat DataFrame kosong dengan kolom yang diperlukan
+        return pd.DataFrame(columns=PRODUCT_COLUMNS)
+
+def _scrape_page_limited(page_number, rate_limiter, scrape_options):
+    """
+    Menjalankan scrape_page setelah menunggu slot dari pembatas laju.
+    """
+    rate_limiter.wait(page_url(page_number, scrape_options.get('base_url', BASE_URL)))
+    return scrape_page(page_number, **scrape_options)
+
+def _submit_window(pages, submit, window):
+    """
+    Mengirim halaman ke executor dengan jumlah future yang tertunda dibatasi.
+    
+    Hasil yang belum dikonsumsi hanya ada untuk paling banyak `window` halaman,
+    sehingga memori tidak bertambah dengan jumlah halaman.
+    
+    Args:
+        pages (iterable): Nomor-nomor halaman
+        submit (callable): Fungsi halaman -> Future
+        window (int): Jumlah maksimum future yang tertunda
+    
+    Yields:
+        tuple: (nomor halaman, Future) sesuai urutan halaman
+    """
+    pages = iter(pages)
+    pending = deque((page, submit(page)) for page in itertools.islice(pages, window))
+    while pending:
+        page, future = pending.popleft()
+        for next_page in itertools.islice(pages, 1):
+            pending.append((next_page, submit(next_page)))
+        yield page, future
+
+def _scrape_pages(pages, max_workers, rate_limiter, scrape_options):
+    """
+    Mengambil beberapa halaman dan menghasilkan hasilnya sesuai urutan halaman.
+    
+    Args:
+        pages (iterable): Nomor-nomor halaman yang akan di-scrape
+        max_workers (int): Jumlah halaman yang diambil bersamaan (1 = sekuensial)
+        rate_limiter (HostRateLimiter): Pembatas laju request per host
+        scrape_options (dict): Argumen tambahan untuk scrape_page
+    
+    Yields:
+        tuple: (nomor halaman, daftar produk atau None, exception atau None)
+    """
+    if max_workers and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            submit = lambda page: executor.submit(_scrape_page_limited, page, rate_limiter, scrape_options)
+            for page, future in _submit_window(pages, submit, max_workers * 2):
+                try:
+                    yield page, future.result(), None
+                except Exception as e:
+                    yield page, None, e
+    else:
+        for page in pages:
+            try:
+                yield page, _scrape_page_limited(page, rate_limiter, scrape_options), None
+            except Exception as e:
+                yield page, None, e
+
+def _fetch_and_submit(page_number, rate_limiter, fetch_options, parse_executor, parser):
+    """
+    Mengambil satu halaman lalu langsung mengirim HTML-nya ke process pool untuk di-parse.
+    """
+    rate_limiter.wait(page_url(page_number, fetch_options.get('base_url', BASE_URL)))
+    fetched = fetch_page(page_number, **fetch_options)
+    if fetched.products is not None:
+        return fetched, None
+    return fetched, parse_executor.submit(extract_products, fetched.text, parser)
+
+def _scrape_pages_multiprocess(pages, max_workers, rate_limiter, scrape_options, parse_workers):
+    """
+    Seperti _scrape_pages, tetapi halaman diambil di thread dan di-parse di process pool.
+    
+    Args:
+        pages (iterable): Nomor-nomor halaman yang akan di-scrape
+        max_workers (int): Jumlah halaman yang diambil bersamaan
+        rate_limiter (HostRateLimiter): Pembatas laju request per host
+        scrape_options (dict): Argumen tambahan untuk scrape_page
+        parse_workers (int): Jumlah proses untuk parsing HTML
+    
+    Yields:
+        tuple: (nomor halaman, daftar produk atau None, exception atau None)
+    """
+    parser = scrape_options.get('parser')
+    cache = scrape_options.get('cache')
+    fetch_options = {key: value for key, value in scrape_options.items() if key != 'parser'}
+    
+    # Proses baru di-spawn agar tidak mewarisi thread fetch yang sedang berjalan
+    parse_executor = ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn'))
+    with parse_executor, ThreadPoolExecutor(max_workers=max(1, max_workers or 1)) as fetch_executor:
+        submit = lambda page: fetch_executor.submit(_fetch_and_submit, page, rate_limiter, fetch_options,
+                                                    parse_executor, parser)
+        window = max(1, max_workers or 1) + parse_workers
+        for page, future in _submit_window(pages, submit, window * 2):
+            try:
+                fetched, parse_future = future.result()
+                if parse_future is None:
+                    products = fetched.products
+                else:
+                    products = parse_future.result()
+                    _store_parsed(cache, fetched, products)
+                yield page, products, None
+            except Exception as e:
+                yield page, None, e
+
+def _iter_page_products(start_page, end_page, max_workers, requests_per_second, session, cache, base_url,
+                        parser, parse_workers):
+    """
+    Mengambil rentang halaman dan menghasilkan daftar produk setiap halaman secara berurutan.
+    
+    Halaman yang gagal atau kosong dicatat di log dan dilewati. Cache disimpan
+    setelah halaman terakhir selesai.
+    
+    Yields:
+        list: Daftar dictionary produk dari satu halaman
+    """
+    if start_page < 1:
+        logger.warning("Halaman awal minimal adalah 1. Menggunakan halaman awal = 1")
+        start_page = 1
+    
+    if end_page < start_page:
+        logger.warning(f"Halaman akhir tidak boleh kurang dari halaman awal. Menggunakan halaman akhir = {start_page}")
+        end_page = start_page
+    
+    pages = range(start_page, end_page + 1)
+    rate_limiter = HostRateLimiter(requests_per_second)
+    
+    scrape_options = {}
+    if session is not None:
+        scrape_options['session'] = session
+    else:
+        # Setiap worker butuh koneksinya sendiri; pool yang lebih kecil membuang koneksi ("Connection pool is full")
+        get_session(pool_size=max(1, max_workers or 1))
+    if cache is not None:
+        scrape_options['cache'] = cache
+        cache.reset_stats()
+    if base_url != BASE_URL:
+        scrape_options['base_url'] = base_url
+    if parser is not None:
+        scrape_options['parser'] = parser
+    
+    if parse_workers and parse_workers > 0:
+        page_results = _scrape_pages_multiprocess(pages, max_workers, rate_limiter, scrape_options, parse_workers)
+    else:
+        page_results = _scrape_pages(pages, max_workers, rate_limiter, scrape_options)
+    
+    for page, page_products, error in page_results:
+        if error is not None:
+            logger.error(f"Gagal mengambil data dari halaman {page}: {str(error)}")
+            continue
+        
+        if page_products:
+            yield page_products
+        else:
+            logger.warning(f"Tidak ada produk yang diekstrak dari halaman {page}")
+    
+    if cache is not None:
+        cache.save()
+        cache.log_stats()
+
+@timed('extract')
+def extract_data(start_page=1, end_page=50, max_workers=1, requests_per_second=REQUESTS_PER_SECOND, session=None,
+                 cache=None, base_url=BASE_URL, parser=None, parse_workers=0):
     """
     Mengekstrak data dari rentang halaman website.
     
     Args:
         start_page (int): Halaman awal untuk ekstraksi
         end_page (int): Halaman akhir untuk ekstraksi
+        max_workers (int): Jumlah halaman yang diambil bersamaan (1 = sekuensial)
+        requests_per_second (float): Batas laju request per host
+        session (requests.Session): Session yang dipakai bersama (default: session bersama dengan pool
+            minimal max_workers koneksi)
+        cache (ResponseCache): Cache respons untuk request kondisional (opsional)
+        base_url (str): URL dasar website
+        parser (str): Nama backend parser HTML ('bs4' atau 'lxml'; None = parser default)
+        parse_workers (int): Jumlah proses untuk parsing HTML (0 = parsing di thread pengambil)
+    
+    Returns:
+        DataFrame: Data hasil ekstraksi dalam format pandas DataFrame
+    """
+    all_products = []
+    
+    try:
+        for page_products in _iter_page_products(start_page, end_page, max_workers, requests_per_second, session,
+                                                 cache, base_url, parser, parse_workers):
+            all_products.extend(page_products)
+        
+        # Konversi ke DataFrame
+        return _products_to_dataframe(all_products)
+    
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan pada proses ekstraksi: {str(e)}")
+        # Mengembalikan DataFrame kosong daripada gagal sepenuhnya
+        return pd.DataFrame(columns=PRODUCT_COLUMNS)
+
+def iter_extract_chunks(start_page=1, end_page=50, chunk_size=CHUNK_SIZE, max_workers=1,
+                        requests_per_second=REQUESTS_PER_SECOND, session=None, cache=None, base_url=BASE_URL,
+                        parser=None, parse_workers=0):
+    """
+    Mengekstrak data secara streaming dalam chunk DataFrame berukuran terbatas.
+    
+    Halaman diambil sesuai kebutuhan konsumen, sehingga memori dibatasi oleh
+    chunk_size (ditambah halaman yang sedang diambil), bukan oleh jumlah total produk.
+    
+    Args:
+        start_page (int): Halaman awal untuk ekstraksi
+        end_page (int): Halaman akhir untuk ekstraksi
+        chunk_size (int): Jumlah maksimum baris per chunk
+        max_workers (int): Jumlah halaman yang diambil bersamaan (1 = sekuensial)
+        requests_per_second (float): Batas laju request per host
+        session (requests.Session): Session yang dipakai bersama (default: session bersama dengan pool
+            minimal max_workers koneksi)
+        cache (ResponseCache): Cache respons untuk request kondisional (opsional)
+        base_url (str): URL dasar website
+        parser (str): Nama backend parser HTML ('bs4' atau 'lxml'; None = parser default)
+        parse_workers (int): Jumlah proses untuk parsing HTML (0 = parsing di thread pengambil)
+    
+    Yields:
+        DataFrame: Chunk data mentah dengan kolom PRODUCT_COLUMNS (maksimal chunk_size baris)
+    
+    Raises:
+        ValueError: Jika chunk_size kurang dari 1
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size minimal adalah 1")
+    
+    buffer = []
+    total = 0
+    for page_products in _iter_page_products(start_page, end_page, max_workers, requests_per_second, session,
+                                             cache, base_url, parser, parse_workers):
+        buffer.extend(page_products)
+        while len(buffer) >= chunk_size:
+            chunk, buffer = buffer[:chunk_size], buffer[chunk_size:]
+            total += len(chunk)
+            yield pd.DataFrame(chunk, columns=PRODUCT_COLUMNS)
+    
+    if buffer:
+        total += len(buffer)
+        yield pd.DataFrame(buffer, columns=PRODUCT_COLUMNS)
+    
+    if total:
+        logger.info(f"Total data yang berhasil diekstrak: {total}")
+    else:
+        logger.warning("Tidak ada produk yang berhasil diekstrak")
+
+def _is_retryable_status(status):
+    """
+    Mengecek apakah request dengan status HTTP ini layak dicoba ulang.
+    
+    Error tanpa status (koneksi, timeout), 5xx dan 408/429 dicoba ulang;
+    4xx lain tidak akan berubah dengan mengulang request.
+    """
+    return status is None or not 400 <= status < 500 or status in RETRYABLE_CLIENT_STATUS
+
+def _retry_after(response, attempt, backoff):
+    """
+    Menghitung lama tunggu sebelum percobaan ulang.
+    
+    Header Retry-After dari server diutamakan; jika tidak ada, digunakan
+    exponential backoff dengan jitter.
+    """
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+    return backoff * (2 ** attempt) + random.uniform(0, backoff)
+
+async def scrape_page_async(session, page_number, base_url=BASE_URL, rate_limiter=None,
+                            max_retries=MAX_RETRIES, backoff=RETRY_DELAY, parser=None, parse_executor=None):
+    """
+    Versi async dari scrape_page yang memakai session aiohttp bersama.
+    
+    Args:
+        session (aiohttp.ClientSession): Session dengan connection pool bersama
+        page_number (int): Nomor halaman yang akan di-scrape
+        base_url (str): URL dasar website
+        rate_limiter (HostRateLimiter): Pembatas laju request per host (opsional)
+        max_retries (int): Jumlah maksimal percobaan
+        backoff (float): Lama tunggu dasar (detik) untuk exponential backoff
+        parser (str): Nama backend parser HTML (None = parser default)
+        parse_executor (ProcessPoolExecutor): Pool untuk parsing di luar event loop (opsional)
+    
+    Returns:
+        list: Daftar produk dari halaman tersebut (kosong jika halaman tidak berisi produk
+            atau server menjawab 404/4xx lain yang tidak dicoba ulang)
+    
+    Raises:
+        Exception: Jika halaman tetap gagal diambil setelah semua percobaan (hanya 5xx, 408/429
+            dan error koneksi yang dicoba ulang)
+    """
+    aiohttp = _import_aiohttp()
+    url = page_url(page_number, base_url)
+    
+    for attempt in range(max_retries):
+        response = None
+        try:
+            if rate_limiter is not None:
+                await rate_limiter.wait_async(url)
+            
+            async with session.get(url) as response:
+                response.raise_for_status()
+                html = await response.text()
+            
+            if parse_executor is not None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(parse_executor, extract_products, html, parser)
+            return extract_products(html, parser)
         
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = getattr(e, 'status', None)
+            if not _is_retryable_status(status):
+                # 404 dan 4xx lain tidak akan berubah dengan dicoba ulang: perlakukan seperti halaman kosong
+                logger.warning(f"Halaman {page_number} tidak tersedia (HTTP {status}), dianggap sebagai akhir katalog")
+                return []
+            if attempt < max_retries - 1:
+                delay = _retry_after(response, attempt, backoff)
+                logger.warning(f"Percobaan {attempt+1} untuk halaman {page_number} gagal: {str(e)}. Mencoba kembali dalam {delay:.2f} detik...")
+                await asyncio.sleep(delay)
+            else:
+                logger.error(f"Gagal mengambil data setelah {max_retries} percobaan: {str(e)}")
+                raise Exception(f"Gagal mengakses halaman {page_number}: {str(e)}")
+    
+    return []
+
+async def extract_data_async(start_page=1, end_page=50, concurrency=MAX_WORKERS, base_url=BASE_URL,
+                             requests_per_second=None, backoff=RETRY_DELAY, parser=None, parse_workers=0):
+    """
+    Mengekstrak data dari rentang halaman website secara async.
+    
+    Semua request memakai satu connection pool. Begitu sebuah halaman tidak
+    lagi berisi elemen .collection-card (atau dijawab 404), halaman sesudahnya
+    yang masih berjalan dibatalkan dan tidak ada halaman baru yang diambil.
+    
+    Args:
+        start_page (int): Halaman awal untuk ekstraksi
+        end_page (int): Halaman akhir untuk ekstraksi (None = sampai halaman kosong)
+        concurrency (int): Jumlah halaman yang diambil bersamaan
+        base_url (str): URL dasar website
+        requests_per_second (float): Batas laju request per host (None = tanpa batas)
+        backoff (float): Lama tunggu dasar (detik) untuk exponential backoff
+        parser (str): Nama backend parser HTML (None = parser default)
+        parse_workers (int): Jumlah proses untuk parsing HTML (0 = parsing di event loop)
+    
     Returns:
         DataFrame: Data hasil ekstraksi dalam format pandas DataFrame
     """
+    aiohttp = _import_aiohttp()
+    if aiohttp is None:
+        raise ImportError("Paket aiohttp diperlukan untuk ekstraksi async")
+    
     if start_page < 1:
         logger.warning("Halaman awal minimal adalah 1. Menggunakan halaman awal = 1")
         start_page = 1
-        
-    if end_page < start_page:
+    
+    if end_page is not None and end_page < start_page:
         logger.warning(f"Halaman akhir tidak boleh kurang dari halaman awal. Menggunakan halaman akhir = {start_page}")
         end_page = start_page
     
-    all_products = []
+    concurrency = max(1, concurrency)
+    pages = iter(range(start_page, end_page + 1)) if end_page is not None else itertools.count(start_page)
+    rate_limiter = HostRateLimiter(requests_per_second) if requests_per_second else None
     
-    try:
-        for page in range(start_page, end_page + 1):
+    results = {}
+    current_pages = {}
+    last_page = end_page
+    
+    def stop_after(page):
+        # Halaman kosong: batalkan semua halaman sesudahnya yang masih berjalan
+        nonlocal last_page
+        if last_page is None or page < last_page:
+            last_page = page
+        for task, running_page in list(current_pages.items()):
+            if running_page > page:
+                task.cancel()
+    
+    async def worker(session):
+        task = asyncio.current_task()
+        for page in pages:
+            if last_page is not None and page > last_page:
+                return
+            current_pages[task] = page
             try:
-                page_products = scrape_page(page)
-                if page_products:
-                    all_products.extend(page_products)
-                else:
-                    logger.warning(f"Tidak ada produk yang diekstrak dari halaman {page}")
-                
-                # Delay kecil untuk menghindari rate limiting
-                time.sleep(0.5)
-                
+                page_products = await scrape_page_async(session, page, base_url, rate_limiter, backoff=backoff,
+                                                        parser=parser, parse_executor=parse_executor)
             except Exception as e:
                 logger.error(f"Gagal mengambil data dari halaman {page}: {str(e)}")
                 continue
-        
-        # Konversi ke DataFrame
-        if all_products:
-            df = pd.DataFrame(all_products)
-            logger.info(f"Total data yang berhasil diekstrak: {len(df)}")
-            
-            # Debug: Cetak sampel data
-            logger.info(f"Sampel data yang diekstrak:\n{df.head().to_string()}")
-            
-            # Cetak nilai unik untuk setiap kolom
-            for col in df.columns:
-                unique_values = df[col].unique()
-                if len(unique_values) < 10:  # Hanya cetak jika jumlah nilai unik sedikit
-                    logger.info(f"Nilai unik untuk kolom {col}: {unique_values}")
-                else:
-                    logger.info(f"Jumlah nilai unik untuk kolom {col}: {len(unique_values)}")
+            finally:
+                current_pages.pop(task, None)
             
-            return df
-        else:
-            logger.warning("Tidak ada produk yang berhasil diekstrak")
-            # Buat DataFrame kosong dengan kolom yang diperlukan
-            return pd.DataFrame(columns=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp'])
-        
-    except Exception as e:
-        logger.error(f"Terjadi kesalahan pada proses ekstraksi: {str(e)}")
-        # Mengembalikan DataFrame kosong daripada gagal sepenuhnya
-        return pd.DataFrame(columns=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp'])
+            if page_products:
+                results[page] = page_products
+            else:
+                logger.info(f"Halaman {page} tidak berisi produk, ekstraksi dihentikan")
+                stop_after(page)
+                return
+    
+    parse_executor = None
+    if parse_workers and parse_workers > 0:
+        parse_executor = ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn'))
+    
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    try:
+        async with aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS, timeout=timeout) as session:
+            workers = [asyncio.create_task(worker(session)) for _ in range(concurrency)]
+            # Worker yang dibatalkan karena halaman kosong tidak dianggap sebagai kegagalan
+            await asyncio.gather(*workers, return_exceptions=True)
+    finally:
+        if parse_executor is not None:
+            parse_executor.shutdown(wait=True, cancel_futures=True)
+    
+    all_products = []
+    for page in sorted(results):
+        if last_page is None or page <= last_page:
+            all_products.extend(results[page])
+    
+    return _products_to_dataframe(all_products)
@@ -1,18 +1,153 @@
-
+import gzip
+import importlib
+import io
 import logging
 import os
+import sys
+import threading
+import time
+import numpy as np
 import pandas as pd
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from datetime import datetime
-from sqlalchemy import create_engine, MetaData, Table, Column, String, Float, Integer
-from sqlalchemy.exc import SQLAlchemyError
-import googleapiclient.discovery
-from google.oauth2 import service_account
+from utils.metrics import span
+from utils.profiling import profile
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsional, hanya untuk output Parquet/Feather
+    pa = None
+    feather = None
+    pq = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard opsional, hanya untuk output CSV .zst
+    zstandard = None
 
 # Konfigurasi logging
 logger = logging.getLogger(__name__)
 
-def save_to_csv(dataframe, filename=None):
-   
+# Output CSV: ukuran buffer tulis (byte) dan kompresi yang dikenali dari ekstensi file
+CSV_BUFFER_SIZE = 1024 * 1024
+CSV_COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+# Output kolumnar: format yang didukung, kompresi default dan jumlah baris per row group Parquet
+COLUMNAR_FORMATS = ('parquet', 'feather')
+COLUMNAR_COMPRESSION = 'zstd'
+PARQUET_ROW_GROUP_ROWS = 100000
+
+# Batas waktu default (detik) per sink saat load paralel
+SINK_TIMEOUT = 600
+
+# Mode load database: 'replace' (tulis ulang tabel) atau 'incremental' (upsert per produk).
+# Didefinisikan di sini agar CLI dapat menampilkannya tanpa mengimpor sink PostgreSQL.
+LOAD_MODES = ('replace', 'incremental')
+
+# Registry sink: nama -> label, modul, fungsi save, kelas chunk writer dan opsi writer.
+# Modul sink baru diimpor saat sink dipakai, sehingga run yang hanya menulis CSV
+# tidak memuat SQLAlchemy maupun Google API client.
+Sink = namedtuple('Sink', ['label', 'module', 'save', 'writer', 'options'])
+SINKS = {
+    'csv': Sink('CSV file', 'utils.load', 'save_to_csv', 'CsvChunkWriter', {}),
+    'parquet': Sink('Parquet file', 'utils.load', 'save_to_parquet', 'ColumnarChunkWriter', {'file_format': 'parquet'}),
+    'feather': Sink('Feather file', 'utils.load', 'save_to_feather', 'ColumnarChunkWriter', {'file_format': 'feather'}),
+    'gsheets': Sink('Google Sheets', 'utils.load_gsheets', 'save_to_gsheets', 'GSheetsChunkWriter', {}),
+    'postgres': Sink('PostgreSQL', 'utils.load_postgres', 'save_to_postgres', 'PostgresChunkWriter', {})
+}
+
+# Sink yang memperbarui output per produk tanpa menghapus baris yang tidak ikut dimuat, beserta opsi
+# yang dibutuhkan. Hanya sink ini yang boleh menerima delta dari DedupIndex; sink lain menimpa seluruh output.
+INCREMENTAL_SINKS = {'postgres': {'mode': 'incremental', 'soft_delete': False}}
+
+# Nama yang pindah ke modul sink; tetap dapat diimpor dari utils.load dan baru dimuat saat diakses
+_LAZY_ATTRIBUTES = {
+    **{name: 'utils.load_postgres' for name in (
+        'TABLE_NAME', 'KEY_COLUMNS', 'get_engine', 'pool_stats', 'dispose_engines', 'StagingCopy',
+        'IncrementalUpsert', 'UpsertResult', 'product_fingerprints', 'save_to_postgres', 'PostgresChunkWriter'
+    )},
+    **{name: 'utils.load_gsheets' for name in (
+        'SheetsUploader', 'clear_google_clients', 'save_to_gsheets', 'GSheetsChunkWriter'
+    )}
+}
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
+class AtomicCsvFile:
+    """
+    File CSV yang ditulis ke file sementara di direktori tujuan lalu di-rename.
+    
+    Pembaca tidak pernah melihat file setengah jadi: file tujuan baru muncul
+    (atau terganti) saat commit() lewat os.replace yang atomik. Data dapat
+    ditambahkan per chunk dan dikompresi gzip/zstd sambil ditulis.
+    """
+    
+    def __init__(self, filename, compression='infer', buffer_size=CSV_BUFFER_SIZE):
+        if compression == 'infer':
+            compression = CSV_COMPRESSIONS.get(os.path.splitext(filename)[1].lower())
+        if compression not in (None, 'gzip', 'zstd'):
+            raise ValueError(f"Kompresi CSV '{compression}' tidak dikenal. Pilihan: gzip, zstd")
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError("zstandard diperlukan untuk menulis CSV terkompresi zstd")
+        
+        self.filename = filename
+        directory, basename = os.path.split(os.path.abspath(filename))
+        self.temp_filename = os.path.join(directory, f".{basename}.{os.getpid()}.{threading.get_ident()}.tmp")
+        
+        # Mode 'x' gagal jika file sementara sudah ada; izin file mengikuti umask seperti open biasa
+        self._raw = open(self.temp_filename, 'xb', buffering=buffer_size)
+        if compression == 'gzip':
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=6)
+        elif compression == 'zstd':
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = None
+        self._text = io.TextIOWrapper(self._stream or self._raw, encoding='utf-8', newline='', write_through=True)
+    
+    def write(self, dataframe, header):
+        dataframe.to_csv(self._text, index=False, header=header)
+    
+    def _close(self):
+        self._text.flush()
+        if self._stream is not None:
+            self._stream.close()
+        self._raw.close()
+    
+    def commit(self):
+        """
+        Menutup file sementara dan menggantinya ke nama tujuan.
+        
+        Returns:
+            str: Path absolut file tujuan
+        """
+        try:
+            self._close()
+            os.replace(self.temp_filename, self.filename)
+        except Exception:
+            self.discard()
+            raise
+        return os.path.abspath(self.filename)
+    
+    def discard(self):
+        """
+        Membuang file sementara tanpa menyentuh file tujuan.
+        """
+        try:
+            self._close()
+        except Exception:
+            pass
+        if os.path.exists(self.temp_filename):
+            os.remove(self.temp_filename)
+
+def save_to_csv(dataframe, filename=None, compression='infer', buffer_size=CSV_BUFFER_SIZE):
+
     if dataframe.empty:
         raise ValueError("DataFrame kosong, tidak ada data yang dapat disimpan")
     
@@ -20,110 +155,503 @@ def save_to_csv(dataframe, filename=None):
         if filename is None:
             filename = "products.csv"
         
-        # Simpan DataFrame ke CSV
-        dataframe.to_csv(filename, index=False)
+        # Simpan DataFrame ke CSV lewat file sementara yang di-rename setelah lengkap
+        output = AtomicCsvFile(filename, compression, buffer_size)
+        try:
+            output.write(dataframe, header=True)
+        except Exception:
+            output.discard()
+            raise
+        output.commit()
         
         # Verifikasi file telah dibuat
         if not os.path.exists(filename):
             raise FileNotFoundError(f"File {filename} gagal dibuat")
         
         return os.path.abspath(filename)
-        
+    
     except Exception as e:
         logger.error(f"Gagal menyimpan data ke CSV: {str(e)}")
         raise
 
-def save_to_gsheets(dataframe, creds_file="google-sheets-api.json"):
+def _arrow_type(series):
+    """
+    Menentukan tipe kolom Arrow dari dtype pandas hasil transform_data.
+    """
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return pa.bool_()
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype):
+        # Lebar numpy dipertahankan (skema ringkas: int8, float32); dtype nullable pandas jadi 64-bit
+        if isinstance(dtype, np.dtype):
+            return pa.from_numpy_dtype(dtype)
+        return pa.int64() if pd.api.types.is_integer_dtype(dtype) else pa.float64()
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return pa.timestamp('ns', tz=str(dtype.tz))
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return pa.timestamp('ns')
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pa.dictionary(pa.int32(), _arrow_type(pd.Series(dtype.categories)))
+    return pa.string()
+
+def _arrow_table(dataframe, schema=None):
+    if schema is None:
+        schema = pa.schema([(str(column), _arrow_type(dataframe[column])) for column in dataframe.columns])
+    return pa.Table.from_pandas(dataframe, schema=schema, preserve_index=False)
+
+def _columnar_path(filename, file_format, partition_by_run_date, run_date):
+    """
+    Menentukan path file output kolumnar.
+    
+    Dengan partisi, filename adalah direktori dataset dan file ditulis ke
+    <filename>/run_date=<YYYY-MM-DD>/products.<format> (layout Hive, dibaca
+    pandas/pyarrow sebagai kolom run_date). Run di tanggal yang sama menimpa partisinya.
+    """
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Format '{file_format}' tidak dikenal. Pilihan: {', '.join(COLUMNAR_FORMATS)}")
+    if pa is None:
+        raise ImportError("pyarrow diperlukan untuk menulis file Parquet/Feather")
     
+    if not partition_by_run_date:
+        return filename or f"products.{file_format}"
+    
+    run_date = pd.Timestamp(run_date or datetime.now())
+    directory = os.path.join(filename or "products", f"run_date={run_date:%Y-%m-%d}")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"products.{file_format}")
+
+def _save_columnar(dataframe, filename, file_format, compression, row_group_size, partition_by_run_date, run_date):
+
     if dataframe.empty:
         raise ValueError("DataFrame kosong, tidak ada data yang dapat disimpan")
     
-    if not os.path.exists(creds_file):
-        raise FileNotFoundError(f"File kredensial {creds_file} tidak ditemukan")
-    
     try:
-        # Menyiapkan kredensial
-        SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
-        credentials = service_account.Credentials.from_service_account_file(creds_file, scopes=SCOPES)
-        
-        # Buat instance Google Sheets API dan Drive API
-        sheets_service = googleapiclient.discovery.build('sheets', 'v4', credentials=credentials)
-        drive_service = googleapiclient.discovery.build('drive', 'v3', credentials=credentials)
-        
-        # Buat spreadsheet baru
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        spreadsheet_body = {
-            'properties': {
-                'title': f"FashionStudio_Products_{timestamp}"
-            }
-        }
-        
-        spreadsheet = sheets_service.spreadsheets().create(body=spreadsheet_body).execute()
-        spreadsheet_id = spreadsheet.get('spreadsheetId')
-        
-        # Ubah permission agar dapat diakses oleh siapa saja dengan link
-        permission = {
-            'type': 'anyone',
-            'role': 'writer',
-            'allowFileDiscovery': False
-        }
-        drive_service.permissions().create(fileId=spreadsheet_id, body=permission).execute()
-        
-        # Konversi DataFrame ke list values
-        values = [dataframe.columns.tolist()]
-        values.extend(dataframe.values.tolist())
-        
-        body = {
-            'values': values
-        }
-        
-        # Update data ke sheet
-        result = sheets_service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range='Sheet1',
-            valueInputOption='RAW',
-            body=body
-        ).execute()
-        
-        # Dapatkan URL spreadsheet
-        spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
-        
-        return spreadsheet_url
+        path = _columnar_path(filename, file_format, partition_by_run_date, run_date)
+        table = _arrow_table(dataframe)
         
+        if file_format == 'parquet':
+            pq.write_table(table, path, compression=compression, row_group_size=row_group_size)
+        else:
+            feather.write_feather(table, path, compression=compression, chunksize=row_group_size)
+        
+        return os.path.abspath(path)
+    
     except Exception as e:
-        logger.error(f"Gagal menyimpan data ke Google Sheets: {str(e)}")
+        logger.error(f"Gagal menyimpan data ke {file_format.capitalize()}: {str(e)}")
         raise
 
-def save_to_postgres(dataframe, db_config=None):
+def save_to_parquet(dataframe, filename=None, compression=COLUMNAR_COMPRESSION, row_group_size=PARQUET_ROW_GROUP_ROWS,
+                    partition_by_run_date=False, run_date=None):
+    """
+    Menyimpan DataFrame ke file Parquet dengan tipe kolom sesuai dtype transform_data.
     
-    if dataframe.empty:
-        raise ValueError("DataFrame kosong, tidak ada data yang dapat disimpan")
+    Args:
+        dataframe (DataFrame): Data yang akan disimpan
+        filename (str): Path file (default products.parquet) atau direktori dataset jika dipartisi
+        compression (str): Kompresi Parquet ('zstd', 'snappy', 'gzip', None, ...)
+        row_group_size (int): Jumlah baris maksimal per row group
+        partition_by_run_date (bool): Tulis ke partisi run_date=<tanggal> di dalam direktori filename
+        run_date (date): Tanggal partisi (default hari ini)
     
-    # Default konfigurasi database
-    if db_config is None:
-        db_config = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'database': os.getenv('DB_NAME', 'postgres'),
-            'user': os.getenv('DB_USER', 'postgres'),
-            'password': os.getenv('DB_PASSWORD', 'postgres'),
-            'port': os.getenv('DB_PORT', '5432')
-        }
+    Returns:
+        str: Path absolut file yang ditulis
+    """
+    return _save_columnar(dataframe, filename, 'parquet', compression, row_group_size, partition_by_run_date, run_date)
+
+def save_to_feather(dataframe, filename=None, compression=COLUMNAR_COMPRESSION, row_group_size=PARQUET_ROW_GROUP_ROWS,
+                    partition_by_run_date=False, run_date=None):
+    """
+    Menyimpan DataFrame ke file Feather (Arrow IPC) dengan tipe kolom sesuai dtype transform_data.
     
-    try:
-        # Buat koneksi ke database
-        connection_string = f"postgresql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
-        engine = create_engine(connection_string)
+    Argumen sama dengan save_to_parquet; compression hanya 'zstd', 'lz4' atau
+    'uncompressed', dan row_group_size menjadi ukuran record batch.
+    """
+    return _save_columnar(dataframe, filename, 'feather', compression, row_group_size, partition_by_run_date, run_date)
+
+def _flag(value):
+    if isinstance(value, str):
+        return value.strip().lower() not in ('', '0', 'false', 'no', 'off')
+    return bool(value)
+
+class ChunkWriter:
+    """
+    Dasar penulis data per chunk untuk mode streaming.
+    
+    Chunk pertama membuat atau mengganti tujuan, chunk berikutnya ditambahkan.
+    Subclass mengimplementasikan _write(dataframe, first) dan _finish().
+    """
+    name = 'chunks'
+    
+    def __init__(self):
+        self.rows = 0
+        self.chunks = 0
+    
+    def write(self, dataframe):
+        """
+        Menulis satu chunk ke tujuan.
         
-        # Simpan DataFrame ke database
-        table_name = "fashion_products"
-        dataframe.to_sql(table_name, engine, if_exists='replace', index=False)
+        Args:
+            dataframe (DataFrame): Chunk data yang sudah ditransformasi
+        """
+        if dataframe.empty:
+            return
         
-        logger.info(f"Data berhasil disimpan ke tabel {table_name}")
-        return True
+        try:
+            self._write(dataframe, first=self.chunks == 0)
+        except Exception as e:
+            logger.error(f"Gagal menulis chunk {self.chunks + 1} ke {self.name}: {str(e)}")
+            raise
         
-    except SQLAlchemyError as e:
-        logger.error(f"Gagal menyimpan data ke PostgreSQL: {str(e)}")
-        raise
+        self.chunks += 1
+        self.rows += len(dataframe)
+    
+    def abort(self):
+        """
+        Membatalkan penulisan setelah chunk gagal ditulis.
+        """
+    
+    def close(self):
+        """
+        Menyelesaikan penulisan.
+        
+        Returns:
+            Hasil sink (path file, URL spreadsheet, atau True untuk database)
+        
+        Raises:
+            ValueError: Jika tidak ada chunk yang ditulis
+        """
+        if self.chunks == 0:
+            raise ValueError("Tidak ada data yang dapat disimpan")
+        
+        logger.info(f"{self.rows} baris ditulis ke {self.name} dalam {self.chunks} chunk")
+        return self._finish()
+
+class CsvChunkWriter(ChunkWriter):
+    """
+    Menulis chunk ke satu file CSV (header hanya pada chunk pertama).
+    
+    Chunk ditambahkan ke file sementara; file tujuan baru diganti saat close(),
+    sehingga run yang gagal di tengah tidak meninggalkan CSV terpotong.
+    """
+    name = 'CSV'
+    
+    def __init__(self, filename="products.csv", compression='infer', buffer_size=CSV_BUFFER_SIZE):
+        super().__init__()
+        self.filename = filename
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.output = None
+    
+    def _write(self, dataframe, first):
+        if first:
+            self.output = AtomicCsvFile(self.filename, self.compression, self.buffer_size)
+        self.output.write(dataframe, header=first)
+    
+    def abort(self):
+        if self.output is not None:
+            self.output.discard()
+            self.output = None
+    
+    def _finish(self):
+        path = self.output.commit()
+        self.output = None
+        return path
+
+class ColumnarChunkWriter(ChunkWriter):
+    """
+    Menulis chunk ke satu file Parquet atau Feather; skema diambil dari chunk pertama.
+    """
+    name = 'Parquet'
+    
+    def __init__(self, filename=None, file_format='parquet', compression=COLUMNAR_COMPRESSION,
+                 row_group_size=PARQUET_ROW_GROUP_ROWS, partition_by_run_date=False, run_date=None):
+        super().__init__()
+        self.path = _columnar_path(filename, file_format, partition_by_run_date, run_date)
+        self.file_format = file_format
+        self.name = file_format.capitalize()
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.writer = None
+        self.schema = None
+    
+    def _write(self, dataframe, first):
+        if first:
+            table = _arrow_table(dataframe)
+            if self.file_format == 'feather' and any(pa.types.is_dictionary(field.type) for field in table.schema):
+                # File IPC hanya boleh punya satu dictionary per kolom, sedangkan kategori tiap chunk berbeda
+                table = table.cast(pa.schema([
+                    field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+                    for field in table.schema
+                ], metadata=table.schema.metadata))
+            self.schema = table.schema
+            if self.file_format == 'parquet':
+                self.writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+            else:
+                compression = None if self.compression == 'uncompressed' else self.compression
+                options = pa.ipc.IpcWriteOptions(compression=compression)
+                self.writer = pa.ipc.new_file(self.path, table.schema, options=options)
+        else:
+            table = _arrow_table(dataframe, self.schema)
+        
+        if self.file_format == 'parquet':
+            self.writer.write_table(table, row_group_size=self.row_group_size)
+        else:
+            self.writer.write_table(table, max_chunksize=self.row_group_size)
+    
+    def abort(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            # File setengah jadi tidak boleh dibaca sebagai output lengkap
+            os.remove(self.path)
+    
+    def _finish(self):
+        self.writer.close()
+        self.writer = None
+        return os.path.abspath(self.path)
+
+def save_chunks(chunks, writers):
+    """
+    Menulis setiap chunk ke semua writer, lalu menutup writer-nya.
+    
+    Hanya satu chunk yang ada di memori pada satu waktu. Writer yang gagal
+    dicatat di log dan tidak menerima chunk berikutnya; writer lain tetap berjalan.
+    
+    Args:
+        chunks (iterable): Chunk DataFrame yang sudah ditransformasi
+        writers (dict): Nama sink -> ChunkWriter
+    
+    Returns:
+        dict: Nama sink -> hasil close() atau exception jika gagal
+    """
+    results = {}
+    active = dict(writers)
+    for chunk in chunks:
+        for name, writer in list(active.items()):
+            try:
+                with span(f'load.{name}', rows=len(chunk)), profile(f'load.{name}'):
+                    writer.write(chunk)
+            except Exception as e:
+                results[name] = e
+                del active[name]
+                writer.abort()
+    
+    for name, writer in active.items():
+        try:
+            with span(f'load.{name}.close'), profile(f'load.{name}'):
+                results[name] = writer.close()
+        except Exception as e:
+            logger.error(f"Gagal menyelesaikan penulisan ke {writer.name}: {str(e)}")
+            results[name] = e
+    
+    return {name: results[name] for name in writers}
+
+SinkResult = namedtuple('SinkResult', ['name', 'ok', 'result', 'error', 'seconds'])
+
+class SinkDeadline:
+    """
+    Batas waktu satu sink yang dijalankan load_to_sinks.
+    
+    Thread sink tidak dapat dihentikan paksa, jadi sink yang perubahannya
+    permanen setelah commit (misalnya PostgreSQL) memanggil begin_commit()
+    tepat sebelum commit. Jika batas waktu sudah lewat, commit ditolak dengan
+    TimeoutError; jika belum, load_to_sinks menunggu commit selesai alih-alih
+    melaporkan timeout. Sink tidak pernah meng-commit setelah run menganggapnya gagal.
+    
+    Args:
+        at (float): Batas waktu dalam detik time.perf_counter()
+    """
+    
+    def __init__(self, at):
+        self.at = at
+        self.committing = False
+        self._expired = False
+        self._lock = threading.Lock()
+    
+    def remaining(self):
+        """
+        Sisa waktu (detik) sebelum batas waktu, minimal 0.
+        """
+        return max(0.0, self.at - time.perf_counter())
+    
+    def expire(self):
+        """
+        Menandai batas waktu sudah lewat.
+        
+        Returns:
+            bool: False jika sink sudah mulai commit dan hasilnya harus ditunggu
+        """
+        with self._lock:
+            if self.committing:
+                return False
+            self._expired = True
+            return True
+    
+    def begin_commit(self):
+        """
+        Mengklaim commit sebelum batas waktu.
+        
+        Raises:
+            TimeoutError: Jika load_to_sinks sudah melaporkan sink ini timeout
+        """
+        with self._lock:
+            if self._expired:
+                raise TimeoutError("Batas waktu sink sudah lewat, commit dibatalkan")
+            self.committing = True
+
+# Batas waktu sink yang sedang berjalan di thread ini (diisi load_to_sinks)
+_sink_local = threading.local()
+
+def current_sink_deadline():
+    """
+    Mengembalikan SinkDeadline untuk sink yang berjalan di thread ini.
+    
+    Returns:
+        SinkDeadline: Batas waktu sink, atau None jika sink dipanggil tanpa batas waktu
+    """
+    return getattr(_sink_local, 'deadline', None)
+
+def _timed_call(name, func, dataframe):
+    start = time.perf_counter()
+    try:
+        # Sink berjalan paralel di thread pool, jadi diukur dengan sampling
+        with span(f'load.{name}', rows=len(dataframe)), profile(f'load.{name}', threaded=True):
+            return func(dataframe), None, time.perf_counter() - start
     except Exception as e:
-        logger.error(f"Terjadi kesalahan saat menyimpan ke PostgreSQL: {str(e)}")
-        raise
\ No newline at end of file
+        return None, e, time.perf_counter() - start
+
+def _run_sink(future, name, func, dataframe, deadline):
+    _sink_local.deadline = deadline
+    try:
+        future.set_result(_timed_call(name, func, dataframe))
+    finally:
+        _sink_local.deadline = None
+
+def load_to_sinks(dataframe, sinks, timeout=SINK_TIMEOUT, timeouts=None):
+    """
+    Menyimpan satu DataFrame ke beberapa sink sekaligus, masing-masing di thread sendiri.
+    
+    Sink saling independen: error atau timeout satu sink tidak menghentikan
+    sink lain. Thread sink tidak dapat dihentikan paksa; sink yang melewati
+    batas waktu dilaporkan gagal dan threadnya dibiarkan berjalan sebagai
+    daemon, sehingga tidak menahan interpreter saat proses selesai. Agar
+    tidak ada perubahan yang masuk setelah itu, sink memakai
+    current_sink_deadline(): PostgreSQL membatasi statement dengan
+    statement_timeout dan menolak commit yang terlambat, Google Sheets
+    memakai timeout per request. Sink file (CSV, Parquet, Feather) tidak
+    memeriksa batas waktu, jadi file dari sink yang timeout masih dapat
+    ditulis belakangan.
+    
+    Args:
+        dataframe (DataFrame): Data yang akan disimpan
+        sinks (dict): Nama sink -> fungsi save yang menerima DataFrame
+        timeout (float): Batas waktu default per sink (detik), None = tanpa batas
+        timeouts (dict): Batas waktu khusus per nama sink
+    
+    Returns:
+        dict: Nama sink -> SinkResult(name, ok, result, error, seconds), urut seperti sinks
+    """
+    if not sinks:
+        return {}
+    timeouts = timeouts or {}
+    
+    results = {}
+    start = time.perf_counter()
+    pending = {}
+    deadlines = {}
+    for name, func in sinks.items():
+        limit = timeouts.get(name, timeout)
+        deadline = SinkDeadline(start + limit) if limit is not None else None
+        future = Future()
+        pending[future] = name
+        deadlines[future] = deadline
+        threading.Thread(target=_run_sink, args=(future, name, func, dataframe, deadline),
+                         name=f'sink-{name}', daemon=True).start()
+    
+    while pending:
+        now = time.perf_counter()
+        for future in [f for f in pending if deadlines[f] is not None and deadlines[f].at <= now and not f.done()]:
+            if not deadlines[future].expire():
+                # Sink sudah mulai commit: hasilnya ditunggu tanpa batas waktu
+                deadlines[future] = None
+                continue
+            # Sink yang melewati batas waktu dicatat sebagai TimeoutError
+            name = pending.pop(future)
+            error = TimeoutError(f"{name} melewati batas waktu {deadlines[future].at - start:.0f} detik")
+            results[name] = SinkResult(name, False, None, error, now - start)
+        
+        active = [deadlines[f].at for f in pending if deadlines[f] is not None]
+        done, _ = wait(list(pending), timeout=max(0.0, min(active) - now) if active else None,
+                       return_when=FIRST_COMPLETED)
+        for future in done:
+            name = pending.pop(future)
+            result, error, seconds = future.result()
+            results[name] = SinkResult(name, error is None, result, error, seconds)
+    
+    return {name: results[name] for name in sinks}
+
+def _sink(name):
+    if name not in SINKS:
+        raise ValueError(f"Sink '{name}' tidak dikenal. Pilihan: {', '.join(SINKS)}")
+    sink = SINKS[name]
+    return sink, importlib.import_module(sink.module)
+
+def get_sink(name):
+    """
+    Mengembalikan fungsi save sebuah sink, mengimpor modul sink jika belum dimuat.
+    
+    Args:
+        name (str): Nama sink di SINKS, misalnya 'csv' atau 'postgres'
+    
+    Returns:
+        callable: Fungsi save yang menerima DataFrame
+    
+    Raises:
+        ValueError: Jika nama sink tidak dikenal
+    """
+    sink, module = _sink(name)
+    return getattr(module, sink.save)
+
+def open_chunk_writer(name, **options):
+    """
+    Membuat chunk writer sebuah sink untuk mode streaming.
+    
+    Args:
+        name (str): Nama sink di SINKS
+        **options: Argumen tambahan untuk kelas writer
+    
+    Returns:
+        ChunkWriter: Writer baru
+    
+    Raises:
+        ValueError: Jika nama sink tidak dikenal
+    """
+    sink, module = _sink(name)
+    return getattr(module, sink.writer)(**{**sink.options, **options})
+
+def is_incremental(name, options=None):
+    """
+    Mengecek apakah sink dengan opsi tertentu hanya memperbarui produk yang dimuat.
+    
+    Args:
+        name (str): Nama sink di SINKS
+        options (dict): Opsi sink yang akan dipakai (opsi yang tidak diisi dianggap False)
+    
+    Returns:
+        bool: True jika produk di luar DataFrame tetap ada di output setelah load
+    """
+    required = INCREMENTAL_SINKS.get(name)
+    if required is None:
+        return False
+    options = options or {}
+    return all(options.get(key, False) == value for key, value in required.items())
+
+def close_sinks():
+    """
+    Menutup sumber daya bersama sink yang sudah dimuat (pool koneksi database).
+    
+    Sink yang modulnya tidak pernah diimpor dilewati, sehingga tidak ada modul berat yang dimuat di sini.
+    """
+    postgres = sys.modules.get('utils.load_postgres')
+    if postgres is not None:
+        postgres.dispose_engines()
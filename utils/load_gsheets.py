@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Sink Google Sheets: klien Google API yang di-cache dan upload paralel per blok baris.
+
+Modul ini memuat googleapiclient dan google-auth, sehingga hanya diimpor saat
+sink Google Sheets dipakai (lihat SINKS di utils.load).
+"""
+import logging
+import os
+import random
+import threading
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import googleapiclient.discovery
+import google_auth_httplib2
+import httplib2
+from googleapiclient.errors import HttpError
+from google.oauth2 import service_account
+from utils.load import ChunkWriter, _flag
+
+# Konfigurasi logging
+logger = logging.getLogger(__name__)
+
+# Scope Google API untuk Sheets dan Drive
+GOOGLE_SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+
+# Upload Google Sheets: baris per request, jumlah request paralel dan backoff saat kuota habis
+GSHEETS_BATCH_ROWS = 5000
+GSHEETS_MAX_WORKERS = 4
+GSHEETS_MAX_RETRIES = 5
+GSHEETS_BACKOFF_SECONDS = 1.0
+GSHEETS_MAX_BACKOFF = 64.0
+GSHEETS_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Batas waktu (detik) per request HTTP, agar request yang menggantung tidak menahan sink selamanya
+GSHEETS_REQUEST_TIMEOUT = 60
+
+# Cache kredensial dan service Google API selama proses berjalan
+_google_clients = {}
+_google_clients_lock = threading.Lock()
+
+def _google_credentials(creds_file):
+    """
+    Membaca kredensial service account sekali per file.
+    
+    Token akses tidak diminta di sini; google-auth me-refresh token secara
+    lazy saat request pertama atau ketika token kedaluwarsa.
+    """
+    key = ('credentials', os.path.abspath(creds_file))
+    with _google_clients_lock:
+        credentials = _google_clients.get(key)
+        if credentials is None:
+            credentials = service_account.Credentials.from_service_account_file(creds_file, scopes=GOOGLE_SCOPES)
+            _google_clients[key] = credentials
+    return credentials
+
+def _google_service(name, version, creds_file):
+    """
+    Membuat service Google API sekali per kombinasi API dan file kredensial.
+    
+    Dokumen discovery diambil dari salinan statis yang dibawa googleapiclient
+    (tanpa request jaringan), kecuali GOOGLE_STATIC_DISCOVERY=0.
+    """
+    credentials = _google_credentials(creds_file)
+    key = ('service', name, version, os.path.abspath(creds_file))
+    with _google_clients_lock:
+        service = _google_clients.get(key)
+        if service is None:
+            service = googleapiclient.discovery.build(
+                name, version, credentials=credentials,
+                static_discovery=_flag(os.getenv('GOOGLE_STATIC_DISCOVERY', '1')),
+                cache_discovery=False
+            )
+            _google_clients[key] = service
+    return service
+
+def clear_google_clients():
+    """
+    Menghapus cache kredensial dan service Google API (misal setelah file kredensial diganti).
+    """
+    with _google_clients_lock:
+        _google_clients.clear()
+
+def _authorized_http_factory(credentials):
+    """
+    Membuat fungsi pembuat objek HTTP baru per thread (httplib2 tidak thread-safe).
+    
+    Tanpa timeout httplib2 menunggu selamanya; service bawaan googleapiclient
+    sudah memakai batas waktu yang sama.
+    """
+    return lambda: google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=GSHEETS_REQUEST_TIMEOUT))
+
+def _is_quota_error(error):
+    status = int(getattr(error.resp, 'status', 0) or 0)
+    if status in GSHEETS_RETRY_STATUSES:
+        return True
+    # API Google lama melaporkan kuota habis sebagai 403 rateLimitExceeded
+    return status == 403 and b'ratelimitexceeded' in (error.content or b'').lower()
+
+def _execute_with_backoff(request, http=None, max_retries=GSHEETS_MAX_RETRIES, backoff=GSHEETS_BACKOFF_SECONDS):
+    """
+    Menjalankan request Google API dan mengulanginya saat kuota habis atau server sibuk.
+    
+    Header Retry-After diutamakan; jika tidak ada, dipakai exponential backoff
+    dengan jitter (maksimal GSHEETS_MAX_BACKOFF detik).
+    
+    Args:
+        request: HttpRequest dari googleapiclient
+        http: Objek HTTP milik thread pemanggil (None = HTTP bawaan service)
+        max_retries (int): Jumlah maksimal percobaan ulang
+        backoff (float): Lama tunggu dasar (detik)
+    
+    Raises:
+        HttpError: Jika error bukan karena kuota/server atau percobaan ulang habis
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            if http is None:
+                return request.execute()
+            return request.execute(http=http)
+        except HttpError as e:
+            if attempt == max_retries or not _is_quota_error(e):
+                raise
+            delay = None
+            retry_after = e.resp.get('retry-after') if hasattr(e.resp, 'get') else None
+            if retry_after is not None:
+                try:
+                    delay = max(0.0, float(retry_after))
+                except ValueError:
+                    pass
+            if delay is None:
+                delay = min(GSHEETS_MAX_BACKOFF, backoff * (2 ** attempt) + random.uniform(0, backoff))
+            logger.warning(f"Request Google Sheets ditolak (status {e.resp.status}), mencoba kembali dalam {delay:.1f} detik...")
+            time.sleep(delay)
+
+def _sheet_properties(spreadsheet_id, properties):
+    grid = properties.get('gridProperties', {})
+    return {
+        'spreadsheetId': spreadsheet_id,
+        'sheetId': properties.get('sheetId', 0),
+        'title': properties.get('title', 'Sheet1'),
+        'rowCount': grid.get('rowCount', 1000),
+        'columnCount': grid.get('columnCount', 26)
+    }
+
+def _create_spreadsheet(sheets_service, drive_service, rows, columns):
+    """
+    Membuat spreadsheet baru yang dapat diakses siapa saja dengan link.
+    
+    Ukuran grid sheet pertama langsung disesuaikan dengan data sehingga tidak
+    perlu request resize terpisah.
+    
+    Args:
+        sheets_service: Service Google Sheets API
+        drive_service: Service Google Drive API
+        rows (int): Jumlah baris yang akan ditulis (termasuk header)
+        columns (int): Jumlah kolom
+    
+    Returns:
+        dict: Properti sheet tujuan (spreadsheetId, sheetId, title, rowCount, columnCount)
+    """
+    # Buat spreadsheet baru
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    spreadsheet_body = {
+        'properties': {
+            'title': f"FashionStudio_Products_{timestamp}"
+        },
+        'sheets': [{
+            'properties': {
+                'title': 'Sheet1',
+                'gridProperties': {'rowCount': rows, 'columnCount': columns}
+            }
+        }]
+    }
+    
+    spreadsheet = _execute_with_backoff(sheets_service.spreadsheets().create(body=spreadsheet_body))
+    spreadsheet_id = spreadsheet.get('spreadsheetId')
+    
+    # Ubah permission agar dapat diakses oleh siapa saja dengan link
+    permission = {
+        'type': 'anyone',
+        'role': 'writer',
+        'allowFileDiscovery': False
+    }
+    _execute_with_backoff(drive_service.permissions().create(fileId=spreadsheet_id, body=permission))
+    
+    sheets = spreadsheet.get('sheets') or [spreadsheet_body['sheets'][0]]
+    return _sheet_properties(spreadsheet_id, sheets[0].get('properties', {}))
+
+def _open_spreadsheet(sheets_service, spreadsheet_id):
+    """
+    Mengambil properti sheet pertama dari spreadsheet yang sudah ada.
+    """
+    spreadsheet = _execute_with_backoff(
+        sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields='sheets.properties')
+    )
+    sheets = spreadsheet.get('sheets') or [{}]
+    return _sheet_properties(spreadsheet_id, sheets[0].get('properties', {}))
+
+def _open_target_sheet(creds_file, spreadsheet_id, rows, columns):
+    """
+    Menyiapkan sheet tujuan: spreadsheet yang dikonfigurasi dipakai ulang,
+    jika tidak ada dibuat spreadsheet baru.
+    
+    Returns:
+        tuple: (service Google Sheets, properti sheet, pembuat HTTP per thread)
+    """
+    sheets_service = _google_service('sheets', 'v4', creds_file)
+    
+    spreadsheet_id = spreadsheet_id or os.getenv('GSHEETS_SPREADSHEET_ID')
+    if spreadsheet_id:
+        sheet = _open_spreadsheet(sheets_service, spreadsheet_id)
+    else:
+        drive_service = _google_service('drive', 'v3', creds_file)
+        sheet = _create_spreadsheet(sheets_service, drive_service, rows, columns)
+    return sheets_service, sheet, _authorized_http_factory(_google_credentials(creds_file))
+
+def _sheet_rows(dataframe):
+    """
+    Mengubah DataFrame menjadi list baris yang dapat dikirim sebagai JSON.
+    
+    Kolom datetime64 (skema ringkas) ditulis dengan format timestamp hasil scraping.
+    """
+    datetime_columns = [column for column in dataframe.columns
+                        if pd.api.types.is_datetime64_any_dtype(dataframe[column].dtype)]
+    if datetime_columns:
+        dataframe = dataframe.copy(deep=False)
+        for column in datetime_columns:
+            text = dataframe[column].dt.strftime('%Y-%m-%d %H:%M:%S')
+            dataframe[column] = text.astype(object).where(text.notna(), None)
+    return dataframe.values.tolist()
+
+def _spreadsheet_url(spreadsheet_id):
+    return f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
+
+class SheetsUploader:
+    """
+    Mengunggah baris ke satu sheet dalam blok berukuran tetap.
+    
+    Setiap blok ditulis ke range eksplisit (values().update), sehingga blok
+    dapat dikirim paralel oleh beberapa thread tanpa mengacaukan urutan baris.
+    Grid sheet diperbesar lebih dulu lewat spreadsheets().batchUpdate karena
+    update di luar grid ditolak API.
+    """
+    
+    def __init__(self, sheets_service, sheet, batch_rows=GSHEETS_BATCH_ROWS, max_workers=GSHEETS_MAX_WORKERS,
+                 http_factory=None):
+        if batch_rows < 1:
+            raise ValueError("batch_rows harus minimal 1")
+        self.sheets_service = sheets_service
+        self.sheet = dict(sheet)
+        self.batch_rows = batch_rows
+        self.max_workers = max(1, max_workers)
+        self.http_factory = http_factory
+        self.next_row = 1
+        self.requests = 0
+        self._executor = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def resize(self, rows, columns):
+        """
+        Mengubah ukuran grid sheet tepat menjadi rows x columns (sisa data lama ikut terhapus).
+        """
+        if (rows, columns) == (self.sheet['rowCount'], self.sheet['columnCount']):
+            return
+        body = {'requests': [{
+            'updateSheetProperties': {
+                'properties': {
+                    'sheetId': self.sheet['sheetId'],
+                    'gridProperties': {'rowCount': rows, 'columnCount': columns}
+                },
+                'fields': 'gridProperties(rowCount,columnCount)'
+            }
+        }]}
+        _execute_with_backoff(self.sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=self.sheet['spreadsheetId'], body=body
+        ))
+        self.sheet['rowCount'], self.sheet['columnCount'] = rows, columns
+    
+    def write(self, values):
+        """
+        Menulis baris setelah baris terakhir yang sudah diunggah.
+        
+        Args:
+            values (list): List baris (list nilai sel)
+        """
+        if not values:
+            return
+        last_row = self.next_row + len(values) - 1
+        columns = max(len(row) for row in values)
+        if last_row > self.sheet['rowCount'] or columns > self.sheet['columnCount']:
+            self.resize(max(last_row, self.sheet['rowCount']), max(columns, self.sheet['columnCount']))
+        
+        blocks = [(self.next_row + i, values[i:i + self.batch_rows]) for i in range(0, len(values), self.batch_rows)]
+        if self.max_workers == 1 or len(blocks) == 1:
+            for row, block in blocks:
+                self._write_block(row, block)
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            # list() menunggu semua blok dan meneruskan exception blok yang gagal
+            list(self._executor.map(lambda item: self._write_block(*item, http=self._thread_http()), blocks))
+        self.next_row = last_row + 1
+    
+    def _thread_http(self):
+        if self.http_factory is None:
+            return None
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = self.http_factory()
+        return http
+    
+    def _write_block(self, row, block, http=None):
+        title = self.sheet['title'].replace("'", "''")
+        request = self.sheets_service.spreadsheets().values().update(
+            spreadsheetId=self.sheet['spreadsheetId'],
+            range=f"'{title}'!A{row}",
+            valueInputOption='RAW',
+            body={'values': block}
+        )
+        _execute_with_backoff(request, http)
+        with self._lock:
+            self.requests += 1
+    
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+def save_to_gsheets(dataframe, creds_file="google-sheets-api.json", spreadsheet_id=None,
+                    batch_rows=GSHEETS_BATCH_ROWS, max_workers=GSHEETS_MAX_WORKERS):
+    
+    if dataframe.empty:
+        raise ValueError("DataFrame kosong, tidak ada data yang dapat disimpan")
+    
+    if not os.path.exists(creds_file):
+        raise FileNotFoundError(f"File kredensial {creds_file} tidak ditemukan")
+    
+    try:
+        # Konversi DataFrame ke list values
+        values = [dataframe.columns.tolist()]
+        values.extend(_sheet_rows(dataframe))
+        columns = len(dataframe.columns)
+        
+        # Spreadsheet tujuan dari argumen/env GSHEETS_SPREADSHEET_ID dipakai ulang
+        sheets_service, sheet, http_factory = _open_target_sheet(creds_file, spreadsheet_id, len(values), columns)
+        
+        # Upload data per blok baris, paralel dengan jumlah thread terbatas
+        uploader = SheetsUploader(sheets_service, sheet, batch_rows, max_workers, http_factory)
+        try:
+            uploader.resize(len(values), columns)
+            uploader.write(values)
+        finally:
+            uploader.close()
+        
+        # Dapatkan URL spreadsheet
+        spreadsheet_url = _spreadsheet_url(sheet['spreadsheetId'])
+        
+        return spreadsheet_url
+    
+    except Exception as e:
+        logger.error(f"Gagal menyimpan data ke Google Sheets: {str(e)}")
+        raise
+
+class GSheetsChunkWriter(ChunkWriter):
+    """
+    Menulis chunk ke satu spreadsheet (dibuat atau dibuka saat chunk pertama ditulis).
+    
+    Setiap chunk diunggah per blok baris lewat SheetsUploader.
+    """
+    name = 'Google Sheets'
+    
+    def __init__(self, creds_file="google-sheets-api.json", spreadsheet_id=None,
+                 batch_rows=GSHEETS_BATCH_ROWS, max_workers=GSHEETS_MAX_WORKERS):
+        super().__init__()
+        if not os.path.exists(creds_file):
+            raise FileNotFoundError(f"File kredensial {creds_file} tidak ditemukan")
+        self.creds_file = creds_file
+        self.spreadsheet_id = spreadsheet_id
+        self.batch_rows = batch_rows
+        self.max_workers = max_workers
+        self.uploader = None
+    
+    def _write(self, dataframe, first):
+        values = _sheet_rows(dataframe)
+        if first:
+            values.insert(0, dataframe.columns.tolist())
+            columns = len(dataframe.columns)
+            sheets_service, sheet, http_factory = _open_target_sheet(
+                self.creds_file, self.spreadsheet_id, len(values), columns
+            )
+            self.spreadsheet_id = sheet['spreadsheetId']
+            self.uploader = SheetsUploader(sheets_service, sheet, self.batch_rows, self.max_workers, http_factory)
+            # Sheet yang dipakai ulang dipangkas ke ukuran chunk pertama, chunk berikutnya memperbesar grid
+            self.uploader.resize(len(values), columns)
+        self.uploader.write(values)
+    
+    def abort(self):
+        if self.uploader is not None:
+            self.uploader.close()
+    
+    def _finish(self):
+        self.uploader.close()
+        return _spreadsheet_url(self.spreadsheet_id)
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Sink PostgreSQL: engine dengan connection pool bersama, loader COPY dan upsert incremental.
+
+Modul ini memuat SQLAlchemy, sehingga hanya diimpor saat sink PostgreSQL dipakai
+(lihat SINKS di utils.load).
+"""
+import atexit
+import io
+import logging
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
+from utils.load import ChunkWriter, LOAD_MODES, _flag, current_sink_deadline
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow opsional, CSV untuk COPY dibuat dengan pandas
+    pa = None
+    pacsv = None
+
+# Konfigurasi logging
+logger = logging.getLogger(__name__)
+
+# Nama tabel tujuan di database
+TABLE_NAME = "fashion_products"
+
+# Jumlah baris per perintah COPY (membatasi buffer CSV di memori)
+COPY_BATCH_ROWS = 50000
+
+# Ukuran pool koneksi default per engine (bisa diganti lewat env atau db_config)
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 10
+
+# Kolom identitas produk untuk mode incremental; timestamp tidak ikut hash isi
+KEY_COLUMNS = ('Title', 'Size', 'Gender')
+FINGERPRINT_EXCLUDED_COLUMNS = ('timestamp',)
+FINGERPRINT_HASH_KEY = "stylestream-etl0"
+
+def _connection_string(db_config=None):
+    """
+    Menyusun URL SQLAlchemy dari konfigurasi database.
+    
+    'url' (URL SQLAlchemy lengkap) menggantikan host/port, misal SQLite untuk benchmark.
+    """
+    # Default konfigurasi database
+    if db_config is None:
+        db_config = {
+            'host': os.getenv('DB_HOST', 'localhost'),
+            'database': os.getenv('DB_NAME', 'postgres'),
+            'user': os.getenv('DB_USER', 'postgres'),
+            'password': os.getenv('DB_PASSWORD', 'postgres'),
+            'port': os.getenv('DB_PORT', '5432')
+        }
+    
+    if db_config.get('url'):
+        return db_config['url']
+    return f"postgresql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
+
+def _pool_options(url, db_config=None):
+    """
+    Opsi pool untuk create_engine dari db_config ('pool_size', 'max_overflow',
+    'pool_pre_ping') atau env DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_PRE_PING.
+    
+    SQLite in-memory memakai pool bawaan SQLAlchemy tanpa opsi tambahan.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    
+    db_config = db_config or {}
+    return {
+        'pool_size': int(db_config.get('pool_size', os.getenv('DB_POOL_SIZE', POOL_SIZE))),
+        'max_overflow': int(db_config.get('max_overflow', os.getenv('DB_MAX_OVERFLOW', POOL_MAX_OVERFLOW))),
+        'pool_pre_ping': _flag(db_config.get('pool_pre_ping', os.getenv('DB_POOL_PRE_PING', '1')))
+    }
+
+class PoolStats:
+    """
+    Statistik checkout koneksi dari satu pool engine.
+    
+    Waktu checkout mencakup menunggu koneksi bebas, membuka koneksi baru dan pre-ping.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+    
+    def record_checkout(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+    
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+    
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'wait_total': self.wait_total,
+                'wait_avg': self.wait_total / self.checkouts if self.checkouts else 0.0,
+                'wait_max': self.wait_max
+            }
+
+class _TimedQueuePool(QueuePool):
+    """
+    QueuePool yang mencatat lama checkout dan jumlah koneksi baru ke PoolStats.
+    """
+    stats = None
+    # Log pool tetap di logger SQLAlchemy, bukan di logger modul ini
+    _sqla_logger_namespace = 'sqlalchemy.pool.impl.QueuePool'
+    
+    def connect(self):
+        start = time.perf_counter()
+        connection = super().connect()
+        if self.stats is not None:
+            self.stats.record_checkout(time.perf_counter() - start)
+        return connection
+    
+    def _create_connection(self):
+        if self.stats is not None:
+            self.stats.record_connect()
+        return super()._create_connection()
+
+# Registry engine per (URL, opsi pool); dipakai ulang oleh semua pemanggilan load
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_engine(db_config=None):
+    """
+    Mengambil engine SQLAlchemy untuk db_config dari registry, dibuat sekali per konfigurasi.
+    
+    Args:
+        db_config: Konfigurasi database seperti save_to_postgres, boleh berisi
+                   'pool_size', 'max_overflow' dan 'pool_pre_ping'
+    
+    Returns:
+        Engine yang dipakai bersama sampai dispose_engines() dipanggil
+    """
+    url = _connection_string(db_config)
+    options = _pool_options(url, db_config)
+    key = (url, tuple(sorted(options.items())))
+    
+    with _engines_lock:
+        entry = _engines.get(key)
+        if entry is None:
+            if options:
+                engine = create_engine(url, poolclass=_TimedQueuePool, **options)
+            else:
+                engine = create_engine(url)
+            stats = PoolStats()
+            engine.pool.stats = stats
+            entry = _engines[key] = (engine, stats)
+    return entry[0]
+
+def _display_url(url):
+    return make_url(url).render_as_string(hide_password=True)
+
+def pool_stats():
+    """
+    Mengembalikan snapshot PoolStats setiap engine di registry, dengan kunci URL tanpa password.
+    """
+    with _engines_lock:
+        entries = list(_engines.items())
+    return {_display_url(url): stats.snapshot() for (url, _), (_, stats) in entries}
+
+def dispose_engines():
+    """
+    Menutup semua pool koneksi di registry dan mencatat statistik checkout-nya.
+    
+    Dipanggil saat pipeline selesai dan otomatis saat interpreter berhenti.
+    """
+    with _engines_lock:
+        entries = list(_engines.items())
+        _engines.clear()
+    
+    for (url, _), (engine, stats) in entries:
+        snapshot = stats.snapshot()
+        logger.info(
+            f"Pool {_display_url(url)}: {snapshot['checkouts']} checkout, {snapshot['connects']} koneksi baru, "
+            f"tunggu rata-rata {snapshot['wait_avg'] * 1000:.2f} ms, maks {snapshot['wait_max'] * 1000:.2f} ms"
+        )
+        engine.dispose()
+
+atexit.register(dispose_engines)
+
+def _quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _postgres_type(series):
+    """
+    Menentukan tipe kolom PostgreSQL dari dtype pandas (sama dengan pemetaan to_sql).
+    """
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return "TIMESTAMP WITH TIME ZONE"
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return "TIMESTAMP WITHOUT TIME ZONE"
+    return "TEXT"
+
+def _csv_payload(dataframe):
+    """
+    Mengubah DataFrame menjadi CSV tanpa header untuk COPY.
+    
+    Writer CSV pyarrow dipakai jika tersedia (jauh lebih cepat dari to_csv). pyarrow
+    menulis NULL sebagai field kosong tanpa kutip dan string kosong sebagai "";
+    pandas tidak membedakan keduanya, sehingga NULL ditulis sebagai \\N.
+    
+    Returns:
+        tuple: (file-like berisi CSV, penanda NULL untuk opsi COPY)
+    """
+    if pacsv is not None:
+        try:
+            buffer = io.BytesIO()
+            table = pa.Table.from_pandas(dataframe, preserve_index=False)
+            pacsv.write_csv(table, buffer, pacsv.WriteOptions(include_header=False))
+            buffer.seek(0)
+            return buffer, ''
+        except (pa.ArrowException, TypeError) as e:
+            logger.debug(f"pyarrow tidak dapat menulis CSV, memakai pandas: {str(e)}")
+    
+    buffer = io.StringIO()
+    dataframe.to_csv(buffer, index=False, header=False, na_rep='\\N')
+    buffer.seek(0)
+    return buffer, '\\N'
+
+def _column_definitions(column_types):
+    return ", ".join(f"{_quote_identifier(column)} {column_type}" for column, column_type in column_types.items())
+
+class StagingCopy:
+    """
+    Bulk load PostgreSQL lewat COPY FROM STDIN ke tabel staging yang lalu ditukar dengan tabel tujuan.
+    
+    Semua langkah berjalan dalam satu transaksi: pembaca tetap melihat tabel lama
+    sampai commit, dan tabel tujuan tidak pernah hilang selama load berjalan.
+    Tipe kolom staging ditentukan dari chunk pertama.
+    
+    Args:
+        engine (Engine): Engine SQLAlchemy dengan driver psycopg2
+        table_name (str): Tabel tujuan
+    """
+    
+    def __init__(self, engine, table_name=TABLE_NAME):
+        self.table_name = table_name
+        self.staging_name = f"{table_name}_staging"
+        self.staging_table = _quote_identifier(self.staging_name)
+        self.columns = None
+        self.column_types = None
+        self.column_definitions = None
+        self.rows = 0
+        self.connection = engine.raw_connection()
+        self.cursor = self.connection.cursor()
+        self.deadline = current_sink_deadline()
+        if self.deadline is not None:
+            # Statement yang masih berjalan saat batas waktu sink habis dibatalkan server (berlaku sampai commit)
+            self.cursor.execute(f"SET LOCAL statement_timeout = {max(1, int(self.deadline.remaining() * 1000))}")
+    
+    def _create_staging(self, dataframe):
+        self.columns = list(dataframe.columns)
+        self.column_types = {column: _postgres_type(dataframe[column]) for column in self.columns}
+        self.column_definitions = _column_definitions(self.column_types)
+        self.cursor.execute(f"DROP TABLE IF EXISTS {self.staging_table}")
+        self.cursor.execute(f"CREATE TABLE {self.staging_table} ({self.column_definitions})")
+    
+    def copy(self, dataframe):
+        """
+        Mengirim baris DataFrame ke tabel staging dalam batch COPY_BATCH_ROWS baris.
+        
+        Args:
+            dataframe (DataFrame): Data dengan kolom yang sama seperti chunk pertama
+        """
+        if self.columns is None:
+            self._create_staging(dataframe)
+        
+        if list(dataframe.columns) != self.columns:
+            dataframe = dataframe[self.columns]
+        
+        columns = ", ".join(_quote_identifier(column) for column in self.columns)
+        for start in range(0, len(dataframe), COPY_BATCH_ROWS):
+            buffer, null = _csv_payload(dataframe.iloc[start:start + COPY_BATCH_ROWS])
+            sql = f"COPY {self.staging_table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{null}')"
+            self.cursor.copy_expert(sql, buffer)
+        
+        self.rows += len(dataframe)
+    
+    def commit(self):
+        """
+        Menukar tabel staging menjadi tabel tujuan dan meng-commit transaksi.
+        """
+        target = _quote_identifier(self.table_name)
+        self.cursor.execute(f"DROP TABLE IF EXISTS {target}")
+        self.cursor.execute(f"ALTER TABLE {self.staging_table} RENAME TO {target}")
+        self._begin_commit()
+        self.connection.commit()
+        self._close()
+        logger.info(f"{self.rows} baris dimuat ke tabel {self.table_name} lewat COPY")
+    
+    def _begin_commit(self):
+        # Setelah batas waktu sink lewat, load_to_sinks sudah melaporkan gagal: commit tidak boleh terjadi
+        if self.deadline is not None:
+            self.deadline.begin_commit()
+    
+    def rollback(self):
+        """
+        Membatalkan load; tabel tujuan tetap seperti sebelumnya.
+        """
+        try:
+            self.connection.rollback()
+        finally:
+            self._close()
+    
+    def _close(self):
+        self.cursor.close()
+        self.connection.close()
+
+def product_fingerprints(dataframe, key_columns=KEY_COLUMNS):
+    """
+    Menghitung kunci produk dan hash isi (64-bit) untuk setiap baris.
+    
+    Kunci dibentuk dari key_columns; hash isi dari kolom lainnya kecuali
+    timestamp, sehingga produk yang hanya di-scrape ulang tidak dianggap berubah.
+    Hash dihitung vektor dengan pd.util.hash_pandas_object dan hash_key tetap,
+    jadi nilainya sama antar proses dan tidak bergantung urutan kolom isi.
+    
+    Args:
+        dataframe (DataFrame): Data yang sudah ditransformasi
+        key_columns (tuple): Kolom identitas produk
+    
+    Returns:
+        tuple: (Series product_key, Series content_hash) bertipe int64
+    
+    Raises:
+        ValueError: Jika kolom kunci tidak ada di DataFrame
+    """
+    missing = [column for column in key_columns if column not in dataframe.columns]
+    if missing:
+        raise ValueError(f"Kolom kunci produk tidak ditemukan: {', '.join(missing)}")
+    
+    content_columns = sorted(column for column in dataframe.columns
+                             if column not in key_columns and column not in FINGERPRINT_EXCLUDED_COLUMNS)
+    
+    def digest(columns):
+        # Float dari skema ringkas (float32) di-hash sebagai float64 agar hash sama dengan skema biasa
+        frame = dataframe[list(columns)]
+        narrow_floats = [column for column in columns if frame[column].dtype == np.float32]
+        if narrow_floats:
+            frame = frame.astype({column: 'float64' for column in narrow_floats})
+        hashes = pd.util.hash_pandas_object(frame, index=False, hash_key=FINGERPRINT_HASH_KEY)
+        # uint64 disimpan sebagai BIGINT PostgreSQL
+        return pd.Series(hashes.to_numpy().view('int64'), index=dataframe.index)
+    
+    return digest(key_columns), digest(content_columns)
+
+# Hasil mode incremental
+UpsertResult = namedtuple('UpsertResult', ['inserted', 'updated', 'unchanged', 'deleted'])
+
+class IncrementalUpsert(StagingCopy):
+    """
+    Load incremental: hanya produk baru atau berubah yang di-upsert berdasarkan kunci produk.
+    
+    Kunci dan hash isi yang sudah ada dibaca sekali dari tabel tujuan. Baris yang
+    hash isinya sama dilewati sebelum COPY; sisanya di-COPY ke tabel sementara lalu
+    ditulis dengan INSERT ... ON CONFLICT, sehingga volume tulis sebanding dengan
+    perubahan katalog. Produk yang tidak lagi muncul dapat ditandai lewat kolom
+    deleted_at. Jika tabel tujuan belum memiliki kolom product_key (misal dibuat
+    oleh mode replace), tabel dibuat ulang dalam transaksi yang sama.
+    
+    Args:
+        engine (Engine): Engine SQLAlchemy dengan driver psycopg2
+        table_name (str): Tabel tujuan
+        key_columns (tuple): Kolom identitas produk
+        soft_delete (bool): Isi deleted_at untuk produk yang tidak ada di data baru
+    """
+    
+    def __init__(self, engine, table_name=TABLE_NAME, key_columns=KEY_COLUMNS, soft_delete=False):
+        super().__init__(engine, table_name)
+        self.key_columns = key_columns
+        self.soft_delete = soft_delete
+        self.staging_name = f"{table_name}_incoming"
+        self.staging_table = f"pg_temp.{_quote_identifier(self.staging_name)}"
+        self.target = _quote_identifier(table_name)
+        self.existing_keys = None
+        self.existing_hashes = None
+        self.incoming_keys = []
+        self.staged_keys = set()
+    
+    def _create_staging(self, dataframe):
+        self.columns = list(dataframe.columns)
+        self.column_types = {column: _postgres_type(dataframe[column]) for column in self.columns}
+        self.column_definitions = _column_definitions(self.column_types)
+        # _row menyimpan urutan baris agar duplikat kunci memakai baris terakhir
+        self.cursor.execute(f"DROP TABLE IF EXISTS {self.staging_table}")
+        self.cursor.execute(
+            f"CREATE TEMPORARY TABLE {self.staging_table} ({self.column_definitions}, \"_row\" BIGSERIAL) ON COMMIT DROP"
+        )
+        self._prepare_target()
+    
+    def _prepare_target(self):
+        self.cursor.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_schema = current_schema() AND table_name = %s",
+            (self.table_name,)
+        )
+        existing_columns = {row[0] for row in self.cursor.fetchall()}
+        if existing_columns and 'product_key' not in existing_columns:
+            logger.warning(f"Tabel {self.table_name} belum memiliki product_key, tabel dibuat ulang")
+            self.cursor.execute(f"DROP TABLE {self.target}")
+        
+        column_definitions = _column_definitions(dict(self.column_types, product_key="BIGINT PRIMARY KEY"))
+        self.cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.target} ({column_definitions}, \"deleted_at\" TIMESTAMP WITH TIME ZONE)"
+        )
+        
+        # Produk yang ditandai terhapus tidak dimuat, sehingga dianggap baru dan dipulihkan
+        self.cursor.execute(f"SELECT product_key, content_hash FROM {self.target} WHERE deleted_at IS NULL")
+        rows = self.cursor.fetchall()
+        self.existing_keys = pd.Index([row[0] for row in rows], dtype='int64')
+        self.existing_hashes = pd.array([row[1] for row in rows], dtype='Int64').to_numpy(dtype='int64', na_value=0)
+    
+    def copy(self, dataframe):
+        """
+        Mengirim baris baru atau berubah ke tabel sementara.
+        
+        Args:
+            dataframe (DataFrame): Data dengan kolom yang sama seperti chunk pertama
+        """
+        product_key, content_hash = product_fingerprints(dataframe, self.key_columns)
+        dataframe = dataframe.assign(product_key=product_key, content_hash=content_hash)
+        if self.columns is None:
+            self._create_staging(dataframe)
+        
+        keys = product_key.to_numpy()
+        self.incoming_keys.append(keys)
+        
+        # Baris dikirim jika kuncinya baru, isinya berubah, atau kuncinya sudah pernah dikirim
+        # (agar baris terakhir untuk kunci yang sama tetap menang)
+        positions = self.existing_keys.get_indexer(keys)
+        known = positions >= 0
+        changed = ~known
+        changed[known] = self.existing_hashes[positions[known]] != content_hash.to_numpy()[known]
+        if self.staged_keys:
+            changed |= np.isin(keys, np.fromiter(self.staged_keys, dtype='int64'))
+        
+        staged = dataframe[changed]
+        if not staged.empty:
+            self.staged_keys.update(staged['product_key'].tolist())
+            super().copy(staged)
+        self.rows += len(dataframe) - len(staged)
+    
+    def commit(self):
+        """
+        Meng-upsert baris baru/berubah, menandai produk yang hilang (opsional), lalu commit.
+        
+        Returns:
+            UpsertResult: Jumlah produk inserted, updated, unchanged, dan deleted
+        """
+        incoming = np.unique(np.concatenate(self.incoming_keys)) if self.incoming_keys else np.array([], dtype='int64')
+        
+        inserted = updated = 0
+        if self.staged_keys:
+            columns = ", ".join(_quote_identifier(column) for column in self.columns)
+            updates = ", ".join(
+                f"{_quote_identifier(column)} = EXCLUDED.{_quote_identifier(column)}"
+                for column in self.columns if column != 'product_key'
+            )
+            self.cursor.execute(f"""
+                WITH upserted AS (
+                    INSERT INTO {self.target} ({columns})
+                    SELECT DISTINCT ON (product_key) {columns}
+                    FROM {self.staging_table}
+                    ORDER BY product_key, "_row" DESC
+                    ON CONFLICT (product_key) DO UPDATE SET {updates}, deleted_at = NULL
+                    WHERE {self.target}.content_hash <> EXCLUDED.content_hash OR {self.target}.deleted_at IS NOT NULL
+                    RETURNING (xmax = 0) AS inserted
+                )
+                SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted
+            """)
+            inserted, updated = self.cursor.fetchone()
+        
+        deleted = 0
+        if self.soft_delete:
+            missing = self.existing_keys[~self.existing_keys.isin(incoming)]
+            if len(missing):
+                self.cursor.execute(
+                    f"UPDATE {self.target} SET deleted_at = now() WHERE deleted_at IS NULL AND product_key = ANY(%s)",
+                    (missing.tolist(),)
+                )
+                deleted = self.cursor.rowcount
+        
+        self._begin_commit()
+        self.connection.commit()
+        self._close()
+        
+        result = UpsertResult(inserted, updated, len(incoming) - inserted - updated, deleted)
+        logger.info(f"Load incremental ke tabel {self.table_name}: {result.inserted} baru, {result.updated} berubah, "
+                    f"{result.unchanged} tetap, {result.deleted} dihapus")
+        return result
+
+def _postgres_loader(engine, mode, soft_delete):
+    """
+    Membuat loader COPY sesuai mode ('replace' atau 'incremental').
+    """
+    if mode == 'incremental':
+        return IncrementalUpsert(engine, TABLE_NAME, soft_delete=soft_delete)
+    return StagingCopy(engine, TABLE_NAME)
+
+def _check_load_mode(mode, engine):
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Mode load '{mode}' tidak dikenal. Pilihan: {', '.join(LOAD_MODES)}")
+    if mode == 'incremental' and engine.dialect.name != 'postgresql':
+        raise ValueError("Mode load 'incremental' hanya didukung untuk PostgreSQL")
+
+def save_to_postgres(dataframe, db_config=None, mode='replace', soft_delete=False):
+
+    if dataframe.empty:
+        raise ValueError("DataFrame kosong, tidak ada data yang dapat disimpan")
+    
+    try:
+        # Ambil engine (dan pool koneksinya) dari registry
+        engine = get_engine(db_config)
+        
+        _check_load_mode(mode, engine)
+        
+        # Simpan DataFrame ke database
+        table_name = TABLE_NAME
+        if engine.dialect.name == 'postgresql':
+            load = _postgres_loader(engine, mode, soft_delete)
+            try:
+                load.copy(dataframe)
+                result = load.commit()
+            except Exception:
+                load.rollback()
+                raise
+        else:
+            # Database lain (misal SQLite untuk benchmark) tidak mendukung COPY
+            dataframe.to_sql(table_name, engine, if_exists='replace', index=False)
+            result = None
+        
+        logger.info(f"Data berhasil disimpan ke tabel {table_name}")
+        return result if mode == 'incremental' else True
+    
+    except SQLAlchemyError as e:
+        logger.error(f"Gagal menyimpan data ke PostgreSQL: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Terjadi kesalahan saat menyimpan ke PostgreSQL: {str(e)}")
+        raise
+
+class PostgresChunkWriter(ChunkWriter):
+    """
+    Menulis chunk ke tabel database lewat satu engine SQLAlchemy.
+    """
+    name = 'PostgreSQL'
+    
+    def __init__(self, db_config=None, mode='replace', soft_delete=False):
+        super().__init__()
+        self.engine = get_engine(db_config)
+        _check_load_mode(mode, self.engine)
+        self.mode = mode
+        self.soft_delete = soft_delete
+        self.load = None
+    
+    def _write(self, dataframe, first):
+        if self.engine.dialect.name != 'postgresql':
+            dataframe.to_sql(TABLE_NAME, self.engine, if_exists='replace' if first else 'append', index=False)
+            return
+        
+        # Semua chunk masuk ke satu tabel staging yang ditukar/di-upsert saat close()
+        if self.load is None:
+            self.load = _postgres_loader(self.engine, self.mode, self.soft_delete)
+        self.load.copy(dataframe)
+    
+    def abort(self):
+        if self.load is not None:
+            try:
+                self.load.rollback()
+            except Exception as e:
+                logger.warning(f"Gagal membatalkan transaksi load: {str(e)}")
+            self.load = None
+    
+    def _finish(self):
+        result = None
+        if self.load is not None:
+            try:
+                result = self.load.commit()
+            except Exception:
+                self.abort()
+                raise
+        logger.info(f"Data berhasil disimpan ke tabel {TABLE_NAME}")
+        return result if self.mode == 'incremental' else True
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Module untuk mengukur waktu, throughput, dan memori setiap tahap pipeline ETL.
+
+Pengukuran hanya aktif setelah start_run() dipanggil. Tanpa run aktif,
+span() dan timed() langsung menjalankan kode yang dibungkus sehingga
+instrumentasi di extract/transform/load hampir tidak menambah biaya.
+"""
+import functools
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # resource tidak tersedia di Windows, peak RSS tidak dicatat
+    resource = None
+
+# Konfigurasi logging
+logger = logging.getLogger(__name__)
+
+# Jumlah baris alokasi terbesar yang disimpan pada setiap snapshot tracemalloc
+TRACEMALLOC_TOP = 10
+# Jumlah frame traceback yang direkam tracemalloc per alokasi
+TRACEMALLOC_FRAMES = 1
+
+# Awalan nama metrik Prometheus
+PROMETHEUS_PREFIX = 'etl'
+
+# Run yang sedang diukur (None = instrumentasi nonaktif)
+_active = None
+
+def peak_rss_bytes():
+    """
+    Mengembalikan peak resident set size proses ini dalam byte, atau None jika tidak tersedia.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KiB, macOS melaporkan byte
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def _length(value):
+    # Jumlah baris dari hasil fungsi: DataFrame, Series, atau list
+    if isinstance(value, list) or hasattr(value, 'shape'):
+        return len(value)
+    return None
+
+class _Span:
+    """
+    Satu pengukuran waktu; rows dan bytes dapat diisi di dalam blok with.
+    """
+    
+    def __init__(self, metrics, name, rows=None, bytes=None):
+        self.metrics = metrics
+        self.name = name
+        self.rows = rows
+        self.bytes = bytes
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.name, time.perf_counter() - self.start, self.rows, self.bytes,
+                            error=exc_type is not None)
+        return False
+
+class _NullSpan:
+    """
+    Span kosong yang dipakai saat tidak ada run aktif.
+    """
+    rows = None
+    bytes = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class RunMetrics:
+    """
+    Kumpulan metrik satu run pipeline.
+    
+    Span dengan nama yang sama digabung: jumlah panggilan, total/min/max
+    waktu, baris, byte, dan error. Counter menyimpan angka bebas seperti byte
+    yang diambil dari website. Snapshot memori mencatat peak RSS dan, jika
+    trace_memory aktif, alokasi terbesar menurut tracemalloc. Aman dipakai
+    dari banyak thread.
+    """
+    
+    def __init__(self, trace_memory=False, top_allocations=TRACEMALLOC_TOP):
+        self.trace_memory = trace_memory
+        self.top_allocations = top_allocations
+        self.started = datetime.now()
+        self.finished = None
+        self._start = time.perf_counter()
+        self._seconds = None
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._counters = {}
+        self._snapshots = []
+        
+        # tracemalloc hanya dihentikan lagi jika run ini yang memulainya
+        self._owns_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+    
+    def span(self, name, rows=None, bytes=None):
+        """
+        Membuat context manager yang mengukur waktu blok kode.
+        
+        Args:
+            name (str): Nama span, misalnya 'extract.scrape_page'
+            rows (int): Jumlah baris yang diproses (dapat diisi belakangan lewat span.rows)
+            bytes (int): Jumlah byte yang diproses (dapat diisi belakangan lewat span.bytes)
+        
+        Returns:
+            _Span: Context manager span
+        """
+        return _Span(self, name, rows, bytes)
+    
+    def record(self, name, seconds, rows=None, bytes=None, error=False):
+        """
+        Menambahkan satu pengukuran ke span bernama name.
+        """
+        with self._lock:
+            entry = self._spans.get(name)
+            if entry is None:
+                entry = self._spans[name] = {
+                    'count': 0, 'seconds': 0.0, 'min_seconds': seconds, 'max_seconds': seconds,
+                    'rows': 0, 'bytes': 0, 'errors': 0
+                }
+            entry['count'] += 1
+            entry['seconds'] += seconds
+            entry['min_seconds'] = min(entry['min_seconds'], seconds)
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+            entry['rows'] += rows or 0
+            entry['bytes'] += bytes or 0
+            entry['errors'] += int(error)
+    
+    def increment(self, name, value=1):
+        """
+        Menambah counter bernama name sebesar value.
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+    
+    def snapshot(self, label):
+        """
+        Mencatat penggunaan memori saat ini, misalnya setelah satu tahap selesai.
+        
+        Args:
+            label (str): Nama snapshot, misalnya 'extract'
+        
+        Returns:
+            dict: Peak RSS, memori tracemalloc saat ini/puncak, dan alokasi terbesar
+        """
+        snapshot = {'label': label, 'peak_rss_bytes': peak_rss_bytes()}
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            statistics = tracemalloc.take_snapshot().statistics('lineno')[:self.top_allocations]
+            snapshot.update({
+                'traced_bytes': current,
+                'traced_peak_bytes': peak,
+                'top_allocations': [
+                    {'location': str(stat.traceback), 'size_bytes': stat.size, 'count': stat.count}
+                    for stat in statistics
+                ]
+            })
+        with self._lock:
+            self._snapshots.append(snapshot)
+        return snapshot
+    
+    def close(self):
+        """
+        Menutup run: mencatat waktu selesai dan menghentikan tracemalloc yang dimulai run ini.
+        """
+        if self.finished is None:
+            self.finished = datetime.now()
+            self._seconds = time.perf_counter() - self._start
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+    
+    def report(self):
+        """
+        Membentuk laporan run yang dapat ditulis sebagai JSON.
+        
+        Returns:
+            dict: Waktu run, peak RSS, span (dengan rows/detik dan byte/detik), counter, dan snapshot memori
+        """
+        seconds = self._seconds if self._seconds is not None else time.perf_counter() - self._start
+        with self._lock:
+            spans = {name: dict(entry) for name, entry in self._spans.items()}
+            counters = dict(self._counters)
+            snapshots = list(self._snapshots)
+        
+        for entry in spans.values():
+            elapsed = entry['seconds']
+            entry['rows_per_sec'] = round(entry['rows'] / elapsed, 1) if elapsed and entry['rows'] else None
+            entry['bytes_per_sec'] = round(entry['bytes'] / elapsed, 1) if elapsed and entry['bytes'] else None
+        
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'finished': self.finished.isoformat(timespec='seconds') if self.finished else None,
+            'seconds': round(seconds, 6),
+            'pid': os.getpid(),
+            'peak_rss_bytes': peak_rss_bytes(),
+            'spans': spans,
+            'counters': counters,
+            'memory_snapshots': snapshots
+        }
+    
+    def write_json(self, path):
+        """
+        Menulis laporan run sebagai JSON secara atomik.
+        
+        Args:
+            path (str): Lokasi file laporan
+        
+        Returns:
+            str: Lokasi file laporan
+        """
+        _write_atomic(path, json.dumps(self.report(), indent=2, default=str))
+        return path
+    
+    def prometheus_text(self):
+        """
+        Membentuk metrik dalam format teks Prometheus (exposition format 0.0.4).
+        """
+        report = self.report()
+        lines = []
+        
+        def metric(name, kind, help_text, samples):
+            full_name = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(label)}"' for key, label in labels.items())
+                lines.append(f"{full_name}{{{label_text}}} {value}" if label_text else f"{full_name} {value}")
+        
+        spans = sorted(report['spans'].items())
+        metric('run_seconds', 'gauge', 'Wall time of the last pipeline run.', [({}, report['seconds'])])
+        metric('run_finished_timestamp_seconds', 'gauge', 'Unix time the last pipeline run finished.',
+               [({}, round(time.time(), 3))])
+        if report['peak_rss_bytes'] is not None:
+            metric('peak_rss_bytes', 'gauge', 'Peak resident set size of the pipeline process.',
+                   [({}, report['peak_rss_bytes'])])
+        metric('span_seconds_total', 'counter', 'Total wall time spent in a pipeline span.',
+               [({'span': name}, round(entry['seconds'], 6)) for name, entry in spans])
+        metric('span_calls_total', 'counter', 'Number of times a pipeline span ran.',
+               [({'span': name}, entry['count']) for name, entry in spans])
+        metric('span_rows_total', 'counter', 'Rows processed by a pipeline span.',
+               [({'span': name}, entry['rows']) for name, entry in spans])
+        metric('span_errors_total', 'counter', 'Pipeline span runs that raised an exception.',
+               [({'span': name}, entry['errors']) for name, entry in spans])
+        for name, value in sorted(report['counters'].items()):
+            metric(f"{_metric_name(name)}_total", 'counter', f"Pipeline counter {name}.", [({}, value)])
+        
+        traced = [snapshot for snapshot in report['memory_snapshots'] if 'traced_peak_bytes' in snapshot]
+        if traced:
+            metric('tracemalloc_peak_bytes', 'gauge', 'Peak memory traced by tracemalloc up to a pipeline stage.',
+                   [({'stage': snapshot['label']}, snapshot['traced_peak_bytes']) for snapshot in traced])
+        return '\n'.join(lines) + '\n'
+    
+    def write_prometheus(self, path):
+        """
+        Menulis metrik format Prometheus secara atomik, misalnya untuk textfile collector node_exporter.
+        
+        Args:
+            path (str): Lokasi file .prom
+        
+        Returns:
+            str: Lokasi file .prom
+        """
+        _write_atomic(path, self.prometheus_text())
+        return path
+    
+    def log_summary(self):
+        """
+        Mencatat waktu dan throughput setiap span ke log, diurutkan dari yang paling lama.
+        """
+        report = self.report()
+        for name, entry in sorted(report['spans'].items(), key=lambda item: -item[1]['seconds']):
+            throughput = f", {entry['rows_per_sec']:.0f} baris/detik" if entry['rows_per_sec'] else ""
+            logger.info(f"Span {name}: {entry['count']}x, {entry['seconds']:.3f} detik{throughput}")
+        if report['peak_rss_bytes'] is not None:
+            logger.info(f"Peak RSS: {report['peak_rss_bytes'] / 1e6:.1f} MB")
+        return report
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _metric_name(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def start_run(trace_memory=False, top_allocations=TRACEMALLOC_TOP):
+    """
+    Memulai pengukuran run baru dan menjadikannya run aktif.
+    
+    Args:
+        trace_memory (bool): Aktifkan tracemalloc (memperlambat alokasi Python)
+        top_allocations (int): Jumlah alokasi terbesar per snapshot
+    
+    Returns:
+        RunMetrics: Metrik run yang baru
+    """
+    global _active
+    finish_run()
+    _active = RunMetrics(trace_memory, top_allocations)
+    return _active
+
+def finish_run():
+    """
+    Menutup run aktif dan menonaktifkan instrumentasi.
+    
+    Returns:
+        RunMetrics: Metrik run yang ditutup, atau None jika tidak ada run aktif
+    """
+    global _active
+    metrics, _active = _active, None
+    if metrics is not None:
+        metrics.close()
+    return metrics
+
+def current():
+    """
+    Mengembalikan run aktif, atau None jika instrumentasi nonaktif.
+    """
+    return _active
+
+def span(name, rows=None, bytes=None):
+    """
+    Mengukur blok kode pada run aktif; tanpa run aktif tidak mencatat apa pun.
+    
+    Args:
+        name (str): Nama span
+        rows (int): Jumlah baris yang diproses
+        bytes (int): Jumlah byte yang diproses
+    
+    Returns:
+        Context manager span
+    """
+    metrics = _active
+    if metrics is None:
+        return _NULL_SPAN
+    return metrics.span(name, rows, bytes)
+
+def increment(name, value=1):
+    """
+    Menambah counter pada run aktif; tanpa run aktif tidak mencatat apa pun.
+    """
+    metrics = _active
+    if metrics is not None:
+        metrics.increment(name, value)
+
+def snapshot(label):
+    """
+    Mencatat snapshot memori pada run aktif; tanpa run aktif mengembalikan None.
+    """
+    metrics = _active
+    if metrics is not None:
+        return metrics.snapshot(label)
+    return None
+
+def timed(name):
+    """
+    Decorator yang mengukur setiap panggilan fungsi sebagai span bernama name.
+    
+    Jumlah baris diambil dari panjang hasil fungsi jika berupa DataFrame, Series, atau list.
+    
+    Args:
+        name (str): Nama span
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _active
+            if metrics is None:
+                return func(*args, **kwargs)
+            with metrics.span(name) as measured:
+                result = func(*args, **kwargs)
+                measured.rows = _length(result)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Module parser HTML untuk kartu produk website fashion studio.
+
+Tersedia dua backend dengan hasil yang sama:
+- 'bs4'  : BeautifulSoup + html.parser (implementasi referensi)
+- 'lxml' : lxml (berbasis C) dengan selector XPath yang dikompilasi sekali;
+           halaman dengan markup rusak di-parse ulang dengan bs4
+"""
+import logging
+import re
+import threading
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml opsional, backend bs4 tetap tersedia
+    lxml = None
+    etree = None
+
+# Konfigurasi logging
+logger = logging.getLogger(__name__)
+
+# Tag yang dibaca parser kartu; jumlah tag pembuka dan penutup yang berbeda berarti ada
+# elemen tanpa penutup (atau penutup liar), yang dipulihkan lxml dan html.parser secara berbeda
+CHECKED_TAGS = re.compile(r'<(/?)(p|h[1-6]|div|span)[\s>]', re.IGNORECASE)
+
+def _classify_paragraphs(texts, product):
+    """
+    Mengisi Rating, Colors, Size, dan Gender dari teks paragraf sebuah kartu.
+    
+    Args:
+        texts (iterable): Teks setiap elemen <p> (sudah di-strip)
+        product (dict): Dictionary produk yang akan diisi
+    """
+    # Default values
+    product['Rating'] = "Invalid Rating"
+    product['Colors'] = "Colors Unavailable"
+    product['Size'] = "Size Unavailable"
+    product['Gender'] = "Gender Unavailable"
+    
+    for text in texts:
+        # Ekstrak rating
+        if "Rating:" in text or ("/" in text and "★" in text):
+            product['Rating'] = text
+        
+        # Ekstrak colors
+        elif "Colors" in text:
+            product['Colors'] = text
+        
+        # Ekstrak size
+        elif text.startswith("Size:") or "Size" in text:
+            product['Size'] = text
+        
+        # Ekstrak gender
+        elif text.startswith("Gender:") or "Gender" in text or "Men" in text or "Women" in text or "Unisex" in text:
+            product['Gender'] = text
+
+class BeautifulSoupParser:
+    """
+    Backend parser berbasis BeautifulSoup (html.parser).
+    """
+    name = 'bs4'
+    
+    def __init__(self):
+        # bs4 baru diimpor saat backend ini dipakai; backend default lxml tidak membutuhkannya
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+    
+    def parse_cards(self, html):
+        """
+        Mengekstrak data produk dari setiap elemen .collection-card.
+        
+        Args:
+            html (str | bytes): Isi HTML halaman
+        
+        Returns:
+            list: Daftar dictionary produk (tanpa timestamp)
+        """
+        soup = self._soup(html, 'html.parser')
+        
+        # Selector untuk produk-produk di halaman
+        product_cards = soup.select('.collection-card')
+        
+        # Debug info
+        logger.debug("Jumlah produk ditemukan: %d", len(product_cards))
+        
+        products = []
+        for card in product_cards:
+            try:
+                products.append(self._parse_card(card))
+            except Exception as e:
+                logger.warning(f"Gagal mengekstrak produk: {str(e)}")
+                continue
+        
+        return products
+    
+    def _parse_card(self, card):
+        # Inisialisasi dictionary untuk menyimpan data produk
+        product = {}
+        
+        # Ekstrak judul produk
+        product_details = card.select_one('.product-details')
+        title_element = card.select_one('.product-title') or (product_details.select_one('h3') if product_details else None)
+        
+        if title_element:
+            product['Title'] = title_element.text.strip()
+        else:
+            # Jika tidak menemukan dengan selector di atas, coba selector lain
+            title_element = card.select_one('h3')
+            if title_element:
+                product['Title'] = title_element.text.strip()
+            else:
+                product['Title'] = "Unknown Product"
+        
+        # Ekstrak harga produk
+        price_container = card.select_one('.price-container')
+        price_element = price_container.select_one('.price') if price_container else None
+        
+        if not price_element:
+            price_element = card.select_one('.price') or card.select_one('span.price')
+        
+        if price_element:
+            product['Price'] = price_element.text.strip()
+        else:
+            product['Price'] = "Price Unavailable"
+        
+        # Ekstrak rating, colors, size, dan gender dari paragraf
+        # Berdasarkan screenshot, data ini ada di elemen <p> dengan style inline
+        _classify_paragraphs((p.text.strip() for p in card.select('p')), product)
+        
+        return product
+
+def _has_class(name):
+    # Padanan XPath untuk selector CSS ".name"
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+class LxmlParser:
+    """
+    Backend parser berbasis lxml dengan selector XPath yang sudah dikompilasi.
+    
+    Urutan pencarian elemen sama dengan BeautifulSoupParser, sehingga untuk
+    markup yang valid dictionary produknya identik. Untuk markup rusak kedua
+    parser membangun pohon yang berbeda: lxml menutup <p> secara implisit di
+    <p> atau elemen blok berikutnya, sedangkan html.parser menyarangkannya,
+    sehingga Rating/Colors/Size/Gender bisa berisi teks paragraf lain. Halaman
+    yang terdeteksi rusak (lxml melaporkan error, atau tag p/h1-h6/div/span
+    yang tidak seimbang) karena itu di-parse ulang dengan BeautifulSoupParser
+    agar hasilnya tetap sama dengan implementasi referensi.
+    """
+    name = 'lxml'
+    
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("Paket lxml diperlukan untuk parser 'lxml'")
+        self._cards = etree.XPath(f"//*[{_has_class('collection-card')}]")
+        self._details = etree.XPath(f"(.//*[{_has_class('product-details')}])[1]")
+        self._title = etree.XPath(f"(.//*[{_has_class('product-title')}])[1]")
+        self._h3 = etree.XPath("(.//h3)[1]")
+        self._price_container = etree.XPath(f"(.//*[{_has_class('price-container')}])[1]")
+        self._price = etree.XPath(f"(.//*[{_has_class('price')}])[1]")
+        self._paragraphs = etree.XPath(".//p")
+        # Parser lxml menyimpan error log per dokumen, jadi setiap thread memakai parsernya sendiri
+        self._local = threading.local()
+    
+    def _html_parser(self):
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            parser = self._local.parser = lxml.html.HTMLParser()
+        return parser
+    
+    @staticmethod
+    def _malformed(html, parser):
+        """
+        Mengecek apakah halaman berisi markup rusak yang membuat pohon lxml berbeda dari html.parser.
+        """
+        if len(parser.error_log):
+            return True
+        text = html if isinstance(html, str) else html.decode('utf-8', 'replace')
+        balance = {}
+        for closing, tag in CHECKED_TAGS.findall(text):
+            tag = tag.lower()
+            balance[tag] = balance.get(tag, 0) + (-1 if closing else 1)
+        return any(balance.values())
+    
+    @staticmethod
+    def _first(selector, element):
+        found = selector(element)
+        return found[0] if found else None
+    
+    def parse_cards(self, html):
+        """
+        Mengekstrak data produk dari setiap elemen .collection-card.
+        
+        Args:
+            html (str | bytes): Isi HTML halaman
+        
+        Returns:
+            list: Daftar dictionary produk (tanpa timestamp)
+        """
+        if not html or not html.strip():
+            product_cards = []
+        else:
+            parser = self._html_parser()
+            document = lxml.html.document_fromstring(html, parser=parser)
+            if self._malformed(html, parser):
+                logger.debug("Markup halaman rusak, parsing diulang dengan bs4")
+                return get_parser(BeautifulSoupParser.name).parse_cards(html)
+            product_cards = self._cards(document)
+        
+        # Debug info
+        logger.debug("Jumlah produk ditemukan: %d", len(product_cards))
+        
+        products = []
+        for card in product_cards:
+            try:
+                products.append(self._parse_card(card))
+            except Exception as e:
+                logger.warning(f"Gagal mengekstrak produk: {str(e)}")
+                continue
+        
+        return products
+    
+    def _parse_card(self, card):
+        product = {}
+        
+        # Ekstrak judul produk
+        title_element = self._first(self._title, card)
+        if title_element is None:
+            product_details = self._first(self._details, card)
+            if product_details is not None:
+                title_element = self._first(self._h3, product_details)
+        if title_element is None:
+            title_element = self._first(self._h3, card)
+        
+        product['Title'] = title_element.text_content().strip() if title_element is not None else "Unknown Product"
+        
+        # Ekstrak harga produk
+        price_element = None
+        price_container = self._first(self._price_container, card)
+        if price_container is not None:
+            price_element = self._first(self._price, price_container)
+        if price_element is None:
+            price_element = self._first(self._price, card)
+        
+        product['Price'] = price_element.text_content().strip() if price_element is not None else "Price Unavailable"
+        
+        # Ekstrak rating, colors, size, dan gender dari paragraf
+        _classify_paragraphs((p.text_content().strip() for p in self._paragraphs(card)), product)
+        
+        return product
+
+# Backend parser yang tersedia
+PARSERS = {
+    BeautifulSoupParser.name: BeautifulSoupParser,
+    LxmlParser.name: LxmlParser
+}
+DEFAULT_PARSER = LxmlParser.name if lxml is not None else BeautifulSoupParser.name
+
+_parser_instances = {}
+
+def get_parser(name=None):
+    """
+    Mengembalikan instance backend parser (selector hanya dikompilasi sekali per proses).
+    
+    Args:
+        name (str): Nama backend ('bs4' atau 'lxml'); None = DEFAULT_PARSER
+    
+    Returns:
+        object: Parser dengan method parse_cards(html)
+    
+    Raises:
+        ValueError: Jika nama backend tidak dikenal
+    """
+    name = name or DEFAULT_PARSER
+    if name not in PARSERS:
+        raise ValueError(f"Parser '{name}' tidak dikenal. Pilihan: {', '.join(sorted(PARSERS))}")
+    
+    parser = _parser_instances.get(name)
+    if parser is None:
+        parser = _parser_instances[name] = PARSERS[name]()
+    return parser
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Module profiling opsional untuk tahap-tahap pipeline ETL.
+
+Dua mode tersedia:
+- 'cprofile' : cProfile per tahap, ditulis sebagai <tahap>.pstats
+- 'sample'   : sampling stack semua thread secara berkala (overhead rendah),
+               ditulis sebagai <tahap>.collapsed untuk flamegraph.pl/speedscope
+
+cProfile hanya mengukur thread yang mengaktifkannya (Python < 3.12), dan
+sejak Python 3.12 hanya satu profiler yang boleh aktif dalam satu proses
+("Another profiling tool is already active"). Karena itu pada mode
+'cprofile' tahap yang bekerja di banyak thread (threaded=True, misalnya
+extract dengan worker pool dan sink yang disimpan paralel) selalu
+di-sampling, dan tahap lain yang masuk saat profiler sudah dipakai thread
+lain juga jatuh ke sampling. Hasilnya ditulis sebagai <tahap>.collapsed.
+
+Profiling hanya aktif setelah start_profiling() dipanggil; tanpa itu,
+profile() tidak melakukan apa pun selain satu pengecekan variabel global.
+"""
+import cProfile
+import collections
+import contextlib
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+from datetime import datetime
+
+# Konfigurasi logging
+logger = logging.getLogger(__name__)
+
+# Mode profiling yang didukung
+PROFILE_MODES = ('cprofile', 'sample')
+
+# Folder induk untuk folder hasil profiling setiap run
+PROFILE_DIR = os.getenv('ETL_PROFILE_DIR', os.path.join('.cache', 'profiles'))
+
+# Jeda antar sampel stack pada mode 'sample' (detik)
+SAMPLE_INTERVAL = 0.005
+
+# Sesi profiling yang sedang aktif (None = profiling nonaktif)
+_session = None
+
+def _stage_filename(stage):
+    return re.sub(r'[^\w.-]+', '_', stage)
+
+def _frame_label(code, cache):
+    label = cache.get(code)
+    if label is None:
+        label = cache[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+class ProfileSession:
+    """
+    Sesi profiling untuk satu run pipeline.
+    
+    Setiap tahap yang dipilih diukur saat kode masuk ke profile(tahap).
+    Tahap bersarang di thread yang sama diukur secara eksklusif: tahap luar
+    dijeda selama tahap dalam berjalan. Pada mode 'cprofile' satu cProfile
+    dipakai bergantian oleh satu thread pada satu waktu dan hanya mengukur
+    thread tersebut; tahap threaded dan tahap yang tidak mendapat profiler
+    di-sampling. Thread yang tidak sedang berada di tahap mana pun
+    (misalnya worker pool scraping) dihitung untuk semua tahap yang sedang
+    di-sampling.
+    
+    Args:
+        stages (iterable): Nama tahap yang diprofiling; 'all' = semua tahap, 'load' = semua 'load.<sink>'
+        mode (str): 'cprofile' atau 'sample'
+        output_dir (str): Folder induk; hasil ditulis ke subfolder <waktu>-<pid>
+        interval (float): Jeda antar sampel pada mode 'sample' (detik)
+    """
+    
+    def __init__(self, stages, mode='cprofile', output_dir=PROFILE_DIR, interval=SAMPLE_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Mode profiling '{mode}' tidak dikenal. Pilihan: {', '.join(PROFILE_MODES)}")
+        self.stages = {stage.strip() for stage in stages if stage.strip()}
+        self.mode = mode
+        self.interval = interval
+        self.run_dir = os.path.join(output_dir, f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles = collections.defaultdict(list)
+        self._samples = collections.defaultdict(collections.Counter)
+        self._owners = {}
+        self._active = collections.Counter()
+        self._profiler_thread = None
+        self._profiler_depth = 0
+        self._stop = threading.Event()
+        self._sampler = None
+        if mode == 'sample':
+            self._start_sampler()
+    
+    def _start_sampler(self):
+        # Pada mode 'cprofile' sampler baru dijalankan saat tahap pertama perlu di-sampling
+        with self._lock:
+            if self._sampler is None and not self._stop.is_set():
+                self._sampler = threading.Thread(target=self._sample_loop, name='profile-sampler', daemon=True)
+                self._sampler.start()
+    
+    def enabled(self, stage):
+        """
+        Mengecek apakah sebuah tahap termasuk yang diprofiling.
+        """
+        if 'all' in self.stages or stage in self.stages:
+            return True
+        return '.' in stage and stage.split('.', 1)[0] in self.stages
+    
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _acquire_profiler(self, thread_id):
+        """
+        Membuat cProfile untuk thread ini jika tidak ada thread lain yang sedang memakai profiler.
+        
+        Returns:
+            cProfile.Profile: Profiler yang sudah aktif, atau None jika tahap harus di-sampling
+        """
+        with self._lock:
+            if self._profiler_thread not in (None, thread_id):
+                return None
+            self._profiler_thread = thread_id
+            self._profiler_depth += 1
+        
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+: alat profiling lain (misalnya coverage) sudah memakai slot profiler
+            self._release_profiler()
+            return None
+        return profiler
+    
+    def _release_profiler(self):
+        with self._lock:
+            self._profiler_depth -= 1
+            if self._profiler_depth == 0:
+                self._profiler_thread = None
+    
+    def _set_owner(self, thread_id, stack):
+        # Dipanggil dengan self._lock: tahap teratas menentukan ke mana sampel thread ini dihitung
+        if stack:
+            stage, profiler = stack[-1]
+            self._owners[thread_id] = (stage, profiler is None)
+        else:
+            self._owners.pop(thread_id, None)
+    
+    @contextlib.contextmanager
+    def profile(self, stage, threaded=False):
+        """
+        Memprofiling blok kode sebagai tahap stage (tanpa efek jika tahap tidak dipilih).
+        
+        Args:
+            stage (str): Nama tahap
+            threaded (bool): Tahap bekerja di beberapa thread, sehingga di-sampling pada mode 'cprofile'
+        """
+        if not self.enabled(stage):
+            yield
+            return
+        
+        stack = self._stack()
+        thread_id = threading.get_ident()
+        # Profiler tahap luar dijeda karena satu thread hanya dapat memakai satu profiler
+        if stack and stack[-1][1] is not None:
+            stack[-1][1].disable()
+        
+        profiler = None
+        if self.mode == 'cprofile' and not threaded:
+            profiler = self._acquire_profiler(thread_id)
+        if profiler is None:
+            self._start_sampler()
+        
+        stack.append((stage, profiler))
+        with self._lock:
+            if profiler is not None:
+                self._profiles[stage].append(profiler)
+            else:
+                self._active[stage] += 1
+            self._set_owner(thread_id, stack)
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._release_profiler()
+            stack.pop()
+            with self._lock:
+                if profiler is None:
+                    self._active[stage] -= 1
+                self._set_owner(thread_id, stack)
+            if stack and stack[-1][1] is not None:
+                stack[-1][1].enable()
+    
+    def _sample_loop(self):
+        labels = {}
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            with self._lock:
+                owners = dict(self._owners)
+                active = [stage for stage, count in self._active.items() if count > 0]
+            if not active:
+                continue
+            
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                owner = owners.get(thread_id)
+                if owner is None:
+                    targets = active
+                elif owner[1]:
+                    targets = [owner[0]]
+                else:
+                    # Thread ini sedang diukur cProfile
+                    continue
+                
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code, labels))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                key = ';'.join(reversed(stack))
+                with self._lock:
+                    for target in targets:
+                        self._samples[target][key] += 1
+    
+    def close(self):
+        """
+        Menghentikan sampler dan menulis hasil profiling setiap tahap ke run_dir.
+        
+        Returns:
+            list: Lokasi file .pstats atau .collapsed yang ditulis
+        """
+        with self._lock:
+            self._stop.set()
+            sampler, self._sampler = self._sampler, None
+        if sampler is not None:
+            sampler.join()
+        
+        with self._lock:
+            profiles = {stage: list(items) for stage, items in self._profiles.items()}
+            samples = {stage: dict(counter) for stage, counter in self._samples.items()}
+        if not profiles and not samples:
+            return []
+        
+        os.makedirs(self.run_dir, exist_ok=True)
+        paths = []
+        for stage, profilers in sorted(profiles.items()):
+            # Profil dari beberapa thread/panggilan untuk tahap yang sama digabung; profil kosong dilewati
+            for profiler in profilers:
+                profiler.create_stats()
+            profilers = [profiler for profiler in profilers if profiler.stats]
+            if not profilers:
+                continue
+            path = os.path.join(self.run_dir, _stage_filename(stage) + '.pstats')
+            pstats.Stats(*profilers).dump_stats(path)
+            paths.append(path)
+        for stage, counter in sorted(samples.items()):
+            path = os.path.join(self.run_dir, _stage_filename(stage) + '.collapsed')
+            with open(path, 'w', encoding='utf-8') as f:
+                for key, count in sorted(counter.items()):
+                    f.write(f"{key} {count}\n")
+            paths.append(path)
+        
+        logger.info(f"Hasil profiling ({self.mode}) ditulis ke {self.run_dir}: {len(paths)} file")
+        return paths
+
+def start_profiling(stages, mode='cprofile', output_dir=PROFILE_DIR, interval=SAMPLE_INTERVAL):
+    """
+    Memulai sesi profiling dan menjadikannya sesi aktif.
+    
+    Args:
+        stages (iterable): Nama tahap, misalnya ['extract', 'transform', 'load']
+        mode (str): 'cprofile' atau 'sample'
+        output_dir (str): Folder induk hasil profiling
+        interval (float): Jeda antar sampel pada mode 'sample' (detik)
+    
+    Returns:
+        ProfileSession: Sesi profiling yang baru
+    """
+    global _session
+    stop_profiling()
+    _session = ProfileSession(stages, mode, output_dir, interval)
+    return _session
+
+def stop_profiling():
+    """
+    Menutup sesi profiling aktif dan menulis hasilnya.
+    
+    Returns:
+        list: Lokasi file yang ditulis (kosong jika profiling tidak aktif)
+    """
+    global _session
+    session, _session = _session, None
+    if session is None:
+        return []
+    return session.close()
+
+def profile(stage, threaded=False):
+    """
+    Memprofiling blok kode sebagai tahap stage jika profiling aktif dan tahap dipilih.
+    
+    Args:
+        stage (str): Nama tahap
+        threaded (bool): Tahap bekerja di beberapa thread (selalu di-sampling)
+    
+    Returns:
+        Context manager
+    """
+    session = _session
+    if session is None:
+        return contextlib.nullcontext()
+    return session.profile(stage, threaded)
+
+def profiled_iter(stage, iterable, threaded=False):
+    """
+    Memprofiling setiap langkah iterasi (next) sebagai tahap stage, untuk generator mode streaming.
+    
+    Args:
+        stage (str): Nama tahap
+        iterable (iterable): Iterable yang diprofiling
+        threaded (bool): Tahap bekerja di beberapa thread (selalu di-sampling)
+    
+    Yields:
+        Item dari iterable
+    """
+    iterator = iter(iterable)
+    while True:
+        with profile(stage, threaded):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
@@ -2,10 +2,15 @@
 """
 Module untuk melakukan transformasi data dari hasil ekstraksi.
 """
+import collections
+import functools
 import logging
+import os
 import pandas as pd
 import re
 import numpy as np
+from datetime import datetime
+from utils.metrics import span, timed
 
 # Konfigurasi logging
 logger = logging.getLogger(__name__)
@@ -13,7 +18,85 @@ logger = logging.getLogger(__name__)
 # Nilai tukar Dollar ke Rupiah
 USD_TO_IDR_RATE = 16000
 
+# Pola regex pembersih, dikompilasi sekali dan dipakai jalur per baris maupun vektor
+PRICE_DOLLAR_PATTERN = re.compile(r'\$(\d+(?:\.\d+)?)')
+PRICE_NUMBER_PATTERN = re.compile(r'(\d+(?:\.\d+)?)')
+RATING_NUMBER_PATTERN = re.compile(r'(\d+\.\d+|\d+)')
+COLORS_NUMBER_PATTERN = re.compile(r'(\d+)')
+
+# Skema ringkas: kolom kategori berkardinalitas rendah dan format timestamp hasil scraping
+COMPACT_CATEGORY_COLUMNS = ('Size', 'Gender')
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Jumlah maksimal nilai mentah yang diingat per fungsi pembersih
+CLEANER_CACHE_SIZE = 16384
+
+# Fungsi pembersih yang di-memo, untuk statistik cache
+_MEMOIZED_CLEANERS = {}
+
+# Mode streaming: jumlah maksimal hash baris terbaru yang diingat untuk membuang duplikat antar chunk (8 byte per hash)
+STREAM_DEDUP_MAX_ROWS = 1_000_000
+
+# Judul pengganti dari parser untuk kartu tanpa judul; baris ini dibuang saat transformasi
+INVALID_TITLE = "Unknown Product"
+
+# Index deduplikasi antar run: lokasi file, kolom identitas produk, kolom yang diabaikan, dan kunci hash
+DEDUP_INDEX_PATH = os.getenv('ETL_DEDUP_INDEX_PATH', os.path.join('.cache', 'dedup_index.npz'))
+DEDUP_KEY_COLUMNS = ('Title', 'Size', 'Gender')
+DEDUP_EXCLUDED_COLUMNS = ('timestamp',)
+DEDUP_HASH_KEY = 'stylestream-dedp'
+DEDUP_HASH_BITS = (32, 64)
+
+def _memoize_strings(cleaner):
+    """
+    Membungkus fungsi pembersih dengan cache LRU terbatas untuk nilai string mentah.
+    
+    Nilai hasil scraping ("Size: M", "3 Colors", ...) sangat berulang, sehingga
+    sebagian besar panggilan cukup mengambil hasil dari cache. Nilai bukan
+    string (NaN, angka) tetap diproses langsung.
+    """
+    cached = functools.lru_cache(maxsize=CLEANER_CACHE_SIZE)(cleaner)
+    
+    @functools.wraps(cleaner)
+    def wrapper(value):
+        if type(value) is str:
+            return cached(value)
+        return cleaner(value)
+    
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    _MEMOIZED_CLEANERS[cleaner.__name__] = wrapper
+    return wrapper
+
+def cleaner_cache_stats():
+    """
+    Mengembalikan statistik cache setiap fungsi pembersih.
+    
+    Returns:
+        dict: Nama fungsi -> {'hits', 'misses', 'size', 'maxsize', 'hit_rate'}
+    """
+    stats = {}
+    for name, cleaner in _MEMOIZED_CLEANERS.items():
+        info = cleaner.cache_info()
+        calls = info.hits + info.misses
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'maxsize': info.maxsize,
+            'hit_rate': info.hits / calls if calls else 0.0
+        }
+    return stats
+
+def clear_cleaner_caches():
+    """
+    Mengosongkan cache dan statistik semua fungsi pembersih.
+    """
+    for cleaner in _MEMOIZED_CLEANERS.values():
+        cleaner.cache_clear()
+
 # Modify the clean_price function to properly handle all cases
+@_memoize_strings
 def clean_price(price_value):
     """
     Membersihkan data harga dan mengkonversi dari USD ke IDR.
@@ -22,8 +105,10 @@ def clean_price(price_value):
         return 0.0  # Kembalikan 0.0 alih-alih None untuk nilai tidak valid
     
     try:
+        text = str(price_value)
+        
         # Ekstrak nilai numerik menggunakan regex
-        match = re.search(r'\$(\d+(\.\d+)?)', str(price_value))
+        match = PRICE_DOLLAR_PATTERN.search(text)
         if match:
             # Konversi ke float dan kalikan dengan nilai tukar
             price_usd = float(match.group(1))
@@ -31,24 +116,25 @@ def clean_price(price_value):
             return price_idr
         
         # Coba ekstrak nilai numerik apapun
-        match = re.search(r'(\d+(\.\d+)?)', str(price_value))
+        match = PRICE_NUMBER_PATTERN.search(text)
         if match:
             price_usd = float(match.group(1))
             price_idr = price_usd * USD_TO_IDR_RATE
             return price_idr
-            
+        
         return 0.0  # Default jika tidak ada nilai numerik
     except Exception as e:
         logger.warning(f"Gagal memproses harga '{price_value}': {str(e)}")
         return 0.0  # Return nilai default 0.0 alih-alih None
 
+@_memoize_strings
 def clean_rating(rating_value):
     """
     Membersihkan data rating.
     
     Args:
         rating_value: Nilai rating (bisa berupa string atau float)
-        
+    
     Returns:
         float: Nilai rating dalam format float
     """
@@ -68,12 +154,12 @@ def clean_rating(rating_value):
                 parts = rating_value.split("/")
                 if len(parts) > 0:
                     # Ekstrak angka dari bagian sebelum "/"
-                    match = re.search(r'(\d+\.\d+|\d+)', parts[0])
+                    match = RATING_NUMBER_PATTERN.search(parts[0])
                     if match:
                         return float(match.group(1))
             
             # Coba ekstrak nilai numerik menggunakan regex umum
-            match = re.search(r'(\d+\.\d+|\d+)', rating_value)
+            match = RATING_NUMBER_PATTERN.search(rating_value)
             if match:
                 return float(match.group(1))
         return 0.0  # Kembalikan 0.0 jika tidak dapat mengekstrak nilai
@@ -81,13 +167,14 @@ def clean_rating(rating_value):
         logger.warning(f"Gagal memproses rating '{rating_value}': {str(e)}")
         return 0.0  # Kembalikan 0.0 alih-alih None
 
+@_memoize_strings
 def clean_colors(colors_value):
     """
     Membersihkan data jumlah warna.
     
     Args:
         colors_value: Nilai jumlah warna (bisa berupa string atau int)
-        
+    
     Returns:
         int: Jumlah warna dalam format integer
     """
@@ -102,7 +189,7 @@ def clean_colors(colors_value):
         # Jika colors berupa string, coba ekstrak nilai numeriknya
         if isinstance(colors_value, str):
             # Format: "3 Colors"
-            match = re.search(r'(\d+)', colors_value)
+            match = COLORS_NUMBER_PATTERN.search(colors_value)
             if match:
                 return int(match.group(1))
         return 1
@@ -110,13 +197,14 @@ def clean_colors(colors_value):
         logger.warning(f"Gagal memproses jumlah warna '{colors_value}': {str(e)}")
         return 1
 
+@_memoize_strings
 def clean_size(size_value):
     """
     Membersihkan data ukuran.
     
     Args:
         size_value: Nilai ukuran
-        
+    
     Returns:
         str: Ukuran yang sudah dibersihkan
     """
@@ -136,13 +224,14 @@ def clean_size(size_value):
         logger.warning(f"Gagal memproses ukuran '{size_value}': {str(e)}")
         return "M"
 
+@_memoize_strings
 def clean_gender(gender_value):
     """
     Membersihkan data gender.
     
     Args:
         gender_value: Nilai gender
-        
+    
     Returns:
         str: Gender yang sudah dibersihkan
     """
@@ -168,10 +257,299 @@ def clean_gender(gender_value):
         logger.warning(f"Gagal memproses gender '{gender_value}': {str(e)}")
         return "Unisex"
 
-def transform_data(df):
+# Mesin transformasi yang tersedia: 'vectorized' (default) dan 'rowwise' (implementasi referensi)
+DEFAULT_ENGINE = 'vectorized'
+
+def _column_kind(series):
+    """
+    Menentukan jenis nilai kolom untuk memilih jalur vektorisasi.
+    
+    Returns:
+        str: 'bool', 'integer', 'float', 'string', atau 'mixed'
+    """
+    if isinstance(series.dtype, np.dtype):
+        if pd.api.types.is_bool_dtype(series.dtype):
+            return 'bool'
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return 'integer'
+        if pd.api.types.is_float_dtype(series.dtype):
+            return 'float'
+    if pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+        return 'string'
+    # Kolom object campuran (misal berisi skalar numpy) diproses baris per baris
+    return 'mixed'
+
+def _first_match(text, pattern):
+    """
+    Mengambil grup pertama dari kecocokan regex pertama di setiap nilai (NaN jika tidak cocok).
+    """
+    return text.str.extract(pattern, expand=False)
+
+def _on_unique_values(series, func):
+    """
+    Menjalankan func sekali per nilai unik lalu memetakan hasilnya kembali ke setiap baris.
+    
+    Kolom hasil scraping sangat berulang (ukuran, gender, rating, jumlah warna),
+    sehingga operasi string cukup dijalankan pada nilai uniknya saja.
+    
+    Args:
+        series (Series): Kolom mentah
+        func (callable): Fungsi vektor Series -> Series
+    
+    Returns:
+        Series: Hasil func dengan index dan nama sesuai series
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    if len(uniques) == len(series):
+        cleaned = func(series)
+    else:
+        cleaned = func(pd.Series(uniques, dtype=series.dtype)).take(codes)
+    return cleaned.set_axis(series.index).rename(series.name)
+
+def clean_price_vectorized(series):
+    """
+    Versi vektor dari clean_price untuk satu kolom.
+    
+    Args:
+        series (Series): Kolom harga mentah
+    
+    Returns:
+        Series: Harga dalam IDR (float), identik dengan series.apply(clean_price)
+    """
+    if series.empty:
+        return series.apply(clean_price)
+    return _on_unique_values(series, _price_from_values)
+
+def _price_from_values(series):
+    invalid = series.isna() | (series.astype(object) == "Price Unavailable")
+    # clean_price selalu bekerja pada str(nilai), termasuk untuk nilai numerik
+    text = series.astype(object).where(~invalid, "").astype(str)
+    
+    number = _first_match(text, PRICE_DOLLAR_PATTERN)
+    number = number.where(number.notna(), _first_match(text, PRICE_NUMBER_PATTERN))
+    
+    price = number.astype(object).where(number.notna(), "0").astype('float64') * USD_TO_IDR_RATE
+    return price.where(~invalid, 0.0)
+
+def clean_rating_vectorized(series):
+    """
+    Versi vektor dari clean_rating untuk satu kolom.
+    
+    Args:
+        series (Series): Kolom rating mentah
+    
+    Returns:
+        Series: Rating (float), identik dengan series.apply(clean_rating)
+    """
+    kind = _column_kind(series)
+    if series.empty or kind == 'mixed':
+        return series.apply(clean_rating)
+    if kind in ('bool', 'integer', 'float'):
+        return series.astype('float64').fillna(0.0)
+    
+    return _on_unique_values(series, _rating_from_text)
+
+def _rating_from_text(series):
+    # Angka pertama di teks sama dengan angka sebelum "/" pada format "Rating: ★ 3.3 / 5"
+    number = _first_match(series.astype(object), RATING_NUMBER_PATTERN)
+    return number.astype(object).where(number.notna(), "0").astype('float64')
+
+def clean_colors_vectorized(series):
+    """
+    Versi vektor dari clean_colors untuk satu kolom.
+    
+    Args:
+        series (Series): Kolom jumlah warna mentah
+    
+    Returns:
+        Series: Jumlah warna (int), identik dengan series.apply(clean_colors)
+    """
+    kind = _column_kind(series)
+    if series.empty:
+        return series.apply(clean_colors)
+    if kind == 'integer':
+        return series.copy()
+    if kind == 'float':
+        # clean_colors hanya menerima int atau str; float selalu menjadi 1
+        return pd.Series(1, index=series.index, dtype='int64')
+    if kind != 'string':
+        return series.apply(clean_colors)
+    
+    return _on_unique_values(series, _colors_from_text)
+
+def _colors_from_text(series):
+    number = _first_match(series.astype(object), COLORS_NUMBER_PATTERN)
+    return number.astype(object).where(number.notna(), "1").astype('int64')
+
+def _clean_label_vectorized(series, default, prefix, rules=()):
+    """
+    Pola bersama clean_size/clean_gender: hapus label "Prefix:" atau "Prefix", lalu strip.
+    
+    Args:
+        series (Series): Kolom mentah
+        default (str): Nilai untuk data kosong atau bukan string
+        prefix (str): Label yang dihapus (misal "Size" atau "Gender")
+        rules (tuple): Aturan tambahan (kondisi, nilai) setelah label, dicek berurutan
+    
+    Returns:
+        Series: Kolom yang sudah dibersihkan (object)
+    """
+    if _column_kind(series) in ('bool', 'integer', 'float'):
+        return pd.Series(default, index=series.index, dtype=object)
+    return _on_unique_values(series, lambda unique: _label_from_text(unique, default, prefix, rules))
+
+def _label_from_text(series, default, prefix, rules):
+    text = series.astype(object)
+    is_text = text.str.len().notna()
+    unavailable = text == f"{prefix} Unavailable"
+    
+    conditions = [
+        ~is_text | unavailable,
+        text.str.contains(f"{prefix}:", regex=False, na=False),
+        text.str.contains(prefix, regex=False, na=False)
+    ]
+    choices = [
+        default,
+        text.str.replace(f"{prefix}:", "", regex=False).str.strip(),
+        text.str.replace(prefix, "", regex=False).str.strip()
+    ]
+    for condition, value in rules:
+        conditions.append(condition(text))
+        choices.append(value)
+    
+    cleaned = np.select(conditions, choices, default=text.str.strip())
+    return pd.Series(cleaned, index=series.index, dtype=object)
+
+def clean_size_vectorized(series):
+    """
+    Versi vektor dari clean_size untuk satu kolom.
+    
+    Args:
+        series (Series): Kolom ukuran mentah
+    
+    Returns:
+        Series: Ukuran yang sudah dibersihkan, identik dengan series.apply(clean_size)
+    """
+    if series.empty or _column_kind(series) == 'mixed':
+        return series.apply(clean_size)
+    return _clean_label_vectorized(series, "M", "Size")
+
+def clean_gender_vectorized(series):
+    """
+    Versi vektor dari clean_gender untuk satu kolom.
+    
+    Args:
+        series (Series): Kolom gender mentah
+    
+    Returns:
+        Series: Gender yang sudah dibersihkan, identik dengan series.apply(clean_gender)
+    """
+    if series.empty or _column_kind(series) == 'mixed':
+        return series.apply(clean_gender)
+    
+    def has(word):
+        return lambda text: text.str.contains(word, regex=False, na=False)
+    
+    rules = (
+        (lambda text: has("Men")(text) & ~has("Women")(text), "Men"),
+        (has("Women"), "Women"),
+        (has("Unisex"), "Unisex")
+    )
+    return _clean_label_vectorized(series, "Unisex", "Gender", rules)
+
+def _rowwise(cleaner):
+    return lambda series: series.apply(cleaner)
+
+# Fungsi pembersih per kolom untuk setiap mesin transformasi
+CLEANERS = {
+    'vectorized': {
+        'Price': clean_price_vectorized,
+        'Rating': clean_rating_vectorized,
+        'Colors': clean_colors_vectorized,
+        'Size': clean_size_vectorized,
+        'Gender': clean_gender_vectorized
+    },
+    'rowwise': {
+        'Price': _rowwise(clean_price),
+        'Rating': _rowwise(clean_rating),
+        'Colors': _rowwise(clean_colors),
+        'Size': _rowwise(clean_size),
+        'Gender': _rowwise(clean_gender)
+    }
+}
+
+def frame_memory(df):
+    """
+    Menghitung memori DataFrame dalam byte, termasuk isi string.
+    """
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+def compact_dtypes(df):
+    """
+    Mengubah DataFrame hasil transformasi ke skema ringkas.
+    
+    Size/Gender menjadi category, timestamp menjadi datetime64, integer
+    di-downcast, dan float menjadi float32 hanya jika nilainya tidak berubah.
+    Kolom yang gagal dikonversi tanpa kehilangan data dibiarkan apa adanya.
+    
+    Args:
+        df (DataFrame): Data hasil transform_data
+    
+    Returns:
+        DataFrame: Salinan dengan dtype ringkas
+    """
+    compact = df.copy()
+    
+    for column in COMPACT_CATEGORY_COLUMNS:
+        if column in compact:
+            # Kategori bertipe object, sama dengan yang dibaca kembali dari Parquet
+            compact[column] = compact[column].astype(object).astype('category')
+    
+    if 'timestamp' in compact and not pd.api.types.is_datetime64_any_dtype(compact['timestamp']):
+        parsed = pd.to_datetime(compact['timestamp'], format=TIMESTAMP_FORMAT, errors='coerce')
+        if (parsed.notna() | compact['timestamp'].isna()).all():
+            compact['timestamp'] = parsed
+        else:
+            logger.warning(f"Kolom timestamp tidak sesuai format {TIMESTAMP_FORMAT}, tetap disimpan sebagai teks")
+    
+    for column in compact.columns:
+        values = compact[column]
+        if not isinstance(values.dtype, np.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+            continue
+        if pd.api.types.is_integer_dtype(values.dtype):
+            compact[column] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values.dtype) and values.dtype != np.float32:
+            narrow = values.astype('float32')
+            if np.array_equal(narrow.to_numpy(dtype='float64'), values.to_numpy(), equal_nan=True):
+                compact[column] = narrow
+    
+    return compact
+
+def _apply_cleaner(cleaners, column, series):
+    """
+    Menjalankan fungsi pembersih sebuah kolom sebagai span 'transform.clean_<kolom>'.
+    """
+    with span(f'transform.clean_{column.lower()}', rows=len(series)):
+        return cleaners[column](series)
+
+@timed('transform')
+def transform_data(df, engine=DEFAULT_ENGINE, sample_if_empty=True, compact=False):
     """
     Melakukan transformasi data dari hasil ekstraksi.
+    
+    Args:
+        df (DataFrame): Data mentah hasil ekstraksi
+        engine (str): 'vectorized' (default) atau 'rowwise' (implementasi referensi per baris)
+        sample_if_empty (bool): Ganti hasil kosong dengan data sampel
+        compact (bool): Kembalikan skema ringkas (lihat compact_dtypes)
+    
+    Returns:
+        DataFrame: Data yang sudah dibersihkan
     """
+    if engine not in CLEANERS:
+        raise ValueError(f"Mesin transformasi '{engine}' tidak dikenal. Pilihan: {', '.join(CLEANERS)}")
+    cleaners = CLEANERS[engine]
+    
     if df.empty:
         logger.warning("DataFrame kosong, tidak ada data yang ditransformasi")
         return pd.DataFrame()
@@ -189,38 +567,38 @@ def transform_data(df):
         
         # Transformasi kolom Price
         logger.info("Membersihkan dan mengkonversi kolom Price...")
-        transformed_df['Price'] = transformed_df['Price'].apply(clean_price)
+        transformed_df['Price'] = _apply_cleaner(cleaners, 'Price', transformed_df['Price'])
         # Jangan hapus data dengan Price null, ganti dengan nilai default
         transformed_df['Price'] = transformed_df['Price'].fillna(0)
         
         # Transformasi kolom Rating
         logger.info("Membersihkan kolom Rating...")
-        transformed_df['Rating'] = transformed_df['Rating'].apply(clean_rating)
+        transformed_df['Rating'] = _apply_cleaner(cleaners, 'Rating', transformed_df['Rating'])
         # Jangan hapus data dengan Rating null, ganti dengan nilai default
         transformed_df['Rating'] = transformed_df['Rating'].fillna(0)
         
         # Transformasi kolom Colors
         logger.info("Membersihkan kolom Colors...")
-        transformed_df['Colors'] = transformed_df['Colors'].apply(clean_colors)
+        transformed_df['Colors'] = _apply_cleaner(cleaners, 'Colors', transformed_df['Colors'])
         # Jangan hapus data dengan Colors null, ganti dengan nilai default
         transformed_df['Colors'] = transformed_df['Colors'].fillna(1)
         
         # Transformasi kolom Size
         logger.info("Membersihkan kolom Size...")
-        transformed_df['Size'] = transformed_df['Size'].apply(clean_size)
+        transformed_df['Size'] = _apply_cleaner(cleaners, 'Size', transformed_df['Size'])
         # Jangan hapus data dengan Size null, ganti dengan nilai default
         transformed_df['Size'] = transformed_df['Size'].fillna("M")
         
         # Transformasi kolom Gender
         logger.info("Membersihkan kolom Gender...")
-        transformed_df['Gender'] = transformed_df['Gender'].apply(clean_gender)
+        transformed_df['Gender'] = _apply_cleaner(cleaners, 'Gender', transformed_df['Gender'])
         # Jangan hapus data dengan Gender null, ganti dengan nilai default
         transformed_df['Gender'] = transformed_df['Gender'].fillna("Unisex")
         
         # Menghapus data invalid (Lebih selektif)
         logger.info("Menghapus data invalid...")
         # Hanya hapus data dengan Title "Unknown Product"
-        transformed_df = transformed_df[transformed_df['Title'] != "Unknown Product"]
+        transformed_df = transformed_df[transformed_df['Title'] != INVALID_TITLE]
         
         # TAMBAHAN: Filter data dengan Price=0 atau Rating=0
         logger.info("Menghapus data dengan Price=0 atau Rating=0...")
@@ -242,24 +620,24 @@ def transform_data(df):
         except Exception as e:
             logger.warning(f"Gagal mengkonversi kolom Price: {str(e)}")
             transformed_df['Price'] = 0.0
-            
+        
         try:
             transformed_df['Rating'] = pd.to_numeric(transformed_df['Rating'], errors='coerce').fillna(0).astype('float64')
         except Exception as e:
             logger.warning(f"Gagal mengkonversi kolom Rating: {str(e)}")
             transformed_df['Rating'] = 0.0
-            
+        
         try:
             transformed_df['Colors'] = pd.to_numeric(transformed_df['Colors'], errors='coerce').fillna(1).astype('int64')
         except Exception as e:
             logger.warning(f"Gagal mengkonversi kolom Colors: {str(e)}")
             transformed_df['Colors'] = 1
-            
+        
         try:
             transformed_df['Size'] = transformed_df['Size'].astype('string')
         except Exception as e:
             logger.warning(f"Gagal mengkonversi kolom Size: {str(e)}")
-            
+        
         try:
             transformed_df['Gender'] = transformed_df['Gender'].astype('string')
         except Exception as e:
@@ -269,25 +647,309 @@ def transform_data(df):
         transformed_df['timestamp'] = transformed_df['timestamp'].astype('string')
         
         # Jika setelah semua transformasi DataFrame masih kosong, buat data sampel
-        if len(transformed_df) == 0:
+        if len(transformed_df) == 0 and sample_if_empty:
             logger.warning("Tidak ada data yang tersisa setelah transformasi. Membuat data sampel...")
             transformed_df = generate_sample_data(100)
         
+        if compact:
+            transformed_df = compact_dtypes(transformed_df)
+        
         logger.info(f"Transformasi selesai. Jumlah data setelah transformasi: {len(transformed_df)}")
         return transformed_df
-        
+    
     except Exception as e:
         logger.error(f"Terjadi kesalahan pada proses transformasi: {str(e)}")
         # Return DataFrame kosong jika gagal
         return pd.DataFrame()
 
+class _RecentRowHashes:
+    """
+    Hash baris terbaru yang sudah dihasilkan transform_chunks, paling banyak max_rows hash.
+    
+    Hash disimpan sebagai array uint64 terurut (pencarian dengan searchsorted)
+    dan diingat per chunk. Jika jumlahnya melewati max_rows, chunk terlama
+    dilupakan sampai tersisa tiga perempat max_rows, sehingga array hanya
+    diurutkan ulang sesekali.
+    """
+    
+    def __init__(self, max_rows=STREAM_DEDUP_MAX_ROWS):
+        if max_rows < 1:
+            raise ValueError("max_rows minimal adalah 1")
+        self.max_rows = max_rows
+        self._sorted = np.empty(0, dtype=np.uint64)
+        self._batches = collections.deque()
+        self._count = 0
+    
+    def __len__(self):
+        return self._count
+    
+    def contains(self, hashes):
+        positions = np.searchsorted(self._sorted, hashes)
+        found = positions < len(self._sorted)
+        found[found] = self._sorted[positions[found]] == hashes[found]
+        return found
+    
+    def add(self, hashes):
+        hashes = np.unique(hashes)
+        self._sorted = np.insert(self._sorted, np.searchsorted(self._sorted, hashes), hashes)
+        self._batches.append(hashes)
+        self._count += len(hashes)
+        if self._count > self.max_rows:
+            while self._batches and self._count > self.max_rows * 3 // 4:
+                self._count -= len(self._batches.popleft())
+            self._sorted = np.sort(np.concatenate(self._batches)) if self._batches else np.empty(0, dtype=np.uint64)
+
+def transform_chunks(chunks, engine=DEFAULT_ENGINE, compact=False, max_seen_rows=STREAM_DEDUP_MAX_ROWS):
+    """
+    Mentransformasi chunk data mentah satu per satu (mode streaming).
+    
+    Setiap chunk dibersihkan dengan transform_data. Duplikat antar chunk dihapus
+    memakai hash baris yang sudah dihasilkan; hanya max_seen_rows hash terbaru
+    yang diingat (8 byte per hash), sehingga memori tetap dibatasi. Selama
+    jumlah baris unik tidak melewati batas itu, gabungan semua chunk sama dengan
+    transform_data pada seluruh data; setelahnya, duplikat yang berjarak lebih
+    jauh dari jendela tersebut dapat lolos. Chunk yang kosong setelah
+    transformasi dilewati dan tidak diganti data sampel.
+    
+    Args:
+        chunks (iterable): Chunk DataFrame mentah hasil iter_extract_chunks
+        engine (str): 'vectorized' (default) atau 'rowwise'
+        compact (bool): Hasilkan chunk dengan skema ringkas (lihat compact_dtypes)
+        max_seen_rows (int): Jumlah maksimal hash baris yang diingat untuk duplikat antar chunk
+    
+    Yields:
+        DataFrame: Chunk data yang sudah dibersihkan
+    """
+    seen = _RecentRowHashes(max_seen_rows)
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        
+        transformed = transform_data(chunk, engine=engine, sample_if_empty=False, compact=compact)
+        if transformed.empty:
+            continue
+        
+        # Hapus baris yang sudah muncul di chunk sebelumnya
+        row_hashes = pd.util.hash_pandas_object(transformed, index=False).to_numpy()
+        is_new = ~seen.contains(row_hashes)
+        seen.add(row_hashes[is_new])
+        transformed = transformed[is_new]
+        
+        if not transformed.empty:
+            yield transformed
+
+class DedupIndex:
+    """
+    Index hash konten produk yang disimpan di disk untuk deduplikasi antar run.
+    
+    Setiap produk dikenali dari hash kolom identitas (Title, Size, Gender) dan
+    menyimpan hash kolom lainnya, tanpa timestamp. Kedua hash disimpan sebagai
+    dua array numpy yang terurut menurut hash identitas, sehingga pencarian
+    memakai searchsorted tanpa dict Python per produk.
+    
+    Baris berjudul INVALID_TITLE dibuang sebelum hashing dan tidak pernah masuk
+    index: kartu tanpa judul tidak punya identitas (semuanya berbagi kunci yang
+    sama, sehingga saling menimpa) dan transform_data tetap membuangnya, jadi
+    menyimpannya hanya akan menyembunyikan produk yang tidak pernah dimuat.
+    
+    filter() menyisakan produk baru atau yang isinya berubah; index baru
+    diperbarui di disk saat save() dipanggil, yaitu setelah data berhasil dimuat.
+    
+    Memori sebanding dengan jumlah produk: 16 byte per produk dengan
+    hash_bits=64, atau 8 byte dengan hash_bits=32 (peluang tabrakan hash lebih
+    besar, kira-kira n²/2³³ untuk n produk).
+    """
+    
+    def __init__(self, path=DEDUP_INDEX_PATH, hash_bits=64):
+        if hash_bits not in DEDUP_HASH_BITS:
+            raise ValueError(f"hash_bits harus salah satu dari {DEDUP_HASH_BITS}, bukan {hash_bits!r}")
+        self.path = path
+        self.hash_bits = hash_bits
+        self._dtype = np.dtype(f'uint{hash_bits}')
+        self._keys, self._hashes = self._load()
+        self._pending = []
+        self._pending_pairs = set()
+        self.reset_stats()
+    
+    def _empty(self):
+        return np.empty(0, dtype=self._dtype), np.empty(0, dtype=self._dtype)
+    
+    def _load(self):
+        if not os.path.exists(self.path):
+            return self._empty()
+        try:
+            with np.load(self.path) as data:
+                keys, hashes = data['keys'], data['hashes']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Index deduplikasi tidak dapat dibaca, index dikosongkan: {str(e)}")
+            return self._empty()
+        
+        if keys.dtype != self._dtype or hashes.dtype != self._dtype or len(keys) != len(hashes):
+            logger.warning(f"Index deduplikasi {self.path} dibuat dengan lebar hash lain, index dikosongkan")
+            return self._empty()
+        return keys, hashes
+    
+    def reset_stats(self):
+        """
+        Mengosongkan statistik filter untuk run baru.
+        """
+        self._stats = {'checked': 0, 'invalid': 0, 'new': 0, 'changed': 0, 'unchanged': 0, 'duplicates': 0}
+    
+    def stats(self):
+        """
+        Mengembalikan statistik filter sejak reset terakhir.
+        
+        Returns:
+            dict: Jumlah baris yang diperiksa, tidak valid, baru, berubah, tidak berubah,
+                duplikat dalam run yang sama, jumlah entri index, dan ukurannya (byte)
+        """
+        stats = dict(self._stats)
+        stats['entries'] = len(self)
+        stats['size_bytes'] = self.nbytes
+        return stats
+    
+    def __len__(self):
+        return len(self._keys)
+    
+    @property
+    def nbytes(self):
+        """
+        Ukuran array index di memori (byte), tanpa produk yang belum disimpan.
+        """
+        return self._keys.nbytes + self._hashes.nbytes
+    
+    def _hash(self, df, columns):
+        if not columns:
+            return np.zeros(len(df), dtype=self._dtype)
+        hashes = pd.util.hash_pandas_object(df[columns], index=False, hash_key=DEDUP_HASH_KEY).to_numpy()
+        # Mode 32 bit memakai 32 bit atas hash 64 bit
+        return (hashes >> np.uint64(64 - self.hash_bits)).astype(self._dtype)
+    
+    def hash_products(self, df):
+        """
+        Menghitung hash identitas dan hash konten setiap baris.
+        
+        Args:
+            df (DataFrame): Data produk (mentah atau hasil transformasi)
+        
+        Returns:
+            tuple: (hash identitas, hash konten) sebagai array numpy
+        """
+        key_columns = [column for column in DEDUP_KEY_COLUMNS if column in df.columns]
+        content_columns = [column for column in df.columns
+                           if column not in key_columns and column not in DEDUP_EXCLUDED_COLUMNS]
+        return self._hash(df, key_columns), self._hash(df, content_columns)
+    
+    @timed('dedup.filter')
+    def filter(self, df):
+        """
+        Menyisakan produk yang belum ada di index atau yang isinya berubah.
+        
+        Baris yang sama persis (selain timestamp) dengan baris sebelumnya di run
+        yang sama juga dibuang, begitu pula baris berjudul INVALID_TITLE. Produk
+        yang lolos dicatat dan masuk ke index saat save().
+        
+        Args:
+            df (DataFrame): Data produk hasil ekstraksi
+        
+        Returns:
+            DataFrame: Baris produk baru atau berubah
+        """
+        if df.empty:
+            return df
+        
+        self._stats['checked'] += len(df)
+        if 'Title' in df.columns:
+            invalid = (df['Title'] == INVALID_TITLE).to_numpy()
+            if invalid.any():
+                self._stats['invalid'] += int(invalid.sum())
+                df = df[~invalid]
+                if df.empty:
+                    return df
+        
+        keys, hashes = self.hash_products(df)
+        
+        # Cari hash identitas di array terurut
+        positions = np.searchsorted(self._keys, keys)
+        found = positions < len(self._keys)
+        found[found] = self._keys[positions[found]] == keys[found]
+        unchanged = found.copy()
+        unchanged[found] = self._hashes[positions[found]] == hashes[found]
+        
+        # Pasangan (identitas, konten) yang sudah lolos di run ini tidak dikirim lagi
+        with np.errstate(over='ignore'):
+            pairs = keys.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) ^ hashes.astype(np.uint64)
+        pairs = pd.Series(pairs)
+        duplicate = (pairs.duplicated() | pairs.isin(self._pending_pairs)).to_numpy() & ~unchanged
+        keep = ~unchanged & ~duplicate
+        
+        self._stats['unchanged'] += int(unchanged.sum())
+        self._stats['duplicates'] += int(duplicate.sum())
+        self._stats['new'] += int((keep & ~found).sum())
+        self._stats['changed'] += int((keep & found).sum())
+        
+        if keep.any():
+            self._pending.append((keys[keep], hashes[keep]))
+            self._pending_pairs.update(pairs[keep].tolist())
+        return df[keep]
+    
+    def filter_chunks(self, chunks):
+        """
+        Menerapkan filter() pada setiap chunk; chunk yang menjadi kosong dilewati.
+        
+        Args:
+            chunks (iterable): Chunk DataFrame hasil iter_extract_chunks
+        
+        Yields:
+            DataFrame: Chunk berisi produk baru atau berubah
+        """
+        for chunk in chunks:
+            chunk = self.filter(chunk)
+            if not chunk.empty:
+                yield chunk
+    
+    def save(self):
+        """
+        Menggabungkan produk yang lolos filter ke index dan menulisnya ke disk secara atomik.
+        
+        Untuk identitas yang sama, hash konten terbaru yang dipakai.
+        """
+        if self._pending:
+            keys = np.concatenate([self._keys] + [keys for keys, _ in self._pending])
+            hashes = np.concatenate([self._hashes] + [hashes for _, hashes in self._pending])
+            # Urutan stabil: entri yang lebih baru berada di akhir setiap identitas
+            order = np.argsort(keys, kind='stable')
+            keys, hashes = keys[order], hashes[order]
+            last = np.append(keys[1:] != keys[:-1], True)
+            self._keys, self._hashes = keys[last], hashes[last]
+            self._pending = []
+            self._pending_pairs = set()
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, keys=self._keys, hashes=self._hashes)
+        os.replace(tmp_path, self.path)
+        
+        logger.info(f"Index deduplikasi disimpan: {len(self)} produk ({self.nbytes} byte) di {self.path}")
+    
+    def log_stats(self):
+        """
+        Mencatat ringkasan statistik filter ke log dan mengembalikannya.
+        """
+        stats = self.stats()
+        logger.info(
+            f"Statistik index deduplikasi: {stats['checked']} baris diperiksa, {stats['invalid']} tidak valid, "
+            f"{stats['new']} baru, {stats['changed']} berubah, {stats['unchanged']} tidak berubah, "
+            f"{stats['duplicates']} duplikat, {stats['entries']} produk di index"
+        )
+        return stats
+
 # Fungsi untuk menghasilkan data sampel
 def generate_sample_data(n_samples=100):
     """Menghasilkan data sampel untuk pengujian"""
-    import pandas as pd
-    import numpy as np
-    from datetime import datetime
-    
     np.random.seed(42)  # Untuk hasil yang konsisten
     
     products = []